@@ -0,0 +1,761 @@
+# benchmark.py - Performance benchmarks for AI Document Summarizer
+#
+# Usage:
+#   python benchmark.py startup [--repeat 5] [--budget-scale 1.0]
+#   python benchmark.py quantization [--model t5-small] [--repeat 3] [files...]
+#   python benchmark.py backends [--model t5-small] [--repeat 3] [files...]
+#   python benchmark.py threads [--jobs 1,2] [--parallel-batches 1,2,4] [--threads 0] [files...]
+#   python benchmark.py online [--requests 32] [--latency 0.1] [--concurrency 1,4,8]
+#   python benchmark.py extractive [--sentences 100,1000,10000] [--repeat 3] [--min-speedup 1.0] [files...]
+#   python benchmark.py prefilter [--model t5-small] [--repeat 2] [files...]
+#   python benchmark.py normalize [--size-mb 20] [--repeat 3] [files...]
+#   python benchmark.py memory [--pages 1000] [files...]
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (module, import-time budget in seconds, modules it must not pull in)
+STARTUP_BUDGETS = [
+    ("utils.summarizer", 0.5, ("torch", "transformers", "numpy", "PyQt5")),
+    ("cli", 0.5, ("torch", "transformers", "numpy", "PyQt5", "reportlab")),
+    ("ui.main_window", 1.5, ("torch", "transformers", "numpy")),
+]
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(name for name in sys.modules if "." not in name)}}))
+"""
+
+def measure_import(module, repeat=5):
+    """Import module in fresh interpreters; returns (median seconds, top-level modules loaded)"""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    timings = []
+    loaded = set()
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, "-c", _IMPORT_PROBE.format(module=module)],
+            cwd=PROJECT_DIR, env=env, stderr=subprocess.DEVNULL, text=True
+        )
+        # Modules may print while importing; the probe's report is the last line
+        report = json.loads(output.strip().splitlines()[-1])
+        timings.append(report["seconds"])
+        loaded.update(report["modules"])
+    return statistics.median(timings), loaded
+
+def benchmark_startup(repeat=5, budget_scale=1.0):
+    """Check import time and heavy dependencies of the entry-point modules"""
+    print("⏱️  Startup import-time benchmark")
+    print("=" * 60)
+
+    passed = True
+    for module, budget, forbidden in STARTUP_BUDGETS:
+        budget *= budget_scale
+        seconds, loaded = measure_import(module, repeat)
+        heavy = [name for name in forbidden if name in loaded]
+
+        ok = seconds <= budget and not heavy
+        passed = passed and ok
+        status = "✅" if ok else "❌"
+        print(f"{status} {module:<20} {seconds * 1000:8.1f} ms  (budget {budget * 1000:.0f} ms)")
+        if heavy:
+            print(f"   ⚠️ Imported heavy modules at startup: {', '.join(heavy)}")
+
+    print("=" * 60)
+    print("✅ Startup within budget" if passed else "❌ Startup budget exceeded")
+    return passed
+
+# Fixed corpus for quality comparisons; files given on the command line replace it
+BENCHMARK_CORPUS = [
+    "Radar systems transmit pulses of radio energy and measure the echoes that return from objects in "
+    "their path. The delay between transmission and reception gives the range to the target, while the "
+    "Doppler shift of the echo reveals its radial velocity. Modern phased array radars steer their beams "
+    "electronically instead of rotating a dish, which allows them to track many targets at once and to "
+    "switch between search and tracking modes within milliseconds. Signal processing removes clutter from "
+    "the ground, the sea and the weather so that small, fast targets can still be detected. Because the "
+    "transmitted energy falls off with the fourth power of range, long-range systems combine high peak "
+    "power with pulse compression, which spreads a long coded pulse in time and compresses it on receipt "
+    "to recover fine range resolution.",
+
+    "Lithium-ion batteries store energy by moving lithium ions between a graphite anode and a metal oxide "
+    "cathode through a liquid electrolyte. During charging, ions are pushed into the anode; during "
+    "discharge they flow back and release energy to the external circuit. Capacity fades over time as the "
+    "solid electrolyte interphase grows, consuming lithium and raising internal resistance. High "
+    "temperatures accelerate these side reactions, while charging at low temperatures can plate metallic "
+    "lithium onto the anode and create internal short circuits. Battery management systems therefore "
+    "monitor cell voltages and temperatures, balance the charge between cells and limit the current to "
+    "keep every cell within its safe operating window. Solid-state electrolytes promise higher energy "
+    "density and improved safety, but manufacturing them at scale remains difficult.",
+
+    "The committee reviewed the annual procurement report and noted that delivery times for electronic "
+    "components increased by an average of six weeks compared with the previous year. Suppliers cited "
+    "shortages of semiconductor wafers and longer shipping routes as the main causes. To reduce the risk "
+    "of production delays, the committee recommended qualifying a second source for each critical part, "
+    "increasing safety stock for long-lead items and reviewing designs to replace obsolete components. "
+    "Finance raised concerns that larger inventories would tie up working capital, so the plan limits the "
+    "additional stock to parts whose shortage would stop a production line. Progress on the "
+    "recommendations will be reported at the next quarterly meeting, together with updated lead-time "
+    "figures from the three largest suppliers.",
+
+    "Photosynthesis converts light energy into chemical energy stored in sugars. In the light-dependent "
+    "reactions, chlorophyll in the thylakoid membranes absorbs photons and uses their energy to split "
+    "water, releasing oxygen and producing ATP and NADPH. The Calvin cycle in the stroma then uses this ATP "
+    "and NADPH to fix carbon dioxide into three-carbon sugars, which the plant turns into glucose, sucrose "
+    "and starch. The enzyme RuBisCO catalyses the first step of carbon fixation but also reacts with "
+    "oxygen, wasting energy in a process called photorespiration. Plants in hot, dry climates have evolved "
+    "C4 and CAM pathways that concentrate carbon dioxide around RuBisCO and reduce these losses, allowing "
+    "them to close their stomata and conserve water during the hottest part of the day.",
+
+    "Software teams adopt continuous integration to catch defects early. Every change is merged into a "
+    "shared branch several times a day, and an automated pipeline builds the code and runs the test suite "
+    "on each merge. When a build fails, the team fixes it before adding new work, which keeps the main "
+    "branch releasable. Fast feedback matters: pipelines that take more than a few minutes encourage "
+    "developers to batch changes, which makes failures harder to diagnose. Teams therefore split slow "
+    "end-to-end tests into a separate stage, cache dependencies between runs and run independent test "
+    "groups in parallel. Measuring the time from commit to deployment helps identify bottlenecks, and "
+    "many teams treat a red pipeline as the highest priority issue on the board.",
+]
+
+def _rouge_tokens(text):
+    return re.findall(r"\w+", text.lower())
+
+def _ngrams(tokens, n):
+    return Counter(tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+
+def _f1(overlap, reference_total, candidate_total):
+    if not overlap or not reference_total or not candidate_total:
+        return 0.0
+    precision = overlap / candidate_total
+    recall = overlap / reference_total
+    return 2 * precision * recall / (precision + recall)
+
+def rouge_scores(reference, candidate):
+    """ROUGE-1, ROUGE-2 and ROUGE-L F1 of candidate against reference"""
+    ref_tokens = _rouge_tokens(reference)
+    cand_tokens = _rouge_tokens(candidate)
+    scores = {}
+    for n in (1, 2):
+        ref_ngrams = _ngrams(ref_tokens, n)
+        cand_ngrams = _ngrams(cand_tokens, n)
+        overlap = sum((ref_ngrams & cand_ngrams).values())
+        scores[f"rouge{n}"] = _f1(overlap, sum(ref_ngrams.values()), sum(cand_ngrams.values()))
+
+    # Longest common subsequence, one row at a time
+    previous = [0] * (len(cand_tokens) + 1)
+    for ref_token in ref_tokens:
+        current = [0]
+        for j, cand_token in enumerate(cand_tokens):
+            current.append(previous[j] + 1 if ref_token == cand_token else max(previous[j + 1], current[j]))
+        previous = current
+    scores["rougeL"] = _f1(previous[-1], len(ref_tokens), len(cand_tokens))
+    return scores
+
+def _load_corpus(paths):
+    if not paths:
+        return BENCHMARK_CORPUS
+    from utils.extraction import extract_text_from_file
+    return [extract_text_from_file(path) for path in paths]
+
+def _model_summaries(summarizer, corpus, summary_ratio):
+    """Raw model output per document, without the structured report around it"""
+    summaries = []
+    for text in corpus:
+        chunks = summarizer.chunker.chunk(summarizer.clean_extracted_text(text))
+        summaries.append(" ".join(summarizer.summarize_chunks(chunks, summary_ratio)))
+    return summaries
+
+def benchmark_quantization(model="t5-small", paths=None, repeat=3, summary_ratio=0.4):
+    """Compare fp32 and dynamic int8 inference on latency and ROUGE agreement"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.summarizer import AIDocumentSummarizer
+
+    corpus = _load_corpus(paths)
+    print("⏱️  Quantization benchmark")
+    print("=" * 60)
+    print(f"Model: {model}   Documents: {len(corpus)}   Repeats: {repeat}")
+
+    results = {}
+    for dtype in ("float32", "qint8"):
+        start = time.perf_counter()
+        summarizer = AIDocumentSummarizer(model_type=model, use_cache=False, dtype=dtype)
+        load_seconds = time.perf_counter() - start
+        if summarizer.summarizer is None:
+            print(f"❌ Could not load {model} as {dtype}")
+            return False
+
+        summarizer.warm_up()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            summaries = _model_summaries(summarizer, corpus, summary_ratio)
+            timings.append(time.perf_counter() - start)
+        results[dtype] = (load_seconds, statistics.median(timings), summaries)
+
+    print("=" * 60)
+    for dtype, (load_seconds, seconds, _) in results.items():
+        print(f"{dtype:<8} load {load_seconds:6.2f} s   corpus {seconds:6.2f} s")
+
+    speedup = results["float32"][1] / results["qint8"][1] if results["qint8"][1] else 0
+    scores = [rouge_scores(reference, candidate)
+              for reference, candidate in zip(results["float32"][2], results["qint8"][2])]
+    print(f"🚀 int8 speedup: {speedup:.2f}x")
+    for name in ("rouge1", "rouge2", "rougeL"):
+        print(f"📊 {name} vs fp32: {statistics.mean(score[name] for score in scores):.3f}")
+    print("ℹ️ Load time of the int8 model drops on the next run, once its weights are cached")
+    return True
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _measure_backend(backend, model, paths, repeat, summary_ratio):
+    """Runs in a fresh interpreter: load one backend and time the corpus"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.summarizer import AIDocumentSummarizer
+
+    corpus = _load_corpus(paths)
+    start = time.perf_counter()
+    summarizer = AIDocumentSummarizer(model_type=model, use_cache=False, backend=backend)
+    load_seconds = time.perf_counter() - start
+    if summarizer.summarizer is None:
+        return None
+
+    summarizer.warm_up()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summaries = _model_summaries(summarizer, corpus, summary_ratio)
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "load": load_seconds,
+        "seconds": statistics.median(timings),
+        "peak_rss_mb": peak_rss_mb(),
+        "torch_loaded": "torch" in sys.modules,
+        "summaries": summaries,
+    }
+
+def benchmark_backends(model="t5-small", paths=None, repeat=3, summary_ratio=0.4):
+    """Compare latency and peak memory of the inference backends, each in its own process"""
+    from utils.backends import BACKEND_NAMES
+
+    print("⏱️  Inference backend benchmark")
+    print("=" * 60)
+
+    results = {}
+    for backend in BACKEND_NAMES:
+        command = [sys.executable, os.path.abspath(__file__), "backends", "--measure", backend,
+                   "--model", model, "--repeat", str(repeat), "--ratio", str(summary_ratio)] + list(paths or [])
+        output = subprocess.check_output(command, cwd=PROJECT_DIR, text=True)
+        report = json.loads(output.strip().splitlines()[-1])
+        if report is None:
+            print(f"❌ Could not load {model} with the {backend} backend")
+            return False
+        results[backend] = report
+        # The first ONNX run includes the one-time export in its load time
+        print(f"{backend:<6} load {report['load']:6.2f} s   corpus {report['seconds']:6.2f} s   "
+              f"peak RSS {report['peak_rss_mb'] or 0:7.1f} MB   torch loaded: {report['torch_loaded']}")
+
+    print("=" * 60)
+    baseline = results["torch"]
+    for backend, report in results.items():
+        if backend == "torch":
+            continue
+        speedup = baseline["seconds"] / report["seconds"] if report["seconds"] else 0
+        scores = [rouge_scores(reference, candidate)
+                  for reference, candidate in zip(baseline["summaries"], report["summaries"])]
+        print(f"🚀 {backend} speedup vs torch: {speedup:.2f}x")
+        print(f"📊 {backend} rougeL vs torch: {statistics.mean(score['rougeL'] for score in scores):.3f}")
+    return True
+
+def _int_list(text):
+    return [int(value) for value in text.split(",") if value.strip()]
+
+def _measure_threads(config, model, paths, repeat, summary_ratio):
+    """Runs in a fresh interpreter, since torch's thread pools are fixed once it starts working"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.resources import get_resource_manager
+    from utils.summarizer import AIDocumentSummarizer
+
+    get_resource_manager().configure(total_threads=config["threads"], inter_op_threads=config["interop"])
+    summarizer = AIDocumentSummarizer(model_type=model, use_cache=False, batch_size=config["batch_size"],
+                                      parallel_batches=config["parallel_batches"])
+    if summarizer.summarizer is None:
+        return None
+
+    chunks = []
+    for text in _load_corpus(paths):
+        chunks.extend(summarizer.chunker.chunk(summarizer.clean_extracted_text(text)))
+    summarizer.warm_up()
+
+    # Each job is one thread summarizing the whole corpus, as concurrent workers would
+    def job():
+        for _ in range(repeat):
+            summarizer.summarize_chunks(chunks, summary_ratio)
+
+    workers = [threading.Thread(target=job) for _ in range(config["jobs"])]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+
+    plan = get_resource_manager().plan(config["parallel_batches"], config["jobs"])
+    return {
+        "chunks_per_second": len(chunks) * repeat * config["jobs"] / seconds,
+        "intra_op": plan.intra_op,
+        "streams": plan.parallel_batches * config["jobs"],
+    }
+
+def benchmark_threads(model="t5-small", paths=None, repeat=2, summary_ratio=0.4, jobs=(1, 2),
+                      parallel_batches=(1, 2, 4), thread_budgets=(0,), interop=1, batch_size=2):
+    """Throughput across concurrent jobs, parallel batches and thread budgets"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.resources import cpu_count
+
+    cores = cpu_count()
+    print(f"⏱️  CPU thread benchmark ({cores} cores, batches of {batch_size} chunks)")
+    print("=" * 72)
+    print(f"{'jobs':>4} {'batches':>7} {'budget':>7} {'threads/stream':>14} {'streams':>7} {'chunks/s':>9}")
+
+    results = []
+    for job_count in jobs:
+        for batches in parallel_batches:
+            # The unpartitioned budget gives every stream all cores, as torch does by default
+            budgets = {}
+            for budget in list(thread_budgets) + [cores * job_count * batches]:
+                budgets.setdefault(budget or cores, budget)
+            for budget in budgets.values():
+                config = {"jobs": job_count, "parallel_batches": batches, "threads": budget,
+                          "interop": interop, "batch_size": batch_size}
+                command = [sys.executable, os.path.abspath(__file__), "threads", "--measure", json.dumps(config),
+                           "--model", model, "--repeat", str(repeat), "--ratio", str(summary_ratio)] + list(paths or [])
+                output = subprocess.check_output(command, cwd=PROJECT_DIR, text=True)
+                report = json.loads(output.strip().splitlines()[-1])
+                if report is None:
+                    print(f"❌ Could not load {model}")
+                    return False
+                oversubscribed = report["intra_op"] * report["streams"] > cores
+                results.append((config, report))
+                print(f"{job_count:>4} {batches:>7} {budget or 'auto':>7} {report['intra_op']:>14} "
+                      f"{report['streams']:>7} {report['chunks_per_second']:>9.2f}"
+                      f"{'   ⚠️ oversubscribed' if oversubscribed else ''}")
+
+    print("=" * 72)
+    config, report = max(results, key=lambda item: item[1]["chunks_per_second"])
+    print(f"🚀 Best: {config['jobs']} job(s), {config['parallel_batches']} parallel batches, "
+          f"{report['intra_op']} threads per stream → {report['chunks_per_second']:.2f} chunks/s")
+    return True
+
+def benchmark_online(requests_count=32, latency=0.1, concurrency=(1, 4, 8), loading_requests=2):
+    """Per-request connections vs the pooled online client, against the local mock API"""
+    sys.path.insert(0, PROJECT_DIR)
+    import requests
+    from utils.mock_inference_api import MockInferenceAPI
+    from utils.online_client import OnlineSummaryClient
+
+    texts = [BENCHMARK_CORPUS[i % len(BENCHMARK_CORPUS)] for i in range(requests_count)]
+    print(f"⏱️  Online client benchmark ({requests_count} requests, {latency * 1000:.0f} ms server latency)")
+    print("=" * 72)
+
+    # What online mode did before: a fresh connection per request, one at a time
+    with MockInferenceAPI(latency=latency) as api:
+        start = time.perf_counter()
+        for text in texts:
+            payload = {"inputs": text, "parameters": {"max_length": 60, "min_length": 20}}
+            requests.post(api.url, json=payload, timeout=30).raise_for_status()
+        baseline = time.perf_counter() - start
+    print(f"{'requests.post':<22} {baseline:6.2f} s   {requests_count / baseline:6.1f} req/s   "
+          f"{api.connections:3d} connections")
+
+    ok = True
+    for limit in concurrency:
+        # The first requests see "model loading" 503s and must be retried, not failed
+        with MockInferenceAPI(latency=latency, loading_requests=loading_requests, estimated_time=0.2) as api:
+            client = OnlineSummaryClient(url=api.url, max_concurrency=limit, backoff=0.1)
+            start = time.perf_counter()
+            results = client.summarize_many([(text, 60, 20) for text in texts])
+            seconds = time.perf_counter() - start
+            client.close()
+        failed = sum(isinstance(result, Exception) for result in results)
+        ok = ok and not failed and api.max_in_flight <= limit
+        print(f"{f'pooled, {limit} concurrent':<22} {seconds:6.2f} s   {requests_count / seconds:6.1f} req/s   "
+              f"{api.connections:3d} connections   {client.retries} retried   "
+              f"max in flight {api.max_in_flight}   {failed} failed")
+
+    print("=" * 72)
+    print("✅ Pooled client respected the concurrency limits" if ok else "❌ Failed requests or limit exceeded")
+    return ok
+
+def _legacy_extractive_summary(text, summary_ratio):
+    """The word-frequency loop fallback_extractive_summary used before the LexRank engine"""
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if len(s.strip()) > 10]
+    if len(sentences) <= 2:
+        return text
+    word_freq = Counter(text.lower().split())
+    scores = [(sum(word_freq.get(word.lower(), 0) for word in sentence.split()), i, sentence)
+              for i, sentence in enumerate(sentences)]
+    top = sorted(scores, key=lambda x: x[0], reverse=True)[:max(1, int(len(sentences) * summary_ratio))]
+    return ' '.join(s[2] for s in sorted(top, key=lambda x: x[1]))
+
+def benchmark_extractive(sizes=(100, 1000, 10000), paths=None, repeat=3, summary_ratio=0.4, min_speedup=1.0):
+    """Legacy frequency loop vs vectorized TF-IDF LexRank, by document size in sentences"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.document import Document
+    from utils.extractive import extract_summary, lexrank_scores, tfidf_matrix
+
+    pool = Document(" ".join(_load_corpus(paths))).sentences(min_length=10)
+    print(f"⏱️  Extractive benchmark ({len(pool)} distinct sentences, best of {repeat})")
+    print("=" * 72)
+    print(f"{'sentences':>10} {'legacy':>10} {'tf-idf':>10} {'lexrank':>10} {'total':>10} {'speedup':>9}")
+
+    ok = True
+    for size in sizes:
+        sentences = [pool[i % len(pool)] for i in range(size)]
+        text = " ".join(sentences)
+        timings = {'legacy': [], 'tfidf': [], 'lexrank': [], 'total': []}
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _legacy_extractive_summary(text, summary_ratio)
+            timings['legacy'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matrix = tfidf_matrix(sentences)
+            timings['tfidf'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            lexrank_scores(matrix)
+            timings['lexrank'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            extract_summary(Document(text).sentences(min_length=10), summary_ratio)
+            timings['total'].append(time.perf_counter() - start)
+        best = {name: min(values) for name, values in timings.items()}
+        print(f"{size:>10} {best['legacy'] * 1000:>8.1f}ms {best['tfidf'] * 1000:>8.1f}ms "
+              f"{best['lexrank'] * 1000:>8.1f}ms {best['total'] * 1000:>8.1f}ms "
+              f"{best['legacy'] / best['total']:>8.2f}x")
+        # Segmenting and ranking must beat the loop it replaced on large documents
+        if size >= 10000 and best['legacy'] / best['total'] < min_speedup:
+            ok = False
+
+    print("=" * 72)
+    print(f"✅ LexRank at least {min_speedup:.1f}x faster than the legacy loop" if ok
+          else f"❌ LexRank less than {min_speedup:.1f}x faster than the legacy loop at 10k sentences")
+    return ok
+
+def _prefiltered_summary(summarizer, text, summary_ratio, keep_ratio):
+    """Map-reduce summary of text after keeping keep_ratio of its sentences; returns (summary, chunks)"""
+    from utils.document import Document
+    from utils.extractive import select_sentences
+
+    sentences = Document(summarizer.clean_extracted_text(text)).sentences(summarizer.chunker.min_sentence_length)
+    if keep_ratio < 1:
+        sentences = select_sentences(sentences, keep_ratio)
+    chunks = list(summarizer.chunker.iter_chunks(sentences))
+    summaries = summarizer.summarize_chunks(chunks, summary_ratio)
+    return summarizer.reduce_summaries(summaries, summary_ratio), len(chunks)
+
+def benchmark_prefilter(model="t5-small", paths=None, repeat=2, detail_ratios=(0.2, 0.4, 0.7)):
+    """Inference time with and without the extractive pre-filter, and ROUGE agreement of the summaries"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.extractive import prefilter_keep_ratio
+    from utils.summarizer import AIDocumentSummarizer
+
+    # The built-in paragraphs are short, so by default they form one longer document
+    corpus = _load_corpus(paths) if paths else [" ".join(BENCHMARK_CORPUS)]
+    summarizer = AIDocumentSummarizer(model_type=model, use_cache=False)
+    if summarizer.summarizer is None:
+        print(f"❌ Could not load {model}")
+        return False
+    summarizer.warm_up()
+
+    print(f"⏱️  Pre-filter benchmark ({model}, {len(corpus)} document(s), median of {repeat})")
+    print("=" * 78)
+    print(f"{'detail':>6} {'keep':>5} {'chunks':>9} {'full':>8} {'filtered':>9} {'speedup':>8} "
+          f"{'R-1':>6} {'R-2':>6} {'R-L':>6}")
+    for summary_ratio in detail_ratios:
+        keep_ratio = prefilter_keep_ratio(summary_ratio)
+        runs = {}
+        for keep in (1.0, keep_ratio):
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results = [_prefiltered_summary(summarizer, text, summary_ratio, keep) for text in corpus]
+                timings.append(time.perf_counter() - start)
+            runs[keep] = (statistics.median(timings), results)
+
+        full_seconds, full = runs[1.0]
+        filtered_seconds, filtered = runs[keep_ratio]
+        scores = [rouge_scores(reference, candidate) for (reference, _), (candidate, _) in zip(full, filtered)]
+        chunks = f"{sum(n for _, n in full)}→{sum(n for _, n in filtered)}"
+        print(f"{summary_ratio:>6.1f} {keep_ratio:>5.0%} {chunks:>9} {full_seconds:>7.2f}s {filtered_seconds:>8.2f}s "
+              f"{full_seconds / filtered_seconds:>7.2f}x "
+              + " ".join(f"{statistics.mean(score[name] for score in scores):>6.3f}"
+                         for name in ("rouge1", "rouge2", "rougeL")))
+    print("=" * 78)
+    print("ℹ️ ROUGE compares each filtered summary with the summary of the whole document")
+    return True
+
+def _legacy_clean_page(text):
+    """The four re.sub passes and line filter clean_extracted_text used before the normalization module"""
+    text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+    text = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', text)
+    text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
+    text = re.sub(r'\s+', ' ', text)
+    return ' '.join(line.strip() for line in text.split('\n') if len(line.strip()) > 20)
+
+def _synthetic_pages(size_mb, line_width=80, lines_per_page=50):
+    """Corpus text wrapped into PDF-like pages of short lines, about size_mb megabytes in all"""
+    words = " ".join(BENCHMARK_CORPUS).split()
+    lines, line = [], []
+    for word in words:
+        if line and sum(len(w) + 1 for w in line) + len(word) > line_width:
+            lines.append(" ".join(line))
+            line = []
+        line.append(word)
+    lines.append(" ".join(line))
+    # Page headers and numbers, as PDF extraction returns them
+    page = "\n".join(["Chapter 3  Sensing Systems"] + lines[:lines_per_page] + ["Page 12"])
+    return [page] * max(1, int(size_mb * 1024 * 1024 / len(page.encode())))
+
+def benchmark_normalize(paths=None, repeat=3, size_mb=20.0):
+    """Throughput of the legacy per-rule cleaning passes vs the single-pass normalizer, in MB/s"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.extraction import iter_file_pages
+    from utils.normalization import ADDRESS_PATTERN, normalize_page
+
+    pages = [page for path in paths for page in iter_file_pages(path)] if paths else _synthetic_pages(size_mb)
+    megabytes = sum(len(page.encode()) for page in pages) / (1024 * 1024)
+    print(f"⏱️  Normalization benchmark ({len(pages)} pages, {megabytes:.1f} MB, best of {repeat})")
+    print("=" * 60)
+
+    timings = {'legacy': [], 'single-pass': []}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        legacy = [_legacy_clean_page(page) for page in pages]
+        timings['legacy'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        normalized = [normalize_page(page) for page in pages]
+        timings['single-pass'].append(time.perf_counter() - start)
+    for name, values in timings.items():
+        print(f"{name:>12} {min(values):>8.3f}s {megabytes / min(values):>8.1f} MB/s")
+    print(f"{'speedup':>12} {min(timings['legacy']) / min(timings['single-pass']):>8.2f}x")
+
+    # Without the line filter both must give the same text; the legacy filter
+    # only ever saw one collapsed line, so it kept or dropped whole pages.
+    # Pages with email addresses or URLs differ on purpose: those stay whole.
+    comparable = [(page, text) for page, text in zip(pages, legacy) if text and not ADDRESS_PATTERN.search(page)]
+    identical = sum(normalize_page(page, 0) == text for page, text in comparable)
+    compared = len(comparable)
+    kept = sum(len(text) for text in normalized) / max(1, sum(len(text) for text in legacy))
+    print("=" * 60)
+    print(f"ℹ️ {identical}/{compared} pages identical without the line filter, "
+          f"{kept:.1%} of the legacy text kept with it")
+    ok = identical == compared
+    print("✅ Same text as the legacy passes" if ok else "❌ Normalized text differs from the legacy passes")
+    return ok
+
+def _iter_document_pages(paths=None, page_count=1000, lines_per_page=50):
+    """Pages of the given files, or page_count distinct pages of shuffled corpus words"""
+    if paths:
+        from utils.extraction import iter_file_pages
+        for path in paths:
+            yield from iter_file_pages(path)
+        return
+    import random
+    words = " ".join(BENCHMARK_CORPUS).split()
+    for number in range(page_count):
+        rng = random.Random(number)
+        lines = [" ".join(rng.sample(words, 12)) + rng.choice(".,;.") for _ in range(lines_per_page)]
+        yield "\n".join([f"Chapter {number // 20 + 1}"] + lines + [f"Page {number + 1}"])
+
+def _measure_memory(representation, paths, page_count):
+    """Runs in a fresh interpreter: build one representation of a document and report its peak RSS"""
+    sys.path.insert(0, PROJECT_DIR)
+    from utils.chunker import TextChunker
+    from utils.document import SENTENCE_PATTERN, Document
+    from utils.normalization import normalize_page
+
+    chunker = TextChunker(900)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if representation == "strings":
+        # Raw text, cleaned text, sentence strings and chunk strings, all held at once
+        raw = "".join(page + "\n" for page in _iter_document_pages(paths, page_count))
+        cleaned = normalize_page(raw)
+        sentences = [sentence for sentence in (match.group().strip() for match in SENTENCE_PATTERN.finditer(cleaned))
+                     if sentence]
+        chunks = [chunk.text for chunk in chunker.iter_chunks(sentences)]
+        counts = (len(cleaned), len(sentences), len(chunks))
+    elif representation == "compact":
+        # What the pre-filter and extractive modes do: the whole document sits in
+        # one UTF-8 buffer with offset arrays, and sentences are decoded as read
+        document = Document()
+        for page in _iter_document_pages(paths, page_count):
+            document.append(normalize_page(page))
+        document.finish()
+        sentences = document.select()
+        counts = (document.length, len(sentences), sum(1 for _ in chunker.iter_chunks(sentences)))
+    else:
+        # What plain map-reduce does: pages are cleaned, segmented and chunked as
+        # they arrive, and the Document only counts sentences and words
+        document = Document(keep_text=False)
+
+        def sentences():
+            for page in _iter_document_pages(paths, page_count):
+                yield from document.append(normalize_page(page))
+            yield from document.finish()
+
+        chunks = sum(1 for _ in chunker.iter_chunks(sentences()))
+        counts = (document.length, len(document), chunks)
+    return {
+        "seconds": time.perf_counter() - start,
+        "peak_rss_mb": peak_rss_mb() - baseline,
+        "counts": counts,
+    }
+
+def benchmark_memory(paths=None, page_count=1000):
+    """Peak memory of holding a large document as Python strings, in the compact store, and streamed"""
+    source = f"{len(paths)} file(s)" if paths else f"{page_count} synthetic pages"
+    print(f"⏱️  Document memory benchmark ({source}, one process per representation)")
+    print("=" * 60)
+
+    results = {}
+    for representation in ("strings", "compact", "streaming"):
+        command = [sys.executable, os.path.abspath(__file__), "memory", "--measure", representation,
+                   "--pages", str(page_count)] + list(paths or [])
+        output = subprocess.check_output(command, cwd=PROJECT_DIR, text=True)
+        report = results[representation] = json.loads(output.strip().splitlines()[-1])
+        characters, sentences, chunks = report["counts"]
+        print(f"{representation:<9} peak RSS +{report['peak_rss_mb']:7.1f} MB   {report['seconds']:6.2f} s   "
+              f"{characters} chars, {sentences} sentences, {chunks} chunks")
+
+    print("=" * 60)
+    strings, compact, streaming = results["strings"], results["compact"], results["streaming"]
+    ok = strings["counts"][1:] == compact["counts"][1:] == streaming["counts"][1:]
+    if compact["peak_rss_mb"] > 0:
+        print(f"📉 {strings['peak_rss_mb'] / compact['peak_rss_mb']:.1f}x less peak memory with the compact store")
+    if streaming["peak_rss_mb"] > 0:
+        print(f"📉 {strings['peak_rss_mb'] / streaming['peak_rss_mb']:.1f}x less peak memory when streaming")
+    print("✅ Same sentences and chunks" if ok else "❌ Representations disagree on sentences or chunks")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI Document Summarizer benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    startup = subparsers.add_parser("startup", help="import time of the GUI, CLI and summarizer modules")
+    startup.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    startup.add_argument("--budget-scale", type=float, default=1.0,
+                         help="multiply every budget, e.g. for slow CI machines")
+
+    quantization = subparsers.add_parser("quantization", help="fp32 vs int8 latency and ROUGE agreement")
+    quantization.add_argument("files", nargs="*", help="documents to use instead of the built-in corpus")
+    quantization.add_argument("--model", default="t5-small", help="offline model name or path")
+    quantization.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus")
+    quantization.add_argument("--ratio", type=float, default=0.4, help="summary ratio")
+
+    backends = subparsers.add_parser("backends", help="torch vs ONNX Runtime latency and peak memory")
+    backends.add_argument("files", nargs="*", help="documents to use instead of the built-in corpus")
+    backends.add_argument("--model", default="t5-small", help="offline model name or path")
+    backends.add_argument("--repeat", type=int, default=3, help="timed passes over the corpus")
+    backends.add_argument("--ratio", type=float, default=0.4, help="summary ratio")
+    backends.add_argument("--measure", help=argparse.SUPPRESS)
+
+    threads = subparsers.add_parser("threads", help="throughput across CPU thread partitions")
+    threads.add_argument("files", nargs="*", help="documents to use instead of the built-in corpus")
+    threads.add_argument("--model", default="t5-small", help="offline model name or path")
+    threads.add_argument("--repeat", type=int, default=2, help="passes over the corpus per job")
+    threads.add_argument("--ratio", type=float, default=0.4, help="summary ratio")
+    threads.add_argument("--jobs", type=_int_list, default=[1, 2], help="concurrent job counts, e.g. 1,2")
+    threads.add_argument("--parallel-batches", type=_int_list, default=[1, 2, 4],
+                         help="parallel batch counts per job, e.g. 1,2,4")
+    threads.add_argument("--threads", type=_int_list, default=[0],
+                         help="thread budgets, 0 for one per core (the unpartitioned budget is always added)")
+    threads.add_argument("--interop-threads", type=int, default=1, help="PyTorch inter-op threads")
+    threads.add_argument("--batch-size", type=int, default=2, help="chunks per batch")
+    threads.add_argument("--measure", help=argparse.SUPPRESS)
+
+    online = subparsers.add_parser("online", help="pooled online client vs per-request connections (mock API)")
+    online.add_argument("--requests", type=int, default=32, help="summarization requests to send")
+    online.add_argument("--latency", type=float, default=0.1, help="mock server latency per request in seconds")
+    online.add_argument("--concurrency", type=_int_list, default=[1, 4, 8], help="client concurrency limits")
+    online.add_argument("--loading-requests", type=int, default=2,
+                        help="initial 503 'model loading' answers the client must retry")
+
+    extractive = subparsers.add_parser("extractive", help="legacy frequency loop vs TF-IDF LexRank")
+    extractive.add_argument("files", nargs="*", help="documents to use instead of the built-in corpus")
+    extractive.add_argument("--sentences", type=_int_list, default=[100, 1000, 10000],
+                            help="document sizes in sentences")
+    extractive.add_argument("--repeat", type=int, default=3, help="timed passes per size")
+    extractive.add_argument("--ratio", type=float, default=0.4, help="summary ratio")
+    extractive.add_argument("--min-speedup", type=float, default=1.0,
+                            help="speedup over the legacy loop required at 10k sentences")
+
+    prefilter = subparsers.add_parser("prefilter", help="inference speedup vs ROUGE of the extractive pre-filter")
+    prefilter.add_argument("files", nargs="*", help="documents to use instead of the built-in corpus")
+    prefilter.add_argument("--model", default="t5-small", help="offline model name or path")
+    prefilter.add_argument("--repeat", type=int, default=2, help="timed passes per setting")
+
+    normalize = subparsers.add_parser("normalize", help="MB/s of the legacy cleaning passes vs single-pass normalization")
+    normalize.add_argument("files", nargs="*", help="documents to use instead of synthetic pages")
+    normalize.add_argument("--size-mb", type=float, default=20.0, help="size of the synthetic input")
+    normalize.add_argument("--repeat", type=int, default=3, help="timed passes")
+
+    memory = subparsers.add_parser("memory", help="peak RSS of string lists vs the compact store and streaming")
+    memory.add_argument("files", nargs="*", help="documents to use instead of synthetic pages")
+    memory.add_argument("--pages", type=int, default=1000, help="synthetic pages to generate")
+    memory.add_argument("--measure", choices=("strings", "compact", "streaming"), help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+    if args.benchmark == "memory" and args.measure:
+        print(json.dumps(_measure_memory(args.measure, args.files, args.pages)))
+        return True
+    if args.benchmark == "memory":
+        return benchmark_memory(args.files, args.pages)
+    if args.benchmark == "normalize":
+        return benchmark_normalize(args.files, args.repeat, args.size_mb)
+    if args.benchmark == "prefilter":
+        return benchmark_prefilter(args.model, args.files, args.repeat)
+    if args.benchmark == "extractive":
+        return benchmark_extractive(args.sentences, args.files, args.repeat, args.ratio, args.min_speedup)
+    if args.benchmark == "online":
+        return benchmark_online(args.requests, args.latency, args.concurrency, args.loading_requests)
+    if args.benchmark == "threads" and args.measure:
+        print(json.dumps(_measure_threads(json.loads(args.measure), args.model, args.files, args.repeat,
+                                          args.ratio)))
+        return True
+    if args.benchmark == "threads":
+        return benchmark_threads(args.model, args.files, args.repeat, args.ratio, args.jobs,
+                                 args.parallel_batches, args.threads, args.interop_threads, args.batch_size)
+    if args.benchmark == "backends" and args.measure:
+        print(json.dumps(_measure_backend(args.measure, args.model, args.files, args.repeat, args.ratio)))
+        return True
+    if args.benchmark == "backends":
+        return benchmark_backends(args.model, args.files, args.repeat, args.ratio)
+    if args.benchmark == "startup":
+        return benchmark_startup(args.repeat, args.budget_scale)
+    if args.benchmark == "quantization":
+        return benchmark_quantization(args.model, args.files, args.repeat, args.ratio)
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -13,6 +13,7 @@ def install_requirements():
     packages = [
         "PyQt5>=5.15.9",
         "numpy>=1.26.0",  # Python 3.13 compatible
+        "scipy>=1.11.0",  # Sparse TF-IDF / LexRank extraction
         "scikit-learn>=1.4.0",  # Python 3.13 compatible
         "networkx>=3.1",
         "PyPDF2>=3.0.1",
@@ -0,0 +1,238 @@
+"""Headless command-line entry point for AI Document Summarizer Pro.
+
+Summarizes files, directories or glob patterns without a GUI and writes a
+JSON and/or PDF summary per document. PyQt5 is never imported, so this runs
+on servers and from cron. Cached summaries are served without loading any
+ML libraries.
+
+Examples:
+    python cli.py report.pdf
+    python cli.py docs/ "archive/**/*.pdf" --recursive -o summaries --format both
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import sys
+
+from utils.backends import BACKEND_NAMES, set_quiet
+from utils.extractive import EXTRACTIVE_MODEL
+from utils.hybrid import get_hybrid_router
+from utils.online_client import DEFAULT_REQUESTS_PER_SECOND, get_online_client
+from utils.resources import get_resource_manager
+from utils.scheduler import SummaryScheduler
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt')
+
+# Same detail levels as the GUI's detail selector
+DETAIL_LEVELS = {
+    'high': 0.7,
+    'medium': 0.4,
+    'low': 0.2
+}
+
+def collect_files(inputs, recursive=False):
+    """Expand files, directories and glob patterns into a de-duplicated file list"""
+    files = []
+    seen = set()
+
+    def add(path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen and os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS:
+            seen.add(key)
+            files.append(path)
+
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = os.path.join(item, '**', '*') if recursive else os.path.join(item, '*')
+            for path in sorted(glob.glob(pattern, recursive=recursive)):
+                if os.path.isfile(path):
+                    add(path)
+        elif os.path.isfile(item):
+            # Explicitly named files are accepted whatever their extension
+            key = os.path.normcase(os.path.abspath(item))
+            if key not in seen:
+                seen.add(key)
+                files.append(item)
+        else:
+            for path in sorted(glob.glob(item, recursive=True)):
+                if os.path.isfile(path):
+                    add(path)
+
+    return files
+
+def output_paths(file_paths, output_dir=None):
+    """Output path stem per input; inputs sharing a name get a numeric suffix"""
+    stems = []
+    used = set()
+    for path in file_paths:
+        directory = output_dir or os.path.dirname(path)
+        base = os.path.splitext(os.path.basename(path))[0] + "_summary"
+        stem = os.path.join(directory, base)
+        counter = 2
+        while os.path.normcase(stem) in used:
+            stem = os.path.join(directory, f"{base}_{counter}")
+            counter += 1
+        used.add(os.path.normcase(stem))
+        stems.append(stem)
+    return stems
+
+def write_outputs(file_path, result, stem, formats):
+    """Write the requested output formats for one summary, returning the paths written"""
+    written = []
+    os.makedirs(os.path.dirname(stem) or '.', exist_ok=True)
+
+    if 'json' in formats:
+        json_path = stem + ".json"
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2, ensure_ascii=False)
+        written.append(json_path)
+
+    if 'pdf' in formats:
+        from utils.pdf_generator import save_summary_as_pdf
+        file_info = {
+            'filename': os.path.basename(file_path),
+            'size_mb': os.path.getsize(file_path) / (1024 * 1024),
+            'path': file_path
+        }
+        pdf_path = stem + ".pdf"
+        if not save_summary_as_pdf(result, file_info, pdf_path):
+            raise Exception(f"Could not write {pdf_path}")
+        written.append(pdf_path)
+
+    return written
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Summarize PDF and text documents without the GUI."
+    )
+    parser.add_argument('inputs', nargs='+', help="files, directories or glob patterns")
+    parser.add_argument('-o', '--output-dir', help="directory for outputs (default: next to each input)")
+    parser.add_argument('-f', '--format', choices=['json', 'pdf', 'both'], default='json',
+                        help="output format (default: json)")
+    parser.add_argument('-d', '--detail', choices=sorted(DETAIL_LEVELS), default='medium',
+                        help="summary detail level (default: medium)")
+    parser.add_argument('--ratio', type=float, help="summary ratio, overrides --detail")
+    parser.add_argument('-m', '--model', default="t5-small", help="offline model name or path")
+    parser.add_argument('--online', action='store_true', help="use the online HuggingFace API")
+    parser.add_argument('--extractive', action='store_true',
+                        help="fast LexRank sentence extraction without an AI model")
+    parser.add_argument('--prefilter', action='store_true',
+                        help="send only the most salient sentences to the model (share follows --detail)")
+    parser.add_argument('--hybrid', action='store_true',
+                        help="route chunks between the offline model and the online API by observed latency")
+    parser.add_argument('--no-redact', action='store_true',
+                        help="send text online without masking emails, phone numbers and other personal data")
+    parser.add_argument('--online-concurrency', type=int, default=4,
+                        help="online requests in flight at once (default: 4)")
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_REQUESTS_PER_SECOND,
+                        help=f"online requests per second, 0 for no limit (default: {DEFAULT_REQUESTS_PER_SECOND:g})")
+    parser.add_argument('--quantize', action='store_true',
+                        help="run the offline model with dynamic int8 quantization")
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default="torch",
+                        help="offline inference engine (default: torch)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="search directories recursively")
+    parser.add_argument('-j', '--jobs', type=int, default=2,
+                        help="files extracted concurrently ahead of inference (default: 2)")
+    parser.add_argument('--pdf-workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="processes per large PDF (default: half the CPU cores)")
+    parser.add_argument('--threads', type=int, default=0,
+                        help="CPU threads shared by all inference work (default: 0, one per core)")
+    parser.add_argument('--interop-threads', type=int, default=1,
+                        help="PyTorch inter-op threads (default: 1)")
+    parser.add_argument('--parallel-batches', type=int, default=2,
+                        help="batches generated concurrently, splitting the threads (default: 2)")
+    parser.add_argument('--inference-workers', type=int, default=1,
+                        help="files summarized concurrently with the shared model, splitting the threads (default: 1)")
+    parser.add_argument('--server', action='store_true',
+                        help="generate in the shared inference server process, starting it if needed")
+    parser.add_argument('--no-cache', action='store_true', help="ignore and do not update the summary cache")
+    parser.add_argument('-q', '--quiet', action='store_true', help="only report results and errors")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    file_paths = collect_files(args.inputs, args.recursive)
+    if not file_paths:
+        print("❌ No PDF or text files matched the given inputs.", file=sys.stderr)
+        return 2
+
+    if args.quantize and args.backend != "torch":
+        print("❌ --quantize is only available with the torch backend.", file=sys.stderr)
+        return 2
+
+    if args.threads < 0 or args.interop_threads < 1 or args.parallel_batches < 1 or args.inference_workers < 1:
+        print("❌ --threads must be 0 or more, --interop-threads, --parallel-batches and --inference-workers "
+              "1 or more.", file=sys.stderr)
+        return 2
+
+    get_resource_manager().configure(total_threads=args.threads, inter_op_threads=args.interop_threads)
+
+    if args.online + args.hybrid + args.extractive > 1:
+        print("❌ Choose only one of --online, --hybrid and --extractive.", file=sys.stderr)
+        return 2
+
+    if args.online or args.hybrid:
+        if args.online_concurrency < 1 or args.rate_limit < 0:
+            print("❌ --online-concurrency must be 1 or more, --rate-limit 0 or more.", file=sys.stderr)
+            return 2
+        get_online_client().configure(max_concurrency=args.online_concurrency, requests_per_second=args.rate_limit)
+
+    formats = ('json', 'pdf') if args.format == 'both' else (args.format,)
+    summary_ratio = args.ratio if args.ratio is not None else DETAIL_LEVELS[args.detail]
+    stems = output_paths(file_paths, args.output_dir)
+    failures = []
+    # The summarizer and clients print their progress; --quiet sends it to devnull
+    results = sys.stdout
+
+    def on_progress(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    def on_file_finished(index, result):
+        try:
+            for path in write_outputs(file_paths[index], result, stems[index], formats):
+                print(f"✅ {path}", file=results)
+        except Exception as e:
+            on_file_error(index, f"Error writing output for {os.path.basename(file_paths[index])}: {str(e)}")
+
+    def on_file_error(index, message):
+        failures.append(file_paths[index])
+        print(f"❌ {message}", file=sys.stderr)
+
+    # Model loads silence the Hugging Face libraries in this process only, not in child processes
+    set_quiet(args.quiet)
+    quiet = contextlib.ExitStack()
+    if args.quiet:
+        quiet.enter_context(contextlib.redirect_stdout(quiet.enter_context(open(os.devnull, 'w'))))
+    with quiet:
+        scheduler = SummaryScheduler(
+            summary_ratio, EXTRACTIVE_MODEL if args.extractive else args.model, args.online,
+            extraction_workers=args.jobs, pdf_workers=args.pdf_workers, use_cache=not args.no_cache,
+            dtype="qint8" if args.quantize else "float32", backend=args.backend,
+            parallel_batches=args.parallel_batches, use_server=args.server, redact=not args.no_redact,
+            hybrid=args.hybrid, prefilter=args.prefilter, inference_workers=args.inference_workers
+        )
+        try:
+            scheduler.run(file_paths, on_progress=on_progress, on_file_finished=on_file_finished,
+                          on_file_error=on_file_error)
+        except KeyboardInterrupt:
+            print("⚠️ Cancelled.", file=sys.stderr)
+            return 130
+
+    if args.hybrid and not args.quiet:
+        print(get_hybrid_router().report(), file=sys.stderr)
+
+    if failures:
+        print(f"⚠️ {len(failures)} of {len(file_paths)} files failed.", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    # Required for PDF extraction worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
 from ui.main_window import ModernSummarizerUI
 
@@ -15,5 +16,7 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    # Required for PDF extraction worker processes in frozen Windows builds
+    multiprocessing.freeze_support()
     main()
 
@@ -0,0 +1,122 @@
+# helpers.py - Shared fixtures: the mock inference API and a stand-in offline model
+
+import os
+import threading
+import time
+import unittest
+
+from utils import hybrid, online_client
+from utils.backends import InferenceBackend
+from utils.chunker import TokenChunker
+from utils.mock_inference_api import MockInferenceAPI
+from utils.summarizer import AIDocumentSummarizer
+
+# Contact details the redaction must keep from the online API
+PERSONAL_DATA = ("jane.roe42@example.com", "+1 555-123-4567", "4111 1111 1111 1111", "10.0.0.15",
+                 "https://intranet.example.org/v2/reportQ3")
+
+
+def marker(page, number):
+    """A word unique to one sentence; letters only, so text cleaning leaves it whole"""
+    return f"marker{chr(ord('a') + page)}{chr(ord('a') + number)}"
+
+
+def document_pages(pages=4, sentences_per_page=12):
+    """Pages of numbered sentences, each naming its own marker word, with personal data on the last page"""
+    result = []
+    for page in range(pages):
+        sentences = [f"Sentence {marker(page, number)} describes how the radar measures echoes from distant "
+                     f"objects in section {number}." for number in range(sentences_per_page)]
+        result.append("\n".join(sentences))
+    result[-1] += (f"\nContact {PERSONAL_DATA[0]} or call {PERSONAL_DATA[1]} about the invoice paid with "
+                   f"card {PERSONAL_DATA[2]}. The server at {PERSONAL_DATA[3]} publishes {PERSONAL_DATA[4]} daily.")
+    return result
+
+
+class MockAPITestCase(unittest.TestCase):
+    """Points the shared online client at a fresh MockInferenceAPI and resets the hybrid router"""
+
+    api_options = {'latency': 0}
+
+    def setUp(self):
+        self.api = MockInferenceAPI(**self.api_options).start()
+        self.addCleanup(self.api.stop)
+
+        previous_url = os.environ.get(online_client.API_URL_ENV)
+        os.environ[online_client.API_URL_ENV] = self.api.url
+        self.addCleanup(self._restore_url, previous_url)
+
+        online_client._client = None
+        hybrid._router = None
+        self.addCleanup(self._reset_singletons)
+        online_client.get_online_client().configure(requests_per_second=0)
+
+    def _restore_url(self, previous_url):
+        if previous_url is None:
+            os.environ.pop(online_client.API_URL_ENV, None)
+        else:
+            os.environ[online_client.API_URL_ENV] = previous_url
+
+    def _reset_singletons(self):
+        if online_client._client is not None:
+            online_client._client.close()
+        online_client._client = None
+        hybrid._router = None
+
+    def sent_texts(self):
+        return [payload['inputs'] for payload in self.api.payloads]
+
+
+class WordTokenizer:
+    """Whitespace tokenizer with the slice of the Hugging Face tokenizer API the chunker uses"""
+
+    model_max_length = 48
+    eos_token_id = 1
+
+    def __init__(self):
+        self.ids = {}
+        self.words = {}
+
+    def __call__(self, text, add_special_tokens=False, verbose=False):
+        if isinstance(text, str):
+            return {'input_ids': self._encode(text)}
+        return {'input_ids': [self._encode(item) for item in text]}
+
+    def _encode(self, text):
+        ids = []
+        for word in text.split():
+            if word not in self.ids:
+                self.ids[word] = len(self.ids) + 2
+                self.words[self.ids[word]] = word
+            ids.append(self.ids[word])
+        return ids
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(self.words[token] for token in ids if token in self.words)
+
+
+class EchoBackend(InferenceBackend):
+    """Offline stand-in: "summarizes" by echoing the first words, and records every input it saw"""
+
+    name = "echo"
+
+    def __init__(self, latency=0.02):
+        super().__init__(WordTokenizer())
+        self.latency = latency
+        self.inputs = []
+        self._lock = threading.Lock()
+
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        time.sleep(self.latency)
+        texts = [self.tokenizer.decode(ids).replace("summarize: ", "", 1) for ids in batch_ids]
+        with self._lock:
+            self.inputs.extend(texts)
+        return [" ".join(text.split()[:max(min_length, 8)]) for text in texts]
+
+
+class EchoModelSummarizer(AIDocumentSummarizer):
+    """AIDocumentSummarizer whose offline model is an EchoBackend"""
+
+    def _load_offline_model(self):
+        self.summarizer = EchoBackend()
+        self.chunker = TokenChunker(self.summarizer.tokenizer, overlap_tokens=self.chunk_overlap)
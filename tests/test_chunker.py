@@ -0,0 +1,101 @@
+# test_chunker.py - Chunks hold whole sentences in order and stay inside the token window
+
+import unittest
+
+from tests.helpers import WordTokenizer
+from utils.chunker import TOKENS_PER_WORD, TextChunker, TokenChunker, estimate_tokens
+
+
+def numbered_sentences(count, words=6):
+    """Sentences of `words` distinct words each, ending in their number"""
+    return [" ".join(f"w{number}x{index}" for index in range(words - 1)) + f" s{number}." for number in range(count)]
+
+
+class TokenChunkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tokenizer = WordTokenizer()
+        self.chunker = TokenChunker(self.tokenizer)  # 48 tokens: "summarize:", 46 content, EOS
+
+    def content(self, chunk):
+        return chunk.input_ids[len(self.chunker.prefix_ids):-1]
+
+    def test_chunks_fill_the_window_with_whole_sentences(self):
+        sentences = numbered_sentences(20)
+        chunks = list(self.chunker.iter_chunks(sentences))
+
+        self.assertEqual(self.chunker.window, 46)
+        # 7 six-token sentences fit in 46 tokens, the eighth does not
+        self.assertEqual([len(chunk) for chunk in chunks], [44, 44, 38])
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), self.chunker.max_tokens)
+            self.assertEqual(chunk.input_ids[:1], self.chunker.prefix_ids)
+            self.assertEqual(chunk.input_ids[-1], self.tokenizer.eos_token_id)
+            self.assertEqual(self.tokenizer.decode(self.content(chunk)), chunk.text)
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), " ".join(sentences))
+
+    def test_overlap_repeats_trailing_sentences(self):
+        chunker = TokenChunker(self.tokenizer, overlap_tokens=12)
+        sentences = numbered_sentences(20)
+        chunks = list(chunker.iter_chunks(sentences))
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            # Two six-token sentences fit in the 12-token overlap
+            self.assertTrue(chunk.text.startswith(" ".join(previous.text.split()[-12:])))
+            self.assertLessEqual(len(chunk), chunker.max_tokens)
+        self.assertTrue(chunks[-1].text.endswith(sentences[-1]))
+
+    def test_long_sentence_is_split_on_the_window(self):
+        sentence = numbered_sentences(1, words=100)[0]
+        chunks = list(self.chunker.iter_chunks(["Short one first.", sentence, "Short one after."]))
+
+        self.assertEqual([len(self.content(chunk)) for chunk in chunks], [3, 46, 46, 8, 3])
+        self.assertEqual(" ".join(chunk.text for chunk in chunks[1:4]), sentence)
+
+    def test_chunk_from_text_is_trimmed_to_the_window(self):
+        text = numbered_sentences(1, words=60)[0]
+        self.assertEqual(self.chunker.count_tokens(text), 60)
+        chunk = self.chunker.chunk_from_text(text)
+        self.assertEqual(len(chunk), self.chunker.max_tokens)
+        self.assertEqual(chunk.text, " ".join(text.split()[:46]))
+
+    def test_chunk_drops_short_sentences(self):
+        chunks = self.chunker.chunk("Tiny. This sentence is long enough to keep. Ok.")
+        self.assertEqual([chunk.text for chunk in chunks], ["This sentence is long enough to keep."])
+
+
+class TextChunkerTest(unittest.TestCase):
+
+    def test_chunks_stay_within_the_estimated_budget(self):
+        chunker = TextChunker(40)
+        sentences = numbered_sentences(20)
+        chunks = list(chunker.iter_chunks(sentences))
+
+        # Six words estimate to 9 tokens, so four sentences fit in 40
+        self.assertEqual(estimate_tokens(sentences[0]), 9)
+        self.assertEqual([len(chunk) for chunk in chunks], [36] * 5)
+        for chunk in chunks:
+            self.assertEqual(len(chunk), sum(estimate_tokens(sentence) for sentence in chunk.text.split(". ")))
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), " ".join(sentences))
+
+    def test_overlap_repeats_trailing_sentences(self):
+        chunker = TextChunker(40, overlap_tokens=18)
+        chunks = list(chunker.iter_chunks(numbered_sentences(20)))
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            self.assertTrue(chunk.text.startswith(" ".join(previous.text.split()[-12:])))
+            self.assertLessEqual(len(chunk), 40)
+
+    def test_long_sentence_is_split_on_words(self):
+        chunker = TextChunker(40)
+        sentence = numbered_sentences(1, words=70)[0]
+        chunks = list(chunker.iter_chunks([sentence]))
+
+        step = int(40 / TOKENS_PER_WORD)
+        self.assertEqual([len(chunk.text.split()) for chunk in chunks], [step, step, 70 - 2 * step])
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks))
+        self.assertEqual(" ".join(chunk.text for chunk in chunks), sentence)
+
+
+if __name__ == '__main__':
+    unittest.main()
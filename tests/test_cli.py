@@ -0,0 +1,45 @@
+# test_cli.py - Headless runs report only results under --quiet
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+import cli
+from tests.helpers import document_pages
+from utils.extractive import SCIPY_AVAILABLE
+
+
+@unittest.skipUnless(SCIPY_AVAILABLE, "LexRank needs scipy")
+class QuietTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.input = os.path.join(self.directory, "report.txt")
+        with open(self.input, 'w', encoding='utf-8') as file:
+            file.write("\n".join(document_pages()))
+
+    def run_cli(self, *options):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            code = cli.main([self.input, '--extractive', '--no-cache', '-o', self.directory, *options])
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_quiet_prints_only_results(self):
+        code, stdout, stderr = self.run_cli('--quiet')
+        self.assertEqual(code, 0)
+        self.assertEqual(stdout, f"✅ {os.path.join(self.directory, 'report_summary.json')}\n")
+        self.assertEqual(stderr, "")
+
+    def test_progress_is_shown_by_default(self):
+        code, stdout, stderr = self.run_cli()
+        self.assertEqual(code, 0)
+        self.assertIn("LEXRANK", stdout)
+        self.assertTrue(stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# test_document.py - Sentence segmentation of the shared Document
+
+import unittest
+
+from utils.document import Document
+from utils.extractive import select_indices, select_sentences
+
+
+class SegmentationTest(unittest.TestCase):
+
+    def assertSentences(self, text, expected):
+        self.assertEqual(Document(text).sentences(), expected)
+
+    def test_closing_quote_ends_the_sentence(self):
+        self.assertSentences('He said "the test passed." Then we left.',
+                             ['He said "the test passed."', 'Then we left.'])
+        self.assertSentences("She wrote 'done!' Nobody replied.", ["She wrote 'done!'", "Nobody replied."])
+
+    def test_curly_quotes_end_the_sentence(self):
+        self.assertSentences("“done.” Next", ["“done.”", "Next"])
+        self.assertSentences("‘Really?’ she asked.", ["‘Really?’", "she asked."])
+
+    def test_closing_bracket_ends_the_sentence(self):
+        self.assertSentences("(see the table.) were good", ["(see the table.)", "were good"])
+        self.assertSentences("[Figure 2 shows it.] The rest follows.", ["[Figure 2 shows it.]", "The rest follows."])
+
+    def test_punctuation_inside_words_does_not_split(self):
+        self.assertSentences("Version 3.5 is out. Mail jane.doe@example.com or visit www.example.org today!",
+                             ["Version 3.5 is out.", "Mail jane.doe@example.com or visit www.example.org today!"])
+
+    def test_quoted_sentence_cut_by_a_page_break(self):
+        document = Document()
+        self.assertEqual(document.append('He said "it'), [])
+        self.assertEqual(document.append('works." Next page.'), ['He said "it works."', 'Next page.'])
+
+    def test_clauses_drop_closers_and_terminators(self):
+        self.assertEqual(Document('They wrote "this is settled now." Fine.').clauses(),
+                         ['They wrote "this is settled now', 'Fine'])
+
+    def test_terminator_runs_and_trailing_text(self):
+        self.assertSentences("Really?! Yes... no. Unfinished tail", ["Really?!", "Yes...", "no.", "Unfinished tail"])
+
+    def test_blank_pages_add_nothing(self):
+        document = Document()
+        self.assertEqual(document.append("  \n\t "), [])
+        self.assertEqual(document.append("One. Two."), ["One.", "Two."])
+        self.assertEqual((len(document), document.word_count, document.length), (2, 2, 9))
+
+
+class OffsetTest(unittest.TestCase):
+
+    def assertOffsets(self, document, expected):
+        spans = [bytes(document.buffer[start:end]).decode('utf-8') for start, end in zip(document.starts, document.ends)]
+        self.assertEqual(spans, expected)
+        self.assertEqual(list(document), expected)
+
+    def test_ascii_offsets(self):
+        document = Document("First one here.  Second one? Third!")
+        self.assertEqual((list(document.starts), list(document.ends)), ([0, 17, 29], [15, 28, 35]))
+        self.assertOffsets(document, ["First one here.", "Second one?", "Third!"])
+
+    def test_offsets_count_utf8_bytes(self):
+        document = Document("Première phrase ici. Ünïcödé wörds. Fin.")
+        self.assertEqual(list(document.starts), [0, 22, 42])
+        self.assertOffsets(document, ["Première phrase ici.", "Ünïcödé wörds.", "Fin."])
+
+    def test_offsets_across_pages(self):
+        document = Document()
+        self.assertEqual(document.append("Première phrase ici. Deuxième"), ["Première phrase ici."])
+        self.assertEqual(document.append("phrase finit. Trois"), ["Deuxième phrase finit."])
+        self.assertEqual(document.finish(), ["Trois"])
+        # Pages are joined with one space, and a carried sentence starts on its first page
+        self.assertEqual(list(document.starts), [0, 22, 46])
+        self.assertOffsets(document, ["Première phrase ici.", "Deuxième phrase finit.", "Trois"])
+        self.assertEqual(document.length, len("Première phrase ici. Deuxième phrase finit. Trois"))
+
+
+class CompactStoreTest(unittest.TestCase):
+
+    def test_select_filters_by_characters_not_bytes(self):
+        document = Document("Tiny. Ünïcödé wörds. Long enough sentence here.")
+        # "Ünïcödé wörds." is 14 characters but 19 bytes
+        self.assertEqual(list(document.select(min_length=15)), ["Long enough sentence here."])
+        self.assertEqual(list(document.select(min_length=14)), ["Ünïcödé wörds.", "Long enough sentence here."])
+
+    def test_view_decodes_by_position(self):
+        document = Document("First sentence here. Second sentence here. Third sentence here.")
+        view = document.select()
+        self.assertEqual(len(view), 3)
+        self.assertEqual(view[2], "Third sentence here.")
+
+    def test_ranking_a_view_matches_ranking_strings(self):
+        text = " ".join(f"Sentence {number} talks about radar echoes and {'signals' if number % 3 else 'noise'}."
+                        for number in range(30))
+        document = Document(text)
+        view = document.select()
+        self.assertEqual([view[i] for i in select_indices(view, 0.3)],
+                         select_sentences(document.sentences(), 0.3))
+
+    def test_counting_only_document_holds_no_text(self):
+        document = Document("One sentence. Another one.", keep_text=False)
+        self.assertEqual((len(document), document.word_count, len(document.buffer)), (2, 4, 0))
+        with self.assertRaises(ValueError):
+            document.select()
+
+
+if __name__ == '__main__':
+    unittest.main()
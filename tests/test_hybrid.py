@@ -0,0 +1,123 @@
+# test_hybrid.py - Latency-based routing and hybrid mode's local fallback
+
+import time
+import unittest
+
+from tests.helpers import PERSONAL_DATA, EchoModelSummarizer, MockAPITestCase, document_pages, marker
+from utils.document import Document
+from utils.hybrid import OFFLINE, ONLINE, HybridRouter
+from utils.normalization import normalize_page
+from utils.summarizer import TRANSFORMERS_AVAILABLE
+
+
+class HybridRouterTest(unittest.TestCase):
+
+    def test_prefers_the_backend_expected_to_finish_first(self):
+        router = HybridRouter(online_slots=4)
+        # Priors: offline 1.0s with one slot, online 2.0s with four
+        self.assertEqual(router.choose(), ONLINE)
+
+        router.started(ONLINE, 4)
+        self.assertEqual(router.choose(), OFFLINE)
+
+    def test_waits_for_a_busy_backend_that_is_still_faster(self):
+        router = HybridRouter(online_slots=4)
+        self.assertIsNone(router.choose(offline_free=True, online_free=False))
+
+    def test_learns_observed_latency(self):
+        router = HybridRouter(online_slots=1, alpha=1.0)
+        router.started(ONLINE)
+        router.finished(ONLINE, 0.1)
+        self.assertAlmostEqual(router.backends[ONLINE].latency, 0.1)
+        self.assertEqual(router.choose(), ONLINE)
+
+    def test_failing_backend_cools_down(self):
+        router = HybridRouter(online_slots=4, failure_threshold=2, cooldown=0.1)
+        for _ in range(2):
+            router.started(ONLINE)
+            router.failed(ONLINE, 0.01)
+
+        self.assertFalse(router.available(ONLINE))
+        self.assertEqual(router.choose(), OFFLINE)
+        self.assertEqual(router.stats()[ONLINE]['errors'], 2)
+
+        time.sleep(0.15)
+        self.assertTrue(router.available(ONLINE))
+
+    def test_success_resets_the_failure_streak(self):
+        router = HybridRouter(failure_threshold=2, cooldown=30)
+        router.started(ONLINE)
+        router.failed(ONLINE, 0.01)
+        router.started(ONLINE)
+        router.finished(ONLINE, 0.01)
+        router.started(ONLINE)
+        router.failed(ONLINE, 0.01)
+        self.assertTrue(router.available(ONLINE))
+
+
+@unittest.skipUnless(TRANSFORMERS_AVAILABLE, "hybrid mode needs the offline model path")
+class HybridModeTest(MockAPITestCase):
+
+    api_options = {'latency': 0.02, 'fail_every': 3}
+
+    def summarize_chunks(self):
+        summarizer = EchoModelSummarizer(hybrid=True, use_cache=False)
+        text = " ".join(normalize_page(page) for page in document_pages())
+        chunks = list(summarizer.chunker.iter_chunks(Document(text).sentences()))
+        summaries = summarizer.summarize_chunks(chunks, summary_ratio=0.4)
+        return summarizer, chunks, summaries
+
+    def summarized_inputs(self, summarizer):
+        return summarizer.summarizer.inputs + self.sent_texts()
+
+    def assert_each_chunk_summarized_once(self, summarizer, chunks, summaries):
+        self.assertEqual(len(summaries), len(chunks))
+        self.assertTrue(all(summary and summary.strip() for summary in summaries))
+        inputs = self.summarized_inputs(summarizer)
+        self.assertEqual(len(inputs), len(chunks))
+        for chunk in chunks:
+            words = [word for word in chunk.text.split() if word.startswith("marker")]
+            if words:
+                self.assertEqual(sum(1 for text in inputs if words[0] in text.split()), 1, chunk.text)
+
+    def test_failed_online_chunks_are_summarized_locally_once(self):
+        summarizer, chunks, summaries = self.summarize_chunks()
+
+        self.assert_each_chunk_summarized_once(summarizer, chunks, summaries)
+        failed = self.api.requests - len(self.api.payloads)
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(len(summarizer.summarizer.inputs) + len(self.api.payloads), len(chunks))
+        self.assertGreater(failed, 0)
+        self.assertGreaterEqual(len(summarizer.summarizer.inputs), failed)
+
+    def test_every_marker_reaches_exactly_one_backend(self):
+        summarizer, chunks, summaries = self.summarize_chunks()
+
+        inputs = " ".join(self.summarized_inputs(summarizer)).split()
+        for page in range(4):
+            for number in range(12):
+                self.assertEqual(inputs.count(marker(page, number)), 1)
+
+
+@unittest.skipUnless(TRANSFORMERS_AVAILABLE, "hybrid mode needs the offline model path")
+class HybridFallbackTest(MockAPITestCase):
+
+    api_options = {'latency': 0, 'fail_every': 1}
+
+    def test_local_chunks_get_unmasked_text(self):
+        summarizer = EchoModelSummarizer(hybrid=True, use_cache=False)
+        text = " ".join(normalize_page(page) for page in document_pages())
+        chunks = list(summarizer.chunker.iter_chunks(Document(text).sentences()))
+
+        summaries = summarizer.summarize_chunks(chunks, summary_ratio=0.4)
+
+        self.assertEqual(len(summaries), len(chunks))
+        self.assertEqual(self.api.payloads, [])
+        self.assertEqual(len(summarizer.summarizer.inputs), len(chunks))
+        local = " ".join(summarizer.summarizer.inputs)
+        self.assertIn(PERSONAL_DATA[0], local)
+        self.assertNotIn("[EMAIL]", local)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# test_inference_server.py - The shared server must not outlive the model registry's evictions
+
+import gc
+import unittest
+import weakref
+
+from utils import model_registry
+from utils.backends import InferenceBackend
+from utils.inference_server import InferenceServer
+from utils.model_registry import ModelRegistry
+
+
+class CountingBackend(InferenceBackend):
+    """Returns one summary per chunk naming its length"""
+    name = "counting"
+
+    def __init__(self):
+        super().__init__(None)
+
+    def apply_threads(self, threads):
+        pass
+
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        return [f"{len(ids)} tokens" for ids in batch_ids]
+
+
+class InferenceServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ModelRegistry(max_models=1, idle_timeout=0)
+        previous, model_registry._registry = model_registry._registry, self.registry
+        self.addCleanup(setattr, model_registry, '_registry', previous)
+        self.server = InferenceServer(max_wait=0)
+
+    def load(self, name):
+        return self.registry.get(name, -1, "float32", loader=lambda *args: CountingBackend())
+
+    def test_serves_the_registry_backend(self):
+        self.load("model-a")
+        batcher = self.server._get_batcher("model-a", "float32", "torch")
+        self.assertEqual(batcher.generate([[1, 2, 3]], 10, 1), ["3 tokens"])
+
+    def test_releases_models_the_registry_evicts(self):
+        backend = weakref.ref(self.load("model-a"))
+        batcher = self.server._get_batcher("model-a", "float32", "torch")
+        batcher.generate([[1]], 10, 1)
+
+        self.load("model-b")  # max_models=1 evicts model-a
+        gc.collect()
+        self.assertIsNone(backend())
+
+        # A batcher for the evicted model picks up whatever the registry holds now
+        self.load("model-a")
+        self.assertEqual(batcher.generate([[1, 2]], 10, 1), ["2 tokens"])
+
+
+if __name__ == '__main__':
+    unittest.main()
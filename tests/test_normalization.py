@@ -0,0 +1,88 @@
+# test_normalization.py - The single-pass normalizer gives the text the old per-rule passes gave
+
+import random
+import re
+import unittest
+
+from benchmark import _legacy_clean_page
+from utils.normalization import normalize_page, normalize_section, normalize_summary
+
+
+def legacy_summary(text):
+    """The passes clean_summary_text ran before the normalization module"""
+    text = re.sub(r'\s+', ' ', text.strip())
+    return re.sub(r'([A-Z])\s+([A-Z])', r'\1\2', text)
+
+
+def legacy_section(text):
+    """The passes _clean_section_text ran before the normalization module"""
+    text = re.sub(r'\s+', ' ', text.strip())
+    text = re.sub(r'([a-z])([A-Z])', r'\1. \2', text)
+    text = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', text)
+    return re.sub(r'•\s*', '• ', text)
+
+
+class PageTest(unittest.TestCase):
+
+    def assertSameAsLegacy(self, page):
+        # The legacy line filter ran after every newline was gone, so it only
+        # kept or dropped whole pages; without the filter the text must match
+        self.assertEqual(normalize_page(page, 0), _legacy_clean_page(page))
+
+    def test_ligatures(self):
+        self.assertSameAsLegacy("The ﬁnal ﬂow conﬁguration is eﬃcient.\nOfﬁce2024data showsﬁgures ﬀ.")
+
+    def test_hyphenation(self):
+        self.assertSameAsLegacy("Information retrieval across infor-\nmation and hyphen-\nated lines - or not -\n"
+                                "keeps every hyphen as extracted.")
+
+    def test_whitespace_runs(self):
+        self.assertSameAsLegacy("Tabs\t\tand  spaces   collapse,\r\nas do\xa0no-break\u2003em\x0bvertical\x0c"
+                                "and\u2028line separators.\n\n\n  Blank lines too.  ")
+
+    def test_page_headers(self):
+        page = ("Chapter 3\nThe radar measures echoes from distant objects at night.\n"
+                "It runs on a fixed schedule every evening.\nPage 12")
+        self.assertSameAsLegacy(page)
+        # With the filter, the header and page number lines are dropped
+        self.assertEqual(normalize_page(page), "The radar measures echoes from distant objects at night. "
+                                               "It runs on a fixed schedule every evening.")
+
+    def test_glued_words_and_digits(self):
+        self.assertSameAsLegacy("resultsShow that Table3shows abc123def and 2024Results inQ3.")
+
+    def test_random_pages(self):
+        generator = random.Random(23)
+        alphabet = "aZ3 .-\n\tﬁ•é\xa0"
+        for _ in range(500):
+            page = ''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 80)))
+            # Legacy dropped any page of 20 characters or fewer once collapsed
+            if _legacy_clean_page(page):
+                self.assertSameAsLegacy(page)
+
+    def test_addresses_stay_whole(self):
+        page = "Mail jane@exampleCorp.com or see www.Example2024.org/Q3report for details."
+        self.assertIn("jane@exampleCorp.com", normalize_page(page))
+        self.assertIn("www.Example2024.org/Q3report", normalize_page(page))
+        self.assertNotEqual(normalize_page(page, 0), _legacy_clean_page(page))
+
+
+class SummaryAndSectionTest(unittest.TestCase):
+
+    def test_examples(self):
+        for text in ("  The U S  and U K\tagreed. ", "A B C D", "endNext section.Then more • item •  other\n\n"
+                     "ﬁnal ﬂow", "word-\nwrapped text!  Yes?No"):
+            self.assertEqual(normalize_summary(text), legacy_summary(text))
+            self.assertEqual(normalize_section(text), legacy_section(text))
+
+    def test_random_text(self):
+        generator = random.Random(24)
+        alphabet = "aZB .!?•\n\t"
+        for _ in range(500):
+            text = ''.join(generator.choice(alphabet) for _ in range(generator.randint(0, 40)))
+            self.assertEqual(normalize_summary(text), legacy_summary(text))
+            self.assertEqual(normalize_section(text), legacy_section(text))
+
+
+if __name__ == '__main__':
+    unittest.main()
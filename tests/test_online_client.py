@@ -0,0 +1,67 @@
+# test_online_client.py - OnlineSummaryClient against the local mock inference API
+
+import unittest
+
+from utils.mock_inference_api import MockInferenceAPI
+from utils.online_client import OnlineSummaryClient
+
+TEXT = "Radar systems transmit pulses of radio energy and measure the echoes that return from objects."
+
+
+class OnlineSummaryClientTest(unittest.TestCase):
+
+    def start_api(self, **options):
+        api = MockInferenceAPI(**options).start()
+        self.addCleanup(api.stop)
+        return api
+
+    def make_client(self, api, **options):
+        client = OnlineSummaryClient(url=api.url, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_retries_while_model_loads(self):
+        api = self.start_api(latency=0, loading_requests=2, estimated_time=0.05)
+        client = self.make_client(api, max_concurrency=1)
+
+        summary = client.summarize(TEXT, max_length=20, min_length=5)
+
+        self.assertTrue(TEXT.startswith(summary))
+        self.assertEqual(client.retries, 2)
+        self.assertEqual(api.requests, 3)
+
+    def test_gives_up_after_max_retries(self):
+        api = self.start_api(latency=0, loading_requests=5, estimated_time=0.01)
+        client = self.make_client(api, max_retries=1)
+
+        with self.assertRaises(Exception) as raised:
+            client.summarize(TEXT, max_length=20, min_length=5)
+
+        self.assertEqual(raised.exception.status, 503)
+        self.assertEqual(api.requests, 2)
+
+    def test_reuses_connections(self):
+        api = self.start_api(latency=0)
+        client = self.make_client(api, max_concurrency=1)
+
+        for _ in range(10):
+            client.summarize(TEXT, max_length=20, min_length=5)
+
+        self.assertEqual(api.requests, 10)
+        self.assertLess(api.connections, api.requests)
+
+    def test_caps_concurrent_requests(self):
+        api = self.start_api(latency=0.05)
+        client = self.make_client(api, max_concurrency=3)
+
+        results = client.summarize_many([(TEXT, 20, 5)] * 12)
+
+        self.assertEqual(len(results), 12)
+        self.assertFalse([result for result in results if isinstance(result, Exception)])
+        self.assertLessEqual(api.max_in_flight, 3)
+        self.assertGreater(api.max_in_flight, 1)
+        self.assertLessEqual(api.connections, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
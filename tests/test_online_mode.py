@@ -0,0 +1,47 @@
+# test_online_mode.py - Whole-document online summarization and redaction, against the mock API
+
+import unittest
+
+from tests.helpers import PERSONAL_DATA, MockAPITestCase, document_pages, marker
+from utils.summarizer import OnlineTransformersSummarizer
+
+
+class OnlineModeTest(MockAPITestCase):
+
+    def summarize(self, redact=True):
+        summarizer = OnlineTransformersSummarizer(redact=redact)
+        pages = document_pages()
+        result = summarizer.summarize_stream(pages, summary_ratio=0.4, source_filename="report.pdf")
+        return pages, result
+
+    def test_sends_the_whole_document(self):
+        pages, result = self.summarize()
+
+        self.assertEqual(result['model_used'], 'online')
+        self.assertGreater(sum(len(page) for page in pages), 1000)
+        sent = " ".join(self.sent_texts())
+        for page in range(4):
+            for number in range(12):
+                self.assertIn(marker(page, number), sent)
+        self.assertGreater(len(self.api.payloads), 1)
+
+    def test_redacts_personal_data_before_sending(self):
+        self.summarize(redact=True)
+
+        sent = " ".join(self.sent_texts())
+        for value in PERSONAL_DATA:
+            self.assertNotIn(value, sent)
+        for placeholder in ("[EMAIL]", "[PHONE]", "[CARD]", "[IP]", "[URL]"):
+            self.assertIn(placeholder, sent)
+
+    def test_sends_text_unchanged_without_redaction(self):
+        self.summarize(redact=False)
+
+        sent = " ".join(self.sent_texts())
+        for value in PERSONAL_DATA:
+            self.assertIn(value, sent)
+        self.assertNotIn("[EMAIL]", sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# test_resources.py - Thread shares of concurrent jobs add up to the budget
+
+import threading
+import time
+import unittest
+
+from utils.resources import ResourceManager
+
+
+def threads_in_use(*plans):
+    return sum(plan.intra_op * plan.parallel_batches for plan in plans)
+
+
+class ResourceManagerTest(unittest.TestCase):
+
+    def test_concurrent_jobs_share_the_budget(self):
+        manager = ResourceManager(total_threads=8)
+        with manager.job() as first:
+            self.assertEqual(first.intra_op, 8)
+            with manager.job() as second:
+                # The first job gives up half its share instead of keeping all 8
+                self.assertEqual((first.intra_op, second.intra_op), (4, 4))
+                with manager.job() as third:
+                    self.assertEqual(threads_in_use(first, second, third), 8)
+            self.assertEqual(first.intra_op, 8)
+
+    def test_uneven_budget_is_fully_used(self):
+        manager = ResourceManager(total_threads=7)
+        with manager.job(2) as first, manager.job(1) as second:
+            self.assertEqual(threads_in_use(first, second), 7)
+
+    def test_parallel_batches_split_the_job_share(self):
+        manager = ResourceManager(total_threads=8)
+        with manager.job(4) as first:
+            self.assertEqual((first.parallel_batches, first.intra_op), (4, 2))
+            with manager.job(4) as second:
+                self.assertEqual((first.parallel_batches, first.intra_op), (4, 1))
+                self.assertLessEqual(threads_in_use(first, second), 8)
+
+    def test_reconfiguring_updates_running_jobs(self):
+        manager = ResourceManager(total_threads=4)
+        with manager.job() as plan:
+            manager.configure(total_threads=2)
+            self.assertEqual(plan.intra_op, 2)
+
+    def test_streams_wait_for_a_shrunken_share(self):
+        manager = ResourceManager(total_threads=2)
+        with manager.job(2) as plan:
+            running, peak = [0], [0]
+            lock = threading.Lock()
+
+            def stream():
+                with plan.stream():
+                    with lock:
+                        running[0] += 1
+                        peak[0] = max(peak[0], running[0])
+                    time.sleep(0.05)
+                    with lock:
+                        running[0] -= 1
+
+            # A second job leaves the first one thread, so only one stream runs at a time
+            with manager.job(1):
+                workers = [threading.Thread(target=stream) for _ in range(3)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+            self.assertEqual(peak[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
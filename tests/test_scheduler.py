@@ -0,0 +1,82 @@
+# test_scheduler.py - Several inference workers share one summarizer and keep file order
+
+import os
+import tempfile
+import threading
+import unittest
+
+from tests.helpers import EchoModelSummarizer, document_pages, marker
+from utils.cancellation import CancelledError
+from utils.scheduler import SummaryScheduler
+from utils.summarizer import TRANSFORMERS_AVAILABLE
+
+
+class TrackingSummarizer(EchoModelSummarizer):
+    """Counts how many files are being summarized at the same moment"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def summarize_stream(self, pages, *args, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            return super().summarize_stream(pages, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@unittest.skipUnless(TRANSFORMERS_AVAILABLE, "the offline summarizer needs transformers")
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.paths = []
+        for number in range(4):
+            path = os.path.join(directory.name, f"file{number}.txt")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(f"{marker(10 + number, 0)} opens this file. " + "\n".join(document_pages(pages=2)))
+            self.paths.append(path)
+        self.summarizer = TrackingSummarizer(use_cache=False)
+
+    def run_scheduler(self, inference_workers, **callbacks):
+        scheduler = SummaryScheduler(0.4, use_cache=False, summarizer=self.summarizer,
+                                     extraction_workers=2, inference_workers=inference_workers)
+        return scheduler.run(self.paths, **callbacks)
+
+    def test_files_share_the_model_concurrently(self):
+        finished = []
+        results = self.run_scheduler(2, on_file_finished=lambda index, result: finished.append(index))
+
+        self.assertEqual(self.summarizer.peak, 2)
+        self.assertEqual(sorted(finished), [0, 1, 2, 3])
+        # Results stay in input order whichever worker produced them
+        for number, result in enumerate(results):
+            self.assertIn(marker(10 + number, 0), " ".join(self.summarizer.summarizer.inputs))
+            self.assertEqual(result['source_file'], f"file{number}.txt")
+
+    def test_single_worker_is_serial(self):
+        self.run_scheduler(1)
+        self.assertEqual(self.summarizer.peak, 1)
+
+    def test_worker_errors_stop_the_run(self):
+        def fail(index, result):
+            raise RuntimeError("callback failed")
+
+        with self.assertRaises(RuntimeError):
+            self.run_scheduler(2, on_file_finished=fail)
+
+    def test_cancel_stops_every_worker(self):
+        scheduler = SummaryScheduler(0.4, use_cache=False, summarizer=self.summarizer, inference_workers=2)
+        with self.assertRaises(CancelledError):
+            scheduler.run(self.paths, on_file_started=lambda index: scheduler.cancel())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 # components.py - Fixed and Integrated Version
 
+import sys
+
 from PyQt5.QtWidgets import (
     QLabel, QPushButton, QVBoxLayout, QHBoxLayout, 
     QFrame, QTextEdit, QComboBox, QCheckBox, QTabWidget, QWidget
@@ -11,6 +13,8 @@ class NoScrollComboBox(QComboBox):
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 
+from utils.resources import cpu_count
+
 from PyQt5.QtWidgets import QApplication
 app = QApplication([])
 app.setStyleSheet("QWidget { margin: 0; padding: 0; }")
@@ -237,6 +241,11 @@ class SettingsComponent:
         # Detail level selection
         detail_selector, detail_display = self._create_detail_selection()
         
+        # CPU thread settings for offline inference
+        thread_selector, batch_selector = self._create_performance_selection()
+        server_checkbox = self._create_server_checkbox()
+        prefilter_checkbox = self._create_prefilter_checkbox()
+        
         # Add all components to layout
         settings_layout.addWidget(settings_label)
         settings_layout.addWidget(self._create_section_label("AI Model Selection:"))
@@ -245,12 +254,18 @@ class SettingsComponent:
         settings_layout.addWidget(self._create_section_label("Summary Detail Level:", margin_top=8))
         settings_layout.addWidget(detail_selector)
         settings_layout.addWidget(detail_display)
+        settings_layout.addWidget(prefilter_checkbox)
+        settings_layout.addWidget(self._create_section_label("Performance (Offline Models):", margin_top=8))
+        settings_layout.addWidget(thread_selector)
+        settings_layout.addWidget(batch_selector)
+        settings_layout.addWidget(server_checkbox)
         settings_layout.setSpacing(2)  # small gap between items
         settings_layout.setContentsMargins(5, 5, 5, 5)  # tiny padding around edges
 
         layout.addWidget(settings_frame)
         
-        return detail_selector, detail_display, model_selector, connection_status
+        return (detail_selector, detail_display, model_selector, connection_status,
+                thread_selector, batch_selector, server_checkbox, prefilter_checkbox)
     
     def _create_section_label(self, text, margin_top=10):
         """Create a section label with consistent styling."""
@@ -265,7 +280,11 @@ class SettingsComponent:
         model_selector = NoScrollComboBox()
         model_selector.addItems([
             "T5-Small (Offline - Fast & Reliable)",
-            "HuggingFace Transformers (Online - Advanced)"
+            "T5-Small Quantized (Offline - Fastest on CPU)",
+            "T5-Small ONNX Runtime (Offline - Low Memory)",
+            "LexRank Extractive (Offline - Instant, No AI Model)",
+            "HuggingFace Transformers (Online - Advanced)",
+            "T5-Small + HuggingFace (Hybrid - Fastest Available)"
         ])
         model_selector.setCurrentIndex(0)
         model_selector.setFont(QFont("Georgia", 10))
@@ -309,6 +328,52 @@ class SettingsComponent:
         """)
         
         return detail_selector, detail_display
+    
+    def _create_performance_selection(self):
+        """Create CPU thread and parallel batch dropdowns; item data holds the numbers."""
+        cores = cpu_count()
+        
+        thread_selector = NoScrollComboBox()
+        thread_selector.addItem(f"CPU Threads: Auto ({cores} {'Core' if cores == 1 else 'Cores'})", 0)
+        counts = sorted({count for count in (1, 2, 4, 8, 16, 32, 64) if count < cores} | {cores})
+        for count in counts:
+            thread_selector.addItem(f"CPU Threads: {count}", count)
+        thread_selector.setCurrentIndex(0)
+        thread_selector.setFont(QFont("Georgia", 10))
+        thread_selector.setStyleSheet(COMBO_STYLE)
+        
+        batch_selector = NoScrollComboBox()
+        for count in (1, 2, 3, 4):
+            batch_selector.addItem(f"Parallel Batches: {count}", count)
+        batch_selector.setCurrentIndex(1)  # Default to 2, as the summarizer does
+        batch_selector.setFont(QFont("Georgia", 10))
+        batch_selector.setStyleSheet(COMBO_STYLE)
+        
+        return thread_selector, batch_selector
+    
+    def _create_prefilter_checkbox(self):
+        """Create the toggle for the extractive pre-filter stage."""
+        prefilter_checkbox = QCheckBox("Summarize key sentences only (faster on long documents)")
+        prefilter_checkbox.setChecked(False)
+        prefilter_checkbox.setFont(QFont("Georgia", 10))
+        prefilter_checkbox.setToolTip("Ranks all sentences first and sends only the most salient share "
+                                      "to the AI model; the share grows with the detail level")
+        prefilter_checkbox.setStyleSheet("color: #333333; margin: 6px 0;")
+        return prefilter_checkbox
+    
+    def _create_server_checkbox(self):
+        """Create the toggle for running models in the shared inference server."""
+        server_checkbox = QCheckBox("Run AI models in a shared background process")
+        server_checkbox.setChecked(False)
+        server_checkbox.setFont(QFont("Georgia", 10))
+        # The server uses its own thread settings, and Stop only abandons its current batch
+        server_checkbox.setToolTip("Lets several windows and command-line runs share one loaded model. "
+                                   "The CPU thread limit does not apply to the shared process.")
+        if getattr(sys, 'frozen', False):
+            # Packaged builds cannot start the server process
+            server_checkbox.setEnabled(False)
+        server_checkbox.setStyleSheet("color: #333333; margin: 6px 0;")
+        return server_checkbox
 
 
 class LimitationsComponent:
@@ -343,6 +408,7 @@ class LimitationsComponent:
             "• Offline T5 model works best with files under 10MB\n"
             "• Processing may be slower for very large documents\n"
             "• Online mode requires internet connection and API key\n"
+            "• Online mode masks emails, phone numbers and account numbers before sending\n"
             "• Supported formats: PDF, TXT, and other text-based files"
         )
         limitations_text.setFont(QFont("Georgia", 10))
@@ -16,7 +16,9 @@ from .components import (
     HeaderComponent, FileSelectionComponent, SettingsComponent,
     LimitationsComponent, SummaryComponent, ExportComponent, UIUtils
 )
-from utils.summarizer import SummaryWorker, export_to_pdf
+from utils.extractive import EXTRACTIVE_MODEL, prefilter_keep_ratio
+from utils.qt_workers import BatchSummaryWorker, ModelWarmupWorker
+from utils.resources import get_resource_manager
 
 
 
@@ -26,6 +28,9 @@ class ModernSummarizerUI(QMainWindow):
         self._init_properties()
         self._init_window()
         self.setup_ui()
+        
+        # Load the offline model once the window is up, so the first summary does not wait for it
+        QTimer.singleShot(0, self._start_model_warmup)
 
     def _init_properties(self):
         """Initialize application properties"""
@@ -34,9 +39,19 @@ class ModernSummarizerUI(QMainWindow):
         self.selected_files = []
         self.current_file_index = 0
         self.all_summaries = []
+        self.file_errors = []
         self.selected_detail_ratio = 0.8
         self.is_online_mode = False
+        self.is_hybrid_mode = False  # Offline model and online API, routed by latency
         self.selected_model = "t5-small"
+        self.selected_dtype = "float32"
+        self.selected_backend = "torch"
+        self.selected_parallel_batches = 2
+        self.use_server = False  # Generate in the shared inference server process
+        self.use_prefilter = False  # Send only the most salient sentences to the model
+        self.warmup_worker = None
+        self.model_state = None  # "loading", "ready" or "failed" for the offline model
+        self.warmed_model = None  # (model, dtype, backend, use_server) of the warmed-up offline model
 
     def _init_window(self):
         """Initialize window properties"""
@@ -117,11 +132,17 @@ class ModernSummarizerUI(QMainWindow):
         # Settings
         settings_component = SettingsComponent(self)
         settings_result = settings_component.create_settings_section(self.content_layout)
-        self.detail_selector, self.detail_display, self.model_selector, self.connection_status = settings_result
+        (self.detail_selector, self.detail_display, self.model_selector, self.connection_status,
+         self.thread_selector, self.batch_selector, self.server_checkbox,
+         self.prefilter_checkbox) = settings_result
         
         # Connect settings signals
         self.model_selector.currentTextChanged.connect(self.on_model_changed)
         self.detail_selector.currentTextChanged.connect(self.on_detail_level_changed)
+        self.thread_selector.currentIndexChanged.connect(self.on_threads_changed)
+        self.batch_selector.currentIndexChanged.connect(self.on_parallel_batches_changed)
+        self.server_checkbox.toggled.connect(self.on_server_toggled)
+        self.prefilter_checkbox.toggled.connect(self.on_prefilter_toggled)
         
         # Limitations/Notes
         LimitationsComponent.create_limitations_section(self.content_layout)
@@ -287,30 +308,104 @@ class ModernSummarizerUI(QMainWindow):
 
     def on_model_changed(self, model_text):
         """Handle model selection change"""
-        if "T5-Small" in model_text:
+        if "Extractive" in model_text:
+            self.is_online_mode = False
+            self.is_hybrid_mode = False
+            self.selected_model = EXTRACTIVE_MODEL
+        elif "T5-Small" in model_text:
             self.is_online_mode = False
+            self.is_hybrid_mode = "Hybrid" in model_text
             self.selected_model = "t5-small"
-            self.connection_status.setText("Status: Offline Mode Active")
-            self.connection_status.setStyleSheet("""
-                color: #27ae60; 
-                font-weight: bold; 
-                margin: 8px 0;
-                padding: 5px;
-                background-color: #d5f4e6;
-                border-radius: 4px;
-            """)
+            self.selected_dtype = "qint8" if "Quantized" in model_text else "float32"
+            self.selected_backend = "onnx" if "ONNX" in model_text else "torch"
+            self._start_model_warmup()
         else:
             self.is_online_mode = True
+            self.is_hybrid_mode = False
             self.selected_model = "online"
-            self.connection_status.setText("Status: Online Mode - Internet Required")
-            self.connection_status.setStyleSheet("""
-                color: #e74c3c; 
-                font-weight: bold; 
-                margin: 8px 0;
-                padding: 5px;
-                background-color: #fdf2e9;
-                border-radius: 4px;
-            """)
+        self._update_connection_status()
+
+    def _start_model_warmup(self):
+        """Preload and warm up the offline model in the background"""
+        if self.is_online_mode or self.selected_model == EXTRACTIVE_MODEL:
+            return
+        if self.warmup_worker and self.warmup_worker.isRunning():
+            return
+        if self.model_state == "ready" and self.warmed_model == self._offline_model_key():
+            return
+        
+        self.model_state = "loading"
+        self.warmup_worker = ModelWarmupWorker(self.selected_model, self.selected_dtype, self.selected_backend,
+                                               use_server=self.use_server)
+        self.warmup_worker.ready.connect(self._on_model_ready)
+        self.warmup_worker.failed.connect(self._on_model_failed)
+        self.warmup_worker.start()
+        self._update_connection_status()
+
+    def _offline_model_key(self):
+        """Identify the selected offline model configuration"""
+        return (self.selected_model, self.selected_dtype, self.selected_backend, self.use_server)
+
+    def on_server_toggled(self, checked):
+        """Switch between the shared inference server and an in-process model"""
+        self.use_server = checked
+        self._start_model_warmup()
+
+    def _on_model_ready(self, model_type, dtype, backend, use_server):
+        """Handle a finished model warm-up"""
+        self.model_state = "ready"
+        self.warmed_model = (model_type, dtype, backend, use_server)
+        self._update_connection_status()
+        # A different model may have been selected while this one was loading
+        if self.warmed_model != self._offline_model_key():
+            self._start_model_warmup()
+
+    def _on_model_failed(self, message):
+        """Handle a model that could not be loaded"""
+        print(f"⚠️ {message}")
+        self.model_state = "failed"
+        self.warmed_model = None
+        self._update_connection_status()
+
+    def _update_connection_status(self):
+        """Show the selected mode and the offline model's readiness"""
+        if self.is_online_mode:
+            text = "Status: Online Mode - Internet Required"
+            color, background = "#e74c3c", "#fdf2e9"
+        elif self.selected_model == EXTRACTIVE_MODEL:
+            text = "Status: Extractive Mode - No AI Model Needed"
+            color, background = "#27ae60", "#d5f4e6"
+        elif self.is_hybrid_mode and self.model_state == "failed":
+            text = "Status: Hybrid Mode - Online Only"
+            color, background = "#e74c3c", "#fdf2e9"
+        elif self.is_hybrid_mode and self.model_state != "loading":
+            text = "Status: Hybrid Mode - Offline + Online"
+            color, background = "#d68910", "#fef5e7"
+        elif self.model_state == "loading":
+            text = "Status: Offline Mode - Loading AI Model..."
+            color, background = "#d68910", "#fef5e7"
+        elif self.model_state == "failed":
+            text = "Status: Offline Mode - Extractive Fallback"
+            color, background = "#e74c3c", "#fdf2e9"
+        elif self.selected_dtype == "qint8":
+            text = "Status: Offline Mode Active (int8)"
+            color, background = "#27ae60", "#d5f4e6"
+        elif self.selected_backend == "onnx":
+            text = "Status: Offline Mode Active (ONNX Runtime)"
+            color, background = "#27ae60", "#d5f4e6"
+        else:
+            text = "Status: Offline Mode Active"
+            color, background = "#27ae60", "#d5f4e6"
+        
+        self.connection_status.setText(text)
+        self.connection_status.setStyleSheet(f"""
+            color: {color}; 
+            font-weight: bold; 
+            margin: 8px 0;
+            padding: 5px;
+            background-color: {background};
+            border-radius: 4px;
+        """)
 
     def on_detail_level_changed(self, level_text):
         """Handle detail level change"""
@@ -321,6 +416,28 @@ class ModernSummarizerUI(QMainWindow):
         }
         self.selected_detail_ratio = level_mapping.get(level_text, 0.4)
         self.detail_display.setText(level_text)
+        self._update_prefilter_hint()
+
+    def on_prefilter_toggled(self, checked):
+        """Handle the extractive pre-filter toggle"""
+        self.use_prefilter = checked
+        self._update_prefilter_hint()
+
+    def _update_prefilter_hint(self):
+        """Show how much of the document the pre-filter keeps at the current detail level"""
+        keep = int(prefilter_keep_ratio(self.selected_detail_ratio) * 100)
+        self.prefilter_checkbox.setToolTip(
+            f"Ranks all sentences first and sends only the top {keep}% to the AI model "
+            "(the share follows the detail level)"
+        )
+
+    def on_threads_changed(self, index):
+        """Handle CPU thread budget change (0 uses every core)"""
+        get_resource_manager().configure(total_threads=self.thread_selector.itemData(index))
+
+    def on_parallel_batches_changed(self, index):
+        """Handle parallel batch count change"""
+        self.selected_parallel_batches = self.batch_selector.itemData(index)
 
     def generate_summary(self):
         """Start the summary generation process"""
@@ -329,54 +446,76 @@ class ModernSummarizerUI(QMainWindow):
                 QMessageBox.warning(self, "No Files", "Please select files to summarize first.")
             return
         
-        self.all_summaries = []
+        # One slot per file keeps results in selection order
+        self.all_summaries = [None] * len(self.selected_files)
+        self.file_errors = []
         self.current_file_index = 0
         self._set_processing_state(True)
-        self._process_current_file()
+        self._start_batch_worker()
 
-    def _process_current_file(self):
-        """Process the current file in the queue"""
-        if self.current_file_index >= len(self.selected_files):
-            self._on_all_files_completed()
-            return
-        
-        current_file = self.selected_files[self.current_file_index]
-        self.processing_label.setText(f"Processing: {current_file['filename']}")
-        
-        # Show current file being processed
-        self.current_file_label.setVisible(True)
-        self.current_file_display.setVisible(True)
-        self.current_file_display.setText(current_file['filename'])
+    def _start_batch_worker(self):
+        """Summarize all selected files through the pipelined scheduler"""
+        if len(self.selected_files) > 1:
+            self.progress_bar.setRange(0, len(self.selected_files))
+            self.progress_bar.setValue(0)
+        else:
+            self.progress_bar.setRange(0, 0)
         
-        # Create and start worker
-        self.worker = SummaryWorker(
-            current_file['path'], 
+        self.worker = BatchSummaryWorker(
+            [file_info['path'] for file_info in self.selected_files],
             self.selected_detail_ratio,
             self.selected_model,
-            self.is_online_mode
+            self.is_online_mode,
+            dtype=self.selected_dtype,
+            backend=self.selected_backend,
+            parallel_batches=self.selected_parallel_batches,
+            use_server=self.use_server,
+            hybrid=self.is_hybrid_mode,
+            prefilter=self.use_prefilter
         )
         
-        self.worker.finished.connect(self._on_file_finished)
+        self.worker.file_started.connect(self._on_file_started)
+        self.worker.file_finished.connect(self._on_file_finished)
+        self.worker.file_error.connect(self._on_file_error)
+        self.worker.all_finished.connect(self._on_all_files_completed)
         self.worker.error.connect(self._on_error)
         self.worker.progress.connect(self._on_progress_update)
         self.worker.start()
+        
+        # Queued files wait for the preloaded model instead of loading their own copy
+        if not self.is_online_mode and self.model_state == "loading":
+            self._on_progress_update("⏳ Waiting for the AI model to finish loading...")
+
+    def _on_file_started(self, index):
+        """Show the file the inference stage is working on"""
+        self.current_file_index = index
+        current_file = self.selected_files[index]
+        self.processing_label.setText(f"Processing: {current_file['filename']}")
+        
+        # Show current file being processed
+        self.current_file_label.setVisible(True)
+        self.current_file_display.setVisible(True)
+        self.current_file_display.setText(current_file['filename'])
 
     def _on_progress_update(self, message):
         """Handle progress updates from worker"""
         self.processing_label.setText(message)
 
-    def _on_file_finished(self, summary_data):
+    def _on_file_finished(self, index, summary_data):
         """Handle completion of a single file"""
-        current_file = self.selected_files[self.current_file_index]
-        summary_data['source_file'] = current_file
-        self.all_summaries.append(summary_data)
-        
-        self.current_file_index += 1
-        
-        if self.current_file_index < len(self.selected_files):
-            self._process_current_file()
-        else:
-            self._on_all_files_completed()
+        summary_data['source_file'] = self.selected_files[index]
+        self.all_summaries[index] = summary_data
+        self._advance_progress()
+
+    def _on_file_error(self, index, error_message):
+        """Record a failed file; the remaining files keep processing"""
+        self.file_errors.append(error_message)
+        self._advance_progress()
+
+    def _advance_progress(self):
+        """Move the aggregate progress bar on by one file"""
+        if self.progress_bar.maximum() > 0:
+            self.progress_bar.setValue(self.progress_bar.value() + 1)
 
     def _on_all_files_completed(self):
         """Handle completion of all files"""
@@ -386,12 +525,17 @@ class ModernSummarizerUI(QMainWindow):
         self.current_file_label.setVisible(False)
         self.current_file_display.setVisible(False)
         
+        self.all_summaries = [summary for summary in self.all_summaries if summary]
+        
+        if self.file_errors:
+            QMessageBox.warning(self, "Some Files Failed", "\n".join(self.file_errors))
+        
         if self.all_summaries:
             self.summary_widget.setVisible(True)
             self.export_btn.setVisible(True)
             self._display_summary(self.all_summaries[0])
             QTimer.singleShot(300, self._scroll_to_summary)
-        else:
+        elif not self.file_errors:
             QMessageBox.warning(self, "No Summaries", "No summaries were generated.")
 
     def _on_error(self, error_message):
@@ -427,8 +571,11 @@ class ModernSummarizerUI(QMainWindow):
 
     def cancel_processing(self):
         """Cancel the current processing"""
-        if self.worker:
-            self.worker.terminate()
+        if self.worker and self.worker.isRunning():
+            # Signals already queued by the worker would report a run the user abandoned
+            self.worker.blockSignals(True)
+            # The worker stops at its next page, batch or decode step, so the model stays usable
+            self.worker.cancel()
             self.worker.wait()
         self._set_processing_state(False)
         
@@ -546,7 +693,12 @@ class ModernSummarizerUI(QMainWindow):
         self.is_processing = processing
         
         # Disable/enable controls
-        controls = [self.browse_btn, self.model_selector, self.detail_selector, self.generate_btn]
+        controls = [self.browse_btn, self.model_selector, self.detail_selector,
+                    self.thread_selector, self.batch_selector, self.prefilter_checkbox,
+                    self.generate_btn]
+        if not getattr(sys, 'frozen', False):
+            # Packaged builds cannot start the server, so its toggle stays disabled
+            controls.append(self.server_checkbox)
         for control in controls:
             control.setEnabled(not processing)
         
@@ -558,6 +710,16 @@ class ModernSummarizerUI(QMainWindow):
             self.processing_overlay.setVisible(False)
             self.generate_btn.setText("Generate Smart Summary")
 
+    def closeEvent(self, event):
+        """Stop running work and let a model warm-up finish before the window goes away"""
+        if self.worker and self.worker.isRunning():
+            self.worker.blockSignals(True)
+            self.worker.cancel()
+            self.worker.wait()
+        if self.warmup_worker and self.warmup_worker.isRunning():
+            self.warmup_worker.wait()
+        super().closeEvent(event)
+
     def resizeEvent(self, event):
         """Handle window resize events"""
         super().resizeEvent(event)
@@ -1,10 +1,24 @@
 # Utils Package Initializer
-from .summarizer import LexRankSummarizer, extract_text_from_file
-from .pdf_generator import save_summary_as_pdf, SummaryPDFGenerator
+#
+# Exports are resolved on first access, so importing a light submodule such as
+# utils.summary_cache does not pull in the ML or PDF libraries.
+import importlib
 
-__all__ = [
-    'LexRankSummarizer',
-    'extract_text_from_file', 
-    'save_summary_as_pdf',
-    'SummaryPDFGenerator'
-]
+_EXPORTS = {
+    'LexRankSummarizer': '.summarizer',
+    'Document': '.document',
+    'extract_text_from_file': '.extraction',
+    'save_summary_as_pdf': '.pdf_generator',
+    'SummaryPDFGenerator': '.pdf_generator',
+    'ModelRegistry': '.model_registry',
+    'get_model_registry': '.model_registry',
+    'ResourceManager': '.resources',
+    'get_resource_manager': '.resources'
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
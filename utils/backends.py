@@ -0,0 +1,162 @@
+# backends.py - Pluggable inference backends for the offline summarizer
+#
+# AIDocumentSummarizer only needs a tokenizer and a way to turn batches of
+# pre-tokenized chunks into summaries. Backends provide exactly that, so the
+# inference engine can be swapped without touching chunking or reduction.
+
+from abc import ABC, abstractmethod
+
+from .cancellation import raise_if_cancelled
+
+BACKEND_NAMES = ("torch", "onnx")
+
+# Set by the CLI's --quiet; backends apply it where they import the Hugging Face libraries
+_quiet = False
+
+
+def set_quiet(quiet=True):
+    """Silence Hugging Face logging and progress bars in models loaded from now on"""
+    global _quiet
+    _quiet = quiet
+
+
+def apply_quiet():
+    """Lower Hugging Face logging to errors and hide its progress bars, if set_quiet() asked for it"""
+    if not _quiet:
+        return
+    try:
+        from huggingface_hub.utils import disable_progress_bars
+        disable_progress_bars()
+    except ImportError:
+        pass
+    try:
+        from transformers.utils import logging
+        logging.set_verbosity_error()
+        logging.disable_progress_bar()
+    except ImportError:
+        pass
+
+
+class InferenceBackend(ABC):
+    """Interface between AIDocumentSummarizer and an inference engine.
+
+    Subclasses set ``tokenizer`` and implement ``generate``.
+    """
+    name = None
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+
+    @abstractmethod
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        """Summarize a batch of token ID lists, returning one decoded string per item.
+
+        A cancelled cancel_token stops generation after the current decode
+        step and raises CancelledError.
+        """
+
+    def apply_threads(self, intra_op):
+        """Limit the calling thread's generation to intra_op threads, where the engine allows it"""
+
+
+class TorchBackend(InferenceBackend):
+    """PyTorch generation through a transformers summarization pipeline"""
+    name = "torch"
+
+    def __init__(self, pipeline):
+        super().__init__(pipeline.tokenizer)
+        self.pipeline = pipeline
+        self.model = pipeline.model
+        # The pipeline's generation config carries the task defaults (beams, etc.)
+        self.generation_config = getattr(pipeline, 'generation_config', None)
+
+    @classmethod
+    def load(cls, model_name, device=-1, dtype="float32"):
+        """Build the summarization pipeline for a model"""
+        import torch
+        from transformers import pipeline
+
+        from .quantization import QUANTIZED_DTYPE, load_quantized_model
+        from .resources import get_resource_manager
+
+        apply_quiet()
+        get_resource_manager().configure_torch()
+
+        if dtype == QUANTIZED_DTYPE:
+            # Dynamically quantized kernels only exist for the CPU
+            return cls(pipeline(
+                "summarization",
+                model=load_quantized_model(model_name),
+                tokenizer=model_name,
+                framework="pt",
+                device=-1,
+                clean_up_tokenization_spaces=True
+            ))
+
+        return cls(pipeline(
+            "summarization",
+            model=model_name,
+            tokenizer=model_name,
+            framework="pt",
+            device=device,
+            torch_dtype=getattr(torch, dtype),
+            clean_up_tokenization_spaces=True
+        ))
+
+    def apply_threads(self, intra_op):
+        import torch
+
+        # The OpenMP thread count is per calling thread, so each stream sets its own
+        if torch.get_num_threads() != intra_op:
+            torch.set_num_threads(intra_op)
+
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        import torch
+
+        # Right-pad the batch to its longest member
+        longest = max(len(ids) for ids in batch_ids)
+        pad_id = self.tokenizer.pad_token_id
+        input_ids = torch.full((len(batch_ids), longest), pad_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(batch_ids), longest), dtype=torch.long)
+        for row, ids in enumerate(batch_ids):
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+
+        with torch.inference_mode():
+            output_ids = self.model.generate(
+                input_ids=input_ids.to(self.model.device),
+                attention_mask=attention_mask.to(self.model.device),
+                generation_config=self.generation_config,
+                max_length=max_length,
+                max_new_tokens=None,
+                min_length=min_length,
+                do_sample=False,
+                stopping_criteria=_cancel_criteria(cancel_token) if cancel_token is not None else None
+            )
+
+        # Output cut short by a cancel must never reach the caller or the caches
+        raise_if_cancelled(cancel_token)
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
+
+
+def _cancel_criteria(cancel_token):
+    """Stopping criteria that end generation after the current decode step once cancelled"""
+    import torch
+    from transformers import StoppingCriteria, StoppingCriteriaList
+
+    class CancelCriteria(StoppingCriteria):
+        def __call__(self, input_ids, scores, **kwargs):
+            return torch.full((input_ids.shape[0],), cancel_token.cancelled, dtype=torch.bool,
+                              device=input_ids.device)
+
+    return StoppingCriteriaList([CancelCriteria()])
+
+
+def load_backend(model_name, device=-1, dtype="float32", backend="torch"):
+    """Load a model with the named inference backend"""
+    if backend == "torch":
+        return TorchBackend.load(model_name, device, dtype)
+    if backend == "onnx":
+        from .onnx_backend import OnnxBackend
+        return OnnxBackend.load(model_name, dtype)
+    raise ValueError(f"Unknown inference backend '{backend}', expected one of {', '.join(BACKEND_NAMES)}")
@@ -0,0 +1,44 @@
+# cancellation.py - Cooperative cancellation of summarization jobs
+#
+# Threads are never killed from outside. Instead, a job carries a token that
+# extraction checks between pages, the summarizer between batches and the
+# inference backends between decode steps, so a cancelled job unwinds at the
+# next safe point and leaves the shared model usable.
+
+import threading
+
+
+class CancelledError(Exception):
+    """Raised inside a job once its CancellationToken has been cancelled"""
+
+    def __init__(self, message="Processing was cancelled"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """Thread-safe flag shared by everything working on one job"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """Check point: raise CancelledError if the job was cancelled"""
+        if self._event.is_set():
+            raise CancelledError()
+
+    def wait(self, timeout=None):
+        """Sleep up to timeout seconds, waking early on cancel; returns True if cancelled"""
+        return self._event.wait(timeout)
+
+
+def raise_if_cancelled(cancel_token):
+    """Check point for code where the token is optional"""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
@@ -0,0 +1,251 @@
+# chunker.py - Sentence packing into model-sized chunks
+#
+# TokenChunker packs by the offline model's own tokenizer and yields chunks
+# with ready-to-generate token IDs; TextChunker packs by estimated tokens
+# for the online API. Both share the Chunker interface, and the summarizer
+# handles their chunks through the common Chunk base.
+
+from abc import ABC, abstractmethod
+
+from .document import Document
+
+# Bump whenever chunk boundaries or contents change, so cached results keyed
+# on chunker output are invalidated
+CHUNKER_VERSION = 4
+
+
+class Chunk(ABC):
+    """A piece of text sized for one model call; len() is its token count"""
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+    @abstractmethod
+    def __len__(self):
+        """Token count of the chunk"""
+
+
+class TokenChunk(Chunk):
+    """A chunk of text together with its ready-to-generate token IDs"""
+    __slots__ = ('input_ids',)
+
+    def __init__(self, text, input_ids):
+        super().__init__(text)
+        self.input_ids = input_ids
+
+    def __len__(self):
+        return len(self.input_ids)
+
+    def __repr__(self):
+        return f"TokenChunk({len(self.input_ids)} tokens, {len(self.text)} chars)"
+
+
+class Chunker(ABC):
+    """Pack whole sentences into chunks of at most ``window`` content tokens.
+
+    ``overlap_tokens`` of trailing sentences are repeated at the start of
+    the next chunk, capped at half the window.
+    """
+
+    def __init__(self, max_tokens, window, overlap_tokens=0, min_sentence_length=10):
+        self.max_tokens = max_tokens
+        self.window = window
+        self.overlap_tokens = min(overlap_tokens, window // 2)
+        self.min_sentence_length = min_sentence_length
+
+    def chunk(self, text):
+        """Chunk a whole text into a list of chunks, dropping sentences too short to matter"""
+        return list(self.iter_chunks(Document(text).sentences(self.min_sentence_length)))
+
+    @abstractmethod
+    def chunk_from_text(self, text):
+        """Build a single chunk from text, trimmed to the window"""
+
+    @abstractmethod
+    def count_tokens(self, text):
+        """Number of content tokens in text"""
+
+    @abstractmethod
+    def iter_chunks(self, sentences):
+        """Pack an iterable of sentences into chunks as they arrive"""
+
+    def _overlap(self, texts, items, incoming, size=len):
+        """Carry trailing sentences of the previous chunk into the next one.
+
+        ``items`` holds what the chunker keeps per sentence, and ``size``
+        gives its token count. Returns the kept texts, items and tokens.
+        """
+        budget = min(self.overlap_tokens, self.window - incoming)
+        kept_texts, kept_items, used = [], [], 0
+        for text, item in zip(reversed(texts), reversed(items)):
+            tokens = size(item)
+            if used + tokens > budget:
+                break
+            kept_texts.insert(0, text)
+            kept_items.insert(0, item)
+            used += tokens
+        return kept_texts, kept_items, used
+
+
+class TokenChunker(Chunker):
+    """Pack whole sentences into chunks that fill the model's token window.
+
+    Every sentence is tokenized exactly once. Chunk token IDs already include
+    the task prefix and end-of-sequence token, so they can be passed to
+    generation directly without re-tokenizing the text.
+    """
+
+    def __init__(self, tokenizer, max_tokens=None, overlap_tokens=0, prefix="summarize: ",
+                 min_sentence_length=10, tokenize_batch=64):
+        self.tokenizer = tokenizer
+        self.tokenize_batch = tokenize_batch
+        max_tokens = max_tokens or tokenizer.model_max_length
+
+        self.prefix_ids = tokenizer(prefix, add_special_tokens=False, verbose=False)['input_ids'] if prefix else []
+        self.suffix_ids = [tokenizer.eos_token_id] if tokenizer.eos_token_id is not None else []
+
+        # Tokens left for sentence content once prefix and EOS are in place
+        window = max_tokens - len(self.prefix_ids) - len(self.suffix_ids)
+        if window <= 0:
+            raise ValueError(f"Token window of {max_tokens} is too small for the prompt prefix")
+        super().__init__(max_tokens, window, overlap_tokens, min_sentence_length)
+
+    def chunk_from_text(self, text):
+        """Build a single chunk from text, trimming it to the token window"""
+        ids = self.tokenizer(text, add_special_tokens=False, verbose=False)['input_ids']
+        if len(ids) > self.window:
+            ids = ids[:self.window]
+            text = self.tokenizer.decode(ids, skip_special_tokens=True)
+        return self._build_chunk([text], [ids])
+
+    def count_tokens(self, text):
+        """Number of content tokens in text, excluding prefix and EOS"""
+        return len(self.tokenizer(text, add_special_tokens=False, verbose=False)['input_ids'])
+
+    def iter_chunks(self, sentences):
+        """Pack an iterable of sentences into TokenChunks as they arrive"""
+        texts = []
+        ids = []
+        used = 0
+
+        for sentence, sentence_ids in self._tokenize(sentences):
+            # A sentence longer than the window is split on token boundaries
+            if len(sentence_ids) > self.window:
+                if texts:
+                    yield self._build_chunk(texts, ids)
+                    texts, ids, used = [], [], 0
+                for start in range(0, len(sentence_ids), self.window):
+                    piece = sentence_ids[start:start + self.window]
+                    piece_text = self.tokenizer.decode(piece, skip_special_tokens=True)
+                    yield self._build_chunk([piece_text], [piece])
+                continue
+
+            if texts and used + len(sentence_ids) > self.window:
+                yield self._build_chunk(texts, ids)
+                texts, ids, used = self._overlap(texts, ids, len(sentence_ids))
+
+            texts.append(sentence)
+            ids.append(sentence_ids)
+            used += len(sentence_ids)
+
+        if texts:
+            yield self._build_chunk(texts, ids)
+
+    def _tokenize(self, sentences):
+        """Tokenize sentences in small batches, yielding (sentence, ids) pairs"""
+        pending = []
+        for sentence in sentences:
+            pending.append(sentence)
+            if len(pending) >= self.tokenize_batch:
+                yield from self._tokenize_batch(pending)
+                pending = []
+        if pending:
+            yield from self._tokenize_batch(pending)
+
+    def _tokenize_batch(self, sentences):
+        encoded = self.tokenizer(sentences, add_special_tokens=False, verbose=False)['input_ids']
+        return zip(sentences, encoded)
+
+    def _build_chunk(self, texts, ids):
+        input_ids = list(self.prefix_ids)
+        for sentence_ids in ids:
+            input_ids.extend(sentence_ids)
+        input_ids.extend(self.suffix_ids)
+        return TokenChunk(' '.join(texts), input_ids)
+
+
+# Subword tokens per whitespace-separated word for BPE models such as BART,
+# on the high side so estimated chunks stay inside the real token limit
+TOKENS_PER_WORD = 1.4
+
+
+def estimate_tokens(text):
+    """Approximate subword token count of text, for models without a local tokenizer"""
+    return int(len(text.split()) * TOKENS_PER_WORD + 0.999)
+
+
+class TextChunk(Chunk):
+    """A chunk for a remote model: text with an estimated token count instead of token IDs"""
+    __slots__ = ('tokens',)
+
+    def __init__(self, text, tokens):
+        super().__init__(text)
+        self.tokens = tokens
+
+    def __len__(self):
+        return self.tokens
+
+    def __repr__(self):
+        return f"TextChunk(~{self.tokens} tokens, {len(self.text)} chars)"
+
+
+class TextChunker(Chunker):
+    """Pack whole sentences into chunks within an estimated token budget.
+
+    Used for the online API, whose tokenizer is not available locally.
+    Chunks carry text only; the budget is sized with estimate_tokens.
+    """
+
+    def __init__(self, max_tokens, overlap_tokens=0, min_sentence_length=10):
+        super().__init__(max_tokens, max_tokens, overlap_tokens, min_sentence_length)
+
+    def chunk_from_text(self, text):
+        words = text.split()
+        limit = int(self.window / TOKENS_PER_WORD)
+        if len(words) > limit:
+            text = ' '.join(words[:limit])
+        return TextChunk(text, estimate_tokens(text))
+
+    def count_tokens(self, text):
+        return estimate_tokens(text)
+
+    def iter_chunks(self, sentences):
+        texts = []
+        counts = []
+        used = 0
+
+        for sentence in sentences:
+            tokens = estimate_tokens(sentence)
+            # A sentence longer than the window is split on word boundaries
+            if tokens > self.window:
+                if texts:
+                    yield TextChunk(' '.join(texts), used)
+                    texts, counts, used = [], [], 0
+                words = sentence.split()
+                step = max(1, int(self.window / TOKENS_PER_WORD))
+                for start in range(0, len(words), step):
+                    yield self.chunk_from_text(' '.join(words[start:start + step]))
+                continue
+
+            if texts and used + tokens > self.window:
+                yield TextChunk(' '.join(texts), used)
+                # counts already hold token counts, so each one is its own size
+                texts, counts, used = self._overlap(texts, counts, tokens, size=int)
+
+            texts.append(sentence)
+            counts.append(tokens)
+            used += tokens
+
+        if texts:
+            yield TextChunk(' '.join(texts), used)
@@ -0,0 +1,172 @@
+# document.py - A document segmented into sentences once, shared by every stage
+#
+# Chunking, extraction, section building and the statistics used to split
+# the same text with their own re.split and str.split calls. A Document
+# segments cleaned text once as pages arrive, and the other stages read
+# its sentences from there.
+#
+# The text is kept in one contiguous UTF-8 buffer, with sentence offsets
+# in two array('q') columns. Sentences are decoded from memoryview slices
+# only when a stage asks for them, so a document costs about its UTF-8 size
+# plus 16 bytes per sentence, instead of a Python string per sentence.
+#
+# The pre-filter and extractive modes rank the whole document before they
+# pick sentences, so they keep it in this store and rank a SentenceView,
+# which decodes a sentence only when it is read. Plain map-reduce streaming
+# only needs the sentence and word counts, so it builds a Document with
+# keep_text=False: pages are segmented and counted but not stored.
+
+import re
+from array import array
+
+# A sentence is a run of text up to and including its terminal punctuation
+# and any closing quotes or brackets after it. Punctuation followed directly
+# by more text ("3.5", "jane.doe@example.com", "www.example.org") does not
+# end it.
+CLOSERS = '"\'”’)]'
+SENTENCE_PATTERN = re.compile(r'[^.!?]+(?:[.!?]+(?=[^\s.!?"\'”’)\]])[^.!?]*)*[.!?]*["\'”’)\]]*')
+
+TERMINATORS = '.!?'
+
+
+class Document:
+    """Cleaned text and its sentences, segmented once.
+
+    Pages are joined with single spaces. A sentence cut by a page break stays
+    pending until the next page finishes it, or until finish() is called.
+    Offsets are byte offsets into ``buffer``. With ``keep_text=False`` only
+    the counts are kept and the sentences are just returned by append().
+    """
+
+    def __init__(self, text=None, keep_text=True):
+        self.keep_text = keep_text
+        self.buffer = bytearray()
+        self.length = 0  # Characters of the joined text
+        self.starts = array('q')
+        self.ends = array('q')
+        self.sentence_count = 0
+        self.word_count = 0
+        self._pending = None  # (byte offset, text) of an unfinished sentence
+        if text is not None:
+            self.append(text)
+            self.finish()
+
+    def __len__(self):
+        return self.sentence_count
+
+    def __iter__(self):
+        for index in range(len(self.starts)):
+            yield self.sentence(index)
+
+    def append(self, page):
+        """Add a cleaned page and return the sentences it completed"""
+        page = page.strip()
+        if not page:
+            return []
+        if self.length:
+            self.length += 1
+        self.length += len(page)
+        offset = 0
+        if self.keep_text:
+            if self.buffer:
+                self.buffer += b' '
+            offset = len(self.buffer)
+            self.buffer += page.encode('utf-8')
+
+        if self._pending:
+            offset, carry = self._pending
+            page = f"{carry} {page}"
+        self._pending = None
+
+        # Character positions equal byte positions for ASCII text; otherwise
+        # the UTF-8 length of the text between sentences is added up as we go
+        ascii_only = page.isascii() or not self.keep_text
+        position, byte_position = 0, offset
+        sentences = []
+        for match in SENTENCE_PATTERN.finditer(page):
+            sentence = match.group()
+            stripped = sentence.strip()
+            start = match.start() + len(sentence) - len(sentence.lstrip())
+            if ascii_only:
+                byte_start = offset + start
+            else:
+                byte_position += len(page[position:start].encode('utf-8'))
+                position, byte_start = start, byte_position
+            if stripped.rstrip(CLOSERS)[-1:] in TERMINATORS and stripped:
+                self._add(byte_start, stripped)
+                sentences.append(stripped)
+            else:
+                self._pending = (byte_start, stripped) if stripped else None
+        return sentences
+
+    def finish(self):
+        """Close the document; returns the trailing unterminated sentence, if any"""
+        if not self._pending:
+            return []
+        start, sentence = self._pending
+        self._pending = None
+        self._add(start, sentence)
+        return [sentence]
+
+    def _add(self, start, sentence):
+        self.sentence_count += 1
+        self.word_count += len(sentence.split())
+        if self.keep_text:
+            self.starts.append(start)
+            self.ends.append(start + (len(sentence) if sentence.isascii() else len(sentence.encode('utf-8'))))
+
+    def sentence(self, index):
+        with memoryview(self.buffer) as view:
+            return str(view[self.starts[index]:self.ends[index]], 'utf-8')
+
+    def select(self, min_length=0):
+        """Lazy view of the sentences at least min_length characters long"""
+        self._check_text()
+        indices = array('q')
+        with memoryview(self.buffer) as view:
+            for index, (start, end) in enumerate(zip(self.starts, self.ends)):
+                # A sentence has at least as many bytes as characters, and at most four times as many
+                size = end - start
+                if size >= min_length and (size >= 4 * min_length or len(str(view[start:end], 'utf-8')) >= min_length):
+                    indices.append(index)
+        return SentenceView(self, indices)
+
+    def sentences(self, min_length=0):
+        """Sentences in order, skipping ones shorter than min_length characters"""
+        self._check_text()
+        sentences = []
+        with memoryview(self.buffer) as view:
+            for start, end in zip(self.starts, self.ends):
+                # A sentence has at least as many bytes as characters
+                if end - start >= min_length:
+                    sentence = str(view[start:end], 'utf-8')
+                    if len(sentence) >= min_length:
+                        sentences.append(sentence)
+        return sentences
+
+    def _check_text(self):
+        if not self.keep_text:
+            raise ValueError("Document was built with keep_text=False and holds no sentences")
+
+    def clauses(self, min_length=0):
+        """Sentences without their terminal punctuation"""
+        clauses = (sentence.rstrip(CLOSERS).rstrip(TERMINATORS).strip() for sentence in self.sentences())
+        return [clause for clause in clauses if len(clause) >= min_length]
+
+
+class SentenceView:
+    """Read-only sequence of some of a document's sentences, decoded on access"""
+
+    def __init__(self, document, indices):
+        self.document = document
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        return self.document.sentence(self.indices[position])
+
+    def __iter__(self):
+        for index in self.indices:
+            yield self.document.sentence(index)
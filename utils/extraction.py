@@ -0,0 +1,140 @@
+# extraction.py - Text extraction from PDF and text files
+#
+# Kept free of Qt and ML imports so extraction worker processes start quickly.
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from .cancellation import CancelledError, raise_if_cancelled
+
+
+def extract_text_from_file(file_path, workers=1, pages_per_task=16):
+    """Extract text from different file formats"""
+    file_extension = os.path.splitext(file_path)[1].lower()
+
+    try:
+        if file_extension == '.pdf':
+            return extract_text_from_pdf(file_path, workers, pages_per_task)
+        elif file_extension == '.txt':
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        else:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+    except Exception as e:
+        raise Exception(f"Error reading file: {str(e)}")
+
+def iter_file_pages(file_path, workers=1, pages_per_task=16, block_size=64 * 1024, cancel_token=None):
+    """Yield a document's text incrementally: PDF pages or text file blocks"""
+    file_extension = os.path.splitext(file_path)[1].lower()
+
+    try:
+        if file_extension == '.pdf':
+            yield from iter_pdf_pages(file_path, workers, pages_per_task, cancel_token)
+        else:
+            # Blocks end on a line break so words are never split between them
+            with open(file_path, 'r', encoding='utf-8') as file:
+                remainder = ""
+                while True:
+                    raise_if_cancelled(cancel_token)
+                    block = file.read(block_size)
+                    if not block:
+                        break
+                    block = remainder + block
+                    cut = block.rfind('\n') + 1
+                    if cut:
+                        remainder = block[cut:]
+                        yield block[:cut]
+                    else:
+                        remainder = block
+                if remainder:
+                    yield remainder
+    except CancelledError:
+        raise
+    except Exception as e:
+        raise Exception(f"Error reading file: {str(e)}")
+
+def extract_text_from_pdf(file_path, workers=1, pages_per_task=16):
+    """Enhanced PDF text extraction"""
+    return "".join(page + "\n" for page in iter_pdf_pages(file_path, workers, pages_per_task))
+
+def iter_pdf_pages(file_path, workers=1, pages_per_task=16, cancel_token=None):
+    """Yield the text of each PDF page, in order, as it is parsed.
+
+    With more than one worker, page ranges of ``pages_per_task`` pages are
+    extracted in separate processes. Small documents are always read serially.
+    A cancelled cancel_token raises CancelledError before the next page.
+    """
+    try:
+        import PyPDF2
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            page_count = len(pdf_reader.pages)
+
+            if workers == 1 or page_count <= pages_per_task:
+                for page in pdf_reader.pages:
+                    raise_if_cancelled(cancel_token)
+                    page_text = page.extract_text()
+                    if page_text:
+                        yield page_text
+                return
+
+        for page_text in _iter_pdf_pages_parallel(file_path, page_count, workers, pages_per_task, cancel_token):
+            if page_text:
+                yield page_text
+    except CancelledError:
+        raise
+    except ImportError:
+        raise Exception("PyPDF2 is required for PDF processing.")
+    except Exception as e:
+        raise Exception(f"Error processing PDF: {str(e)}")
+
+def _iter_pdf_pages_parallel(file_path, page_count, workers, pages_per_task, cancel_token=None):
+    """Extract page ranges in a process pool, yielding pages in document order"""
+    workers = workers or os.cpu_count() or 1
+    ranges = [(start, min(start + pages_per_task, page_count))
+              for start in range(0, page_count, pages_per_task)]
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    try:
+        # Keep a bounded number of ranges in flight so memory stays flat
+        pending = deque()
+        ranges = iter(ranges)
+        for start, stop in ranges:
+            pending.append(executor.submit(_extract_page_range, file_path, start, stop))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            # Poll, so a cancel does not wait for a whole page range to be parsed
+            while not wait([pending[0]], timeout=0.05).done:
+                raise_if_cancelled(cancel_token)
+            page_texts = pending.popleft().result()
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append(executor.submit(_extract_page_range, file_path, *next_range))
+            for page_text in page_texts:
+                raise_if_cancelled(cancel_token)
+                yield page_text
+    finally:
+        # Queued ranges are dropped; a cancelled or abandoned read does not wait for running ones
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+def _extract_page_range(file_path, start, stop):
+    """Worker: open the PDF independently and extract pages [start, stop)"""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        try:
+            # Memory-map the file so workers share the OS page cache
+            stream = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            stream = file
+
+        try:
+            pdf_reader = PyPDF2.PdfReader(stream)
+            return [pdf_reader.pages[i].extract_text() or "" for i in range(start, stop)]
+        finally:
+            if stream is not file:
+                stream.close()
@@ -0,0 +1,224 @@
+# extractive.py - Vectorized TF-IDF / LexRank sentence extraction
+#
+# Sentences become L2-normalized TF-IDF rows of a sparse matrix, and their
+# cosine-similarity graph is ranked with power iteration (continuous
+# LexRank). The similarity matrix S = X·Xᵀ is never built: each iteration
+# computes S·p as X·(Xᵀ·p), so a step costs O(non-zeros of X) and a
+# 10,000-sentence document is ranked in milliseconds.
+
+import importlib.util
+import math
+from itertools import chain
+
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+EXTRACTIVE_MODEL = "extractive"  # model_type of the extractive-only mode
+
+# Documents shorter than this are sent to the model whole, even with the pre-filter on
+PREFILTER_MIN_SENTENCES = 40
+
+# Separates sentences in the joined text that tfidf_matrix tokenizes in one
+# pass; str.split() does not treat it as space
+_SENTENCE_SEPARATOR = '\x00'
+
+# tfidf_matrix works on UTF-8 bytes: ASCII punctuation becomes a space and
+# A-Z is lowered by one table. In non-ASCII text the UTF-8 sequences of the
+# other spaces and of general punctuation (U+2000-U+206F) are blanked too.
+_BYTE_BREAKS = bytes(
+    32 if code < 128 and not chr(code).isalnum() and chr(code) != _SENTENCE_SEPARATOR
+    else code + 32 if 65 <= code <= 90 else code
+    for code in range(256)
+)
+_WIDE_SPACES = tuple(chr(code).encode('utf-8') for code in (0x85, 0xA0, 0x1680, 0x3000))
+
+# Words are keyed by their length plus their first 24 bytes, 8 at a time
+_KEY_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9)
+
+# ASCII and general punctuation become spaces, so str.split() yields the words
+_WORD_BREAKS = str.maketrans({
+    chr(code): ' ' for code in chain(range(128), range(0x2000, 0x2070))
+    if not chr(code).isalnum() and chr(code) != _SENTENCE_SEPARATOR
+})
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have having
+he her here hers herself him himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your yours yourself yourselves
+may might must shall upon within without via per etc however therefore thus also one two use used using
+""".split())
+
+
+def tfidf_matrix(sentences):
+    """Sparse sentence × term matrix of L2-normalized, sublinear TF-IDF weights"""
+    import numpy as np
+    from scipy import sparse
+
+    # The joined text is tokenized as one byte array; the separators become
+    # one-byte words that mark where each sentence starts
+    separator = f" {_SENTENCE_SEPARATOR} "
+    text = " " + separator.join(sentences) + separator
+    if text.count(_SENTENCE_SEPARATOR) != len(sentences):
+        text = " " + separator.join(sentence.replace(_SENTENCE_SEPARATOR, ' ') for sentence in sentences) + separator
+    ascii_only = text.isascii()
+    # Trailing spaces pad the 8-byte reads below
+    raw = (text if ascii_only else text.lower()).encode('utf-8').translate(_BYTE_BREAKS) + b' ' * 8
+    data = np.frombuffer(raw, dtype=np.uint8)
+    if not ascii_only:
+        data = data.copy()
+        _blank_wide_breaks(data, raw)
+
+    # The text starts and ends with a space, so word edges alternate start, end
+    in_word = data != 32
+    edges = np.flatnonzero(in_word[1:] != in_word[:-1]) + 1
+    starts, ends = edges[0::2], edges[1::2]
+    separators = data[starts] == 0
+    rows = (np.cumsum(separators) - separators)[~separators]
+    starts, ends = starts[~separators], ends[~separators]
+
+    # An unaligned 8-byte view reads a word's next 8 bytes in one gather, and
+    # the rare words over 24 bytes add a hash of the rest
+    lengths = ends - starts
+    octets = np.ndarray((len(data) - 8,), dtype='<u8', buffer=data, strides=(1,))
+    masks = np.array([(1 << (8 * size)) - 1 for size in range(9)], dtype=np.uint64)
+    keys = lengths.astype(np.uint64)
+    with np.errstate(over='ignore'):
+        for part, multiplier in enumerate(_KEY_MULTIPLIERS):
+            words = np.flatnonzero(lengths > 8 * part) if part else slice(None)
+            remaining = np.minimum(lengths[words] - 8 * part, 8)
+            keys[words] += (octets[starts[words] + 8 * part] & masks[remaining]) * np.uint64(multiplier)
+        for word in np.flatnonzero(lengths > 24).tolist():
+            keys[word] += np.uint64(hash(raw[starts[word] + 24:ends[word]]) & 0xFFFFFFFFFFFFFFFF)
+
+    # Sorting the keys groups each term's occurrences; any one of them is
+    # decoded to drop stop words and single characters
+    order = np.argsort(keys)
+    ordered = keys[order]
+    first = np.empty(len(keys), dtype=bool)
+    first[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+    terms = np.empty(len(keys), dtype=np.int64)
+    terms[order] = np.cumsum(first) - 1
+    kept = np.array([word not in STOP_WORDS and len(word) > 1 for word in (
+        raw[start:end].decode('utf-8') for start, end in zip(starts[order[first]].tolist(), ends[order[first]].tolist()))],
+        dtype=bool)
+    columns = (np.cumsum(kept) - 1)[terms]
+    keep = kept[terms]
+
+    shape = (len(sentences), max(1, int(kept.sum())))
+    counts = sparse.csr_matrix((np.ones(int(keep.sum()), dtype=np.float32), (rows[keep], columns[keep])),
+                               shape=shape)
+    counts.sum_duplicates()
+
+    document_frequency = np.bincount(counts.indices, minlength=shape[1])
+    idf = np.log((1 + shape[0]) / (1 + document_frequency)).astype(np.float32) + 1
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ counts
+
+
+def _blank_wide_breaks(data, raw):
+    """Overwrite the UTF-8 of non-ASCII spaces and general punctuation with spaces"""
+    import numpy as np
+
+    # U+2000-U+206F is E2 80 xx or E2 81 80-AF
+    found = np.flatnonzero(data[:-2] == 0xE2)
+    second, third = data[found + 1], data[found + 2]
+    found = found[(second == 0x80) | ((second == 0x81) & (third <= 0xAF))]
+    for offset in range(3):
+        data[found + offset] = 32
+    for sequence in _WIDE_SPACES:
+        if sequence in raw:
+            found = np.flatnonzero(data[:1 - len(sequence)] == sequence[0])
+            for offset in range(1, len(sequence)):
+                found = found[data[found + offset] == sequence[offset]]
+            for offset in range(len(sequence)):
+                data[found + offset] = 32
+
+
+def lexrank_scores(matrix, damping=0.85, tolerance=1e-6, max_iterations=100):
+    """Stationary centrality of each sentence in the cosine-similarity graph"""
+    import numpy as np
+
+    n = matrix.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    # The iterate is float64; a float32 matrix would be upcast on every product
+    matrix = matrix.astype(np.float64)
+    transposed = matrix.T.tocsr()
+
+    # Row sums of S without self-similarity; rows with no terms have none
+    has_terms = np.diff(matrix.indptr) > 0
+    degree = matrix @ (transposed @ np.ones(n)) - has_terms
+    dangling = degree <= 1e-12
+    inverse_degree = np.where(dangling, 0.0, 1 / np.where(dangling, 1, degree))
+
+    scores = np.full(n, 1 / n)
+    for _ in range(max_iterations):
+        weighted = scores * inverse_degree
+        # Sᵀ·(p/deg) without the diagonal, plus the mass of sentences with no neighbours
+        spread = matrix @ (transposed @ weighted) - weighted * has_terms
+        updated = (1 - damping) / n + damping * (spread + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def frequency_scores(sentences):
+    """Stop-word-free word-frequency score per sentence, for installs without SciPy"""
+    tokens = [[word for word in sentence.lower().translate(_WORD_BREAKS).split() if word not in STOP_WORDS]
+              for sentence in sentences]
+    frequency = {}
+    for words in tokens:
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+    # Normalized by length so long sentences do not win on size alone
+    return [sum(frequency[word] for word in words) / math.sqrt(len(words) or 1) for words in tokens]
+
+
+def rank_sentences(sentences):
+    """LexRank score per sentence, or frequency scores if SciPy is missing"""
+    if not sentences:
+        return []
+    if not SCIPY_AVAILABLE:
+        return frequency_scores(sentences)
+    return lexrank_scores(tfidf_matrix(sentences)).tolist()
+
+
+def select_indices(sentences, keep_ratio, max_sentences=None):
+    """Positions of the top keep_ratio of sentences by rank, in document order"""
+    count = max(1, int(len(sentences) * keep_ratio))
+    if max_sentences:
+        count = min(count, max_sentences)
+    if count >= len(sentences):
+        return list(range(len(sentences)))
+
+    scores = rank_sentences(sentences)
+    top = sorted(range(len(sentences)), key=scores.__getitem__, reverse=True)[:count]
+    return sorted(top)
+
+
+def select_sentences(sentences, keep_ratio, max_sentences=None):
+    """The top keep_ratio of sentences by rank, in document order"""
+    return [sentences[i] for i in select_indices(sentences, keep_ratio, max_sentences)]
+
+
+def extract_summary(sentences, summary_ratio=0.3, max_sentences=None):
+    """Extractive summary: the top-ranked sentences joined in document order"""
+    if len(sentences) <= 2:
+        return ' '.join(sentences)
+    return ' '.join(select_sentences(sentences, summary_ratio, max_sentences))
+
+
+def prefilter_keep_ratio(summary_ratio):
+    """Share of sentences the pre-filter passes to the model at a detail level"""
+    if summary_ratio <= 0.3:  # Low detail
+        return 0.25
+    if summary_ratio <= 0.6:  # Medium detail
+        return 0.4
+    return 0.6  # High detail
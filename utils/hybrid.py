@@ -0,0 +1,185 @@
+# hybrid.py - Latency-based routing between the offline model and the online API
+#
+# In hybrid mode every chunk goes to whichever backend is expected to finish
+# it first, judged by the latency observed so far and the work already
+# queued on it. A backend that keeps failing (network errors, timeouts,
+# rate limiting) is taken out of rotation for a cool-down period, and its
+# failed chunks are summarized locally.
+
+import threading
+import time
+
+OFFLINE = "offline"
+ONLINE = "online"
+
+# Upper bounds in seconds of the latency histogram buckets; the last is open
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float('inf'))
+
+
+class LatencyHistogram:
+    """Request latencies counted into fixed buckets"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean': round(self.mean, 4),
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'buckets': {('inf' if bound == float('inf') else bound): count
+                        for bound, count in zip(self.bounds, self.counts)}
+        }
+
+
+class BackendStats:
+    """Routing state of one backend"""
+
+    def __init__(self, name, slots, latency):
+        self.name = name
+        self.slots = slots  # Requests it serves at once
+        self.latency = latency  # Smoothed seconds per chunk
+        self.histogram = LatencyHistogram()  # Seconds per request (per batch for the offline model)
+        self.in_flight = 0  # Chunks sent and not yet answered
+        self.chunks = 0  # Chunks completed
+        self.errors = 0
+        self.consecutive_errors = 0
+        self.down_until = 0.0
+
+    def expected_wait(self):
+        """Seconds until one more chunk sent now would be done"""
+        return self.latency * (self.in_flight + 1) / self.slots
+
+
+class HybridRouter:
+    """Pick the backend expected to finish the next chunk first.
+
+    Latencies start from rough priors and follow the observed ones with an
+    exponential moving average (weight ``alpha``). After
+    ``failure_threshold`` failures in a row the online API is skipped for
+    ``cooldown`` seconds.
+    """
+
+    def __init__(self, online_slots=4, alpha=0.3, failure_threshold=2, cooldown=30.0, online_timeout=10.0):
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.online_timeout = online_timeout  # Slower answers count as failures and go local
+        self.backends = {
+            OFFLINE: BackendStats(OFFLINE, 1, 1.0),
+            ONLINE: BackendStats(ONLINE, max(1, online_slots), 2.0),
+        }
+        self._lock = threading.Lock()
+
+    def configure(self, online_slots=None):
+        with self._lock:
+            if online_slots is not None:
+                self.backends[ONLINE].slots = max(1, online_slots)
+
+    def available(self, name):
+        """False while the backend cools down after repeated failures"""
+        return time.monotonic() >= self.backends[name].down_until
+
+    def choose(self, offline_free=True, online_free=True):
+        """Backend to send the next chunk to, or None if it is better to wait for a busy one"""
+        with self._lock:
+            candidates = [self.backends[OFFLINE]]
+            if self.available(ONLINE):
+                candidates.append(self.backends[ONLINE])
+            best = min(candidates, key=BackendStats.expected_wait)
+        free = offline_free if best.name == OFFLINE else online_free
+        return best.name if free else None
+
+    def started(self, name, chunks=1):
+        with self._lock:
+            self.backends[name].in_flight += chunks
+
+    def finished(self, name, seconds, chunks=1):
+        """Record a successful request of ``chunks`` chunks that took ``seconds``"""
+        with self._lock:
+            backend = self.backends[name]
+            backend.in_flight -= chunks
+            backend.chunks += chunks
+            backend.consecutive_errors = 0
+            backend.histogram.observe(seconds)
+            backend.latency += self.alpha * (seconds / chunks - backend.latency)
+
+    def failed(self, name, seconds, chunks=1):
+        """Record a failed request; enough failures in a row take the backend out of rotation"""
+        with self._lock:
+            backend = self.backends[name]
+            backend.in_flight -= chunks
+            backend.errors += 1
+            backend.consecutive_errors += 1
+            backend.histogram.observe(seconds)
+            # A failure costs its time plus the local retry, so the backend looks slower
+            backend.latency += self.alpha * (seconds / chunks + self.backends[OFFLINE].latency - backend.latency)
+            if backend.consecutive_errors >= self.failure_threshold:
+                backend.down_until = time.monotonic() + self.cooldown
+                print(f"⚠️ {name.capitalize()} backend failing, routing chunks locally for {self.cooldown:.0f}s")
+
+    def stats(self):
+        """Per-backend counters and latency histograms"""
+        with self._lock:
+            return {
+                name: {
+                    'chunks': backend.chunks,
+                    'errors': backend.errors,
+                    'latency_per_chunk': round(backend.latency, 4),
+                    'histogram': backend.histogram.as_dict()
+                }
+                for name, backend in self.backends.items()
+            }
+
+    def report(self):
+        """Readable per-backend summary"""
+        lines = []
+        for name, stats in self.stats().items():
+            histogram = stats['histogram']
+            lines.append(
+                f"🔀 {name}: {stats['chunks']} chunks, {stats['errors']} errors, "
+                f"{histogram['count']} requests, mean {histogram['mean']:.2f}s, "
+                f"p50 ≤{histogram['p50']:g}s, p95 ≤{histogram['p95']:g}s"
+            )
+        return "\n".join(lines)
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_hybrid_router():
+    """Return the shared process-wide router, so latencies learned on one file carry over"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = HybridRouter()
+        return _router
@@ -0,0 +1,448 @@
+# inference_server.py - Shared inference process for the GUI and CLI
+#
+# One server process per user owns the loaded models. GUI windows and CLI
+# runs connect over a local socket (a named pipe on Windows), chunk and
+# tokenize the text themselves and send batches of token IDs. Requests that
+# arrive close together for the same model are merged into one forward
+# pass, so several clients share both the model's memory and its batches.
+#
+# Run in the foreground with:  python -m utils.inference_server
+
+import argparse
+import hashlib
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+
+from .backends import InferenceBackend
+from .cancellation import CancelledError
+from .summary_cache import default_cache_dir
+
+PROTOCOL_VERSION = 1
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def server_dir():
+    """Directory holding the server's socket, secret, lock and log"""
+    return os.path.join(default_cache_dir(), 'server')
+
+
+def server_address():
+    """Local address of the inference server for this user and cache directory"""
+    if sys.platform == 'win32':
+        digest = hashlib.sha256(server_dir().encode('utf-8')).hexdigest()[:16]
+        return rf'\\.\pipe\ai-document-summarizer-{digest}'
+    return os.path.join(server_dir(), 'inference.sock')
+
+
+def _authkey():
+    """Shared secret that clients must know; created once, readable only by its owner"""
+    path = os.path.join(server_dir(), 'authkey')
+    os.makedirs(server_dir(), exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another process may still be writing it
+        for _ in range(50):
+            with open(path, 'rb') as file:
+                key = file.read()
+            if key:
+                return key
+            time.sleep(0.01)
+        raise RuntimeError(f"Inference server key {path} is empty")
+    key = os.urandom(32)
+    with os.fdopen(fd, 'wb') as file:
+        file.write(key)
+    return key
+
+
+def _acquire_server_lock():
+    """Hold an exclusive lock on the server lock file, or return None if another server has it"""
+    file = open(os.path.join(server_dir(), 'server.lock'), 'a+')
+    try:
+        if sys.platform == 'win32':
+            import msvcrt
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        file.close()
+        return None
+    return file
+
+
+class _Request:
+    """One client's batch waiting for the micro-batcher"""
+
+    def __init__(self, batch_ids, max_length, min_length):
+        self.batch_ids = batch_ids
+        self.max_length = max_length
+        self.min_length = min_length
+        self.done = threading.Event()
+        self.summaries = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Merge concurrent requests for one model into shared forward passes.
+
+    The first waiting request opens a window of ``max_wait`` seconds; every
+    request arriving within it, up to ``max_batch_size`` chunks, joins the
+    pass. Requests only share a pass when their generation lengths match.
+
+    ``get_backend`` is called for every pass rather than holding the model,
+    so a model the registry evicts is released and reloaded on next use.
+    """
+
+    def __init__(self, get_backend, max_batch_size=16, max_wait=0.01):
+        self.get_backend = get_backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    def generate(self, batch_ids, max_length, min_length):
+        """Queue a batch and block until its summaries are ready"""
+        request = _Request(batch_ids, max_length, min_length)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.summaries
+
+    def _collect(self):
+        pending = [self._queue.get()]
+        size = len(pending[0].batch_ids)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            pending.append(request)
+            size += len(request.batch_ids)
+        return pending
+
+    def _run(self):
+        from .resources import get_resource_manager
+
+        while True:
+            groups = {}
+            for request in self._collect():
+                groups.setdefault((request.max_length, request.min_length), []).append(request)
+
+            for (max_length, min_length), requests in groups.items():
+                try:
+                    backend = self.get_backend()
+                except Exception as e:
+                    for request in requests:
+                        request.error = e
+                        request.done.set()
+                    continue
+                with get_resource_manager().job() as plan, plan.stream() as intra_op:
+                    backend.apply_threads(intra_op)
+                    self._generate_group(backend, requests, max_length, min_length)
+                del backend
+
+    def _generate_group(self, backend, requests, max_length, min_length):
+        batch_ids = [ids for request in requests for ids in request.batch_ids]
+        if len(requests) > 1:
+            print(f"📦 Merged {len(requests)} requests into one batch of {len(batch_ids)} chunks")
+        try:
+            summaries = backend.generate(batch_ids, max_length, min_length)
+        except Exception as e:
+            if len(requests) > 1:
+                # Retry separately so one bad request does not fail the others
+                for request in requests:
+                    self._generate_group(backend, [request], max_length, min_length)
+                return
+            requests[0].error = e
+            requests[0].done.set()
+            return
+
+        offset = 0
+        for request in requests:
+            request.summaries = summaries[offset:offset + len(request.batch_ids)]
+            offset += len(request.batch_ids)
+            request.done.set()
+
+
+def _tokenizer_spec(tokenizer):
+    """What a client needs to rebuild the model's tokenizer without transformers"""
+    return {
+        'tokenizer_json': tokenizer.backend_tokenizer.to_str(),
+        'model_max_length': tokenizer.model_max_length,
+        'eos_token_id': tokenizer.eos_token_id,
+        'pad_token_id': tokenizer.pad_token_id,
+    }
+
+
+class InferenceServer:
+    """Own the loaded models and serve generation requests from local clients.
+
+    The server exits once no client has been connected for ``idle_timeout``
+    seconds (0 keeps it running).
+    """
+
+    def __init__(self, address=None, max_batch_size=16, max_wait=0.01, idle_timeout=600):
+        self.address = address or server_address()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.idle_timeout = idle_timeout
+        self._batchers = {}  # (model, dtype, backend) -> MicroBatcher; holds no model
+        self._clients = 0
+        self._last_activity = time.monotonic()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        """Accept clients until shut down or idle; returns False if another server is running"""
+        os.makedirs(server_dir(), exist_ok=True)
+        lock = _acquire_server_lock()
+        if lock is None:
+            print("ℹ️ An inference server is already running")
+            return False
+
+        try:
+            if sys.platform != 'win32' and os.path.exists(self.address):
+                # Left behind by a server that did not shut down cleanly
+                os.remove(self.address)
+            authkey = _authkey()
+            with Listener(self.address, authkey=authkey) as listener:
+                if sys.platform != 'win32':
+                    os.chmod(self.address, 0o600)
+                print(f"🚀 Inference server listening on {self.address} (pid {os.getpid()})")
+                threading.Thread(target=self._watch_idle, args=(authkey,), name="ServerIdleWatch",
+                                 daemon=True).start()
+                while not self._stopping.is_set():
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        # A client that fails authentication must not stop the server
+                        if not self._stopping.is_set():
+                            print(f"⚠️ Rejected connection: {e}")
+                        continue
+                    if self._stopping.is_set():
+                        conn.close()
+                        break
+                    threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+        finally:
+            lock.close()
+        print("👋 Inference server stopped")
+        return True
+
+    def stop(self, authkey=None):
+        """Stop accepting clients; a dummy connection wakes the blocked accept"""
+        self._stopping.set()
+        try:
+            Client(self.address, authkey=authkey or _authkey()).close()
+        except OSError:
+            pass
+
+    def _watch_idle(self, authkey):
+        while not self._stopping.wait(5):
+            with self._lock:
+                idle = self._clients == 0 and time.monotonic() - self._last_activity > self.idle_timeout
+            if self.idle_timeout and idle:
+                print("💤 No clients, shutting down")
+                self.stop(authkey)
+
+    def _serve_client(self, conn):
+        with self._lock:
+            self._clients += 1
+        try:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self._dispatch(message)
+                except Exception as e:
+                    reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+                if message.get('op') == 'shutdown':
+                    self.stop()
+                    return
+        finally:
+            conn.close()
+            with self._lock:
+                self._clients -= 1
+                self._last_activity = time.monotonic()
+
+    def _dispatch(self, message):
+        op = message.get('op')
+        if op == 'ping' or op == 'shutdown':
+            return {'ok': True, 'version': PROTOCOL_VERSION, 'pid': os.getpid()}
+        if op == 'load':
+            model = self._get_backend(message['model'], message['dtype'], message['backend'])
+            return {'ok': True, **_tokenizer_spec(model.tokenizer)}
+        if op == 'generate':
+            batcher = self._get_batcher(message['model'], message['dtype'], message['backend'])
+            summaries = batcher.generate(message['batch_ids'], message['max_length'], message['min_length'])
+            return {'ok': True, 'summaries': summaries}
+        raise ValueError(f"Unknown request '{op}'")
+
+    @staticmethod
+    def _get_backend(model_name, dtype, backend):
+        """The registry's backend for a model, loading it if it was never loaded or was evicted"""
+        from .model_registry import get_model_registry
+
+        registry = get_model_registry()
+        if not registry.is_loaded(model_name, -1, dtype, backend):
+            print(f"Loading {model_name} ({dtype}, {backend})...")
+        return registry.get(model_name, -1, dtype, backend=backend)
+
+    def _get_batcher(self, model_name, dtype, backend):
+        key = (model_name, dtype, backend)
+        with self._lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                batcher = MicroBatcher(lambda: self._get_backend(model_name, dtype, backend),
+                                       self.max_batch_size, self.max_wait)
+                self._batchers[key] = batcher
+            return batcher
+
+
+class RemoteBackend(InferenceBackend):
+    """InferenceBackend that forwards generation to the shared inference server"""
+    name = "remote"
+
+    def __init__(self, model_name, dtype="float32", backend="torch", address=None):
+        self.model_name = model_name
+        self.dtype = dtype
+        self.backend = backend
+        self.address = address or server_address()
+        self._authkey = _authkey()
+        # Parallel batches each get their own connection, so the server can merge them
+        self._local = threading.local()
+
+        from .onnx_backend import ExportedTokenizer
+
+        spec = self._call({'op': 'load'})
+        super().__init__(ExportedTokenizer.from_str(spec['tokenizer_json'], spec['model_max_length'],
+                                                    spec['eos_token_id'], spec['pad_token_id']))
+
+    def _call(self, message, cancel_token=None):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, authkey=self._authkey)
+        message.update(model=self.model_name, dtype=self.dtype, backend=self.backend)
+        try:
+            conn.send(message)
+            while cancel_token is not None and not conn.poll(0.05):
+                if cancel_token.cancelled:
+                    # The server finishes the batch for any merged requests; this reply is dropped
+                    raise CancelledError()
+            reply = conn.recv()
+        except (EOFError, OSError, CancelledError):
+            self._local.conn = None
+            conn.close()
+            raise
+        if not reply.get('ok'):
+            raise RuntimeError(f"Inference server error: {reply.get('error')}")
+        return reply
+
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        return self._call({'op': 'generate', 'batch_ids': [list(ids) for ids in batch_ids],
+                           'max_length': max_length, 'min_length': min_length}, cancel_token)['summaries']
+
+
+def ping_server(address=None, timeout=None):
+    """Return True if an inference server answers at address"""
+    try:
+        with Client(address or server_address(), authkey=_authkey()) as conn:
+            conn.send({'op': 'ping'})
+            if timeout is not None and not conn.poll(timeout):
+                return False
+            return conn.recv().get('version') == PROTOCOL_VERSION
+    except (OSError, EOFError):
+        return False
+
+
+def start_server(timeout=30):
+    """Start a detached inference server unless one is already answering"""
+    if ping_server(timeout=5):
+        return True
+    if getattr(sys, 'frozen', False):
+        # Frozen builds cannot re-run themselves with "python -m"
+        return False
+
+    os.makedirs(server_dir(), exist_ok=True)
+    kwargs = {}
+    if sys.platform == 'win32':
+        kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs['start_new_session'] = True
+    with open(os.path.join(server_dir(), 'server.log'), 'ab') as log:
+        subprocess.Popen([sys.executable, '-m', 'utils.inference_server'], cwd=PROJECT_DIR,
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **kwargs)
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if ping_server(timeout=5):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def stop_server():
+    """Ask a running inference server to shut down"""
+    try:
+        with Client(server_address(), authkey=_authkey()) as conn:
+            conn.send({'op': 'shutdown'})
+            conn.recv()
+        return True
+    except (OSError, EOFError):
+        return False
+
+
+def connect_backend(model_name, dtype="float32", backend="torch"):
+    """RemoteBackend for a model, starting the inference server if needed"""
+    if not start_server():
+        raise RuntimeError("Could not start the inference server")
+    return RemoteBackend(model_name, dtype, backend)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared inference server for AI Document Summarizer")
+    parser.add_argument('--idle-timeout', type=float, default=600,
+                        help="seconds without clients before exiting, 0 to keep running (default: 600)")
+    parser.add_argument('--max-batch-size', type=int, default=16,
+                        help="chunks merged into one forward pass (default: 16)")
+    parser.add_argument('--max-wait-ms', type=float, default=10,
+                        help="how long a request waits for others to join its batch (default: 10)")
+    parser.add_argument('--threads', type=int, default=0,
+                        help="CPU threads for inference (default: 0, one per core)")
+    parser.add_argument('--stop', action='store_true', help="stop the running server and exit")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        if stop_server():
+            print("✅ Inference server stopped")
+            return 0
+        print("ℹ️ No inference server is running")
+        return 1
+
+    from .resources import get_resource_manager
+    get_resource_manager().configure(total_threads=args.threads)
+
+    server = InferenceServer(max_batch_size=args.max_batch_size, max_wait=args.max_wait_ms / 1000,
+                             idle_timeout=args.idle_timeout)
+    return 0 if server.serve_forever() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# mock_inference_api.py - Local stand-in for the HuggingFace Inference API
+#
+# Answers summarization requests like the hosted API, with configurable
+# latency, "model loading" 503s and failures, and records what it saw, so
+# the online path can be exercised and benchmarked without network access.
+#
+# Run standalone with:  python -m utils.mock_inference_api [--port 8765]
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests, as the real API does
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; Nagle would delay every kept-alive response
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.api._connection_opened()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        status, response = self.server.api._respond(self.path, self.headers, body)
+        data = json.dumps(response).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockInferenceAPI:
+    """Summarization endpoint on localhost that mimics the hosted inference API.
+
+    The first ``loading_requests`` requests get a 503 with ``estimated_time``,
+    as while the hosted model loads; every ``fail_every``-th later request
+    gets a 500. Summaries are the first words of the input, sized by the
+    requested max_length.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.05, loading_requests=0, estimated_time=0.2,
+                 fail_every=0):
+        self.latency = latency
+        self.loading_requests = loading_requests
+        self.estimated_time = estimated_time
+        self.fail_every = fail_every
+        self.requests = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.payloads = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/models/facebook/bart-large-cnn"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockInferenceAPI", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def _respond(self, path, headers, body):
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if number <= self.loading_requests:
+                return 503, {"error": "Model facebook/bart-large-cnn is currently loading",
+                             "estimated_time": self.estimated_time}
+            if self.fail_every and number % self.fail_every == 0:
+                return 500, {"error": "Internal server error"}
+
+            payload = json.loads(body or b'{}')
+            with self._lock:
+                self.payloads.append(payload)
+            words = str(payload.get('inputs', '')).split()
+            parameters = payload.get('parameters', {})
+            length = max(parameters.get('min_length', 0), parameters.get('max_length', 60) // 2)
+            return 200, [{"summary_text": " ".join(words[:length])}]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the HuggingFace Inference API")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds per request (default: 0.05)")
+    parser.add_argument('--loading-requests', type=int, default=0, help="initial requests answered with 503")
+    parser.add_argument('--fail-every', type=int, default=0, help="answer every n-th request with 500")
+    args = parser.parse_args(argv)
+
+    api = MockInferenceAPI(port=args.port, latency=args.latency, loading_requests=args.loading_requests,
+                           fail_every=args.fail_every)
+    print(f"🧪 Mock inference API at {api.url}")
+    print(f"   Use it with: AI_SUMMARIZER_API_URL={api.url}")
+    try:
+        api._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api._server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+# model_registry.py - Process-wide cache of loaded summarization models
+
+import threading
+import time
+from collections import OrderedDict
+
+from .backends import load_backend
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of loaded inference backends.
+
+    Models are keyed by (model name, device, dtype, backend), loaded lazily on
+    first use and kept warm between files. Least recently used entries are
+    dropped once more than ``max_models`` are loaded, and any entry unused
+    for ``idle_timeout`` seconds is evicted by a background janitor.
+    """
+
+    def __init__(self, max_models=2, idle_timeout=900, janitor_interval=60):
+        self.max_models = max_models
+        self.idle_timeout = idle_timeout
+        self.janitor_interval = janitor_interval
+        self._entries = OrderedDict()  # key -> [model, last_used]
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self._janitor = None
+
+    @staticmethod
+    def make_key(model_name, device=-1, dtype="float32", backend="torch"):
+        """Build the cache key for a model configuration"""
+        return (model_name, device, dtype, backend)
+
+    def get(self, model_name, device=-1, dtype="float32", loader=None, backend="torch"):
+        """Return a loaded backend, loading it once if it is not cached yet"""
+        key = self.make_key(model_name, device, dtype, backend)
+
+        model = self._lookup(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given key; the others wait and reuse it
+        with load_lock:
+            model = self._lookup(key)
+            if model is not None:
+                return model
+
+            if loader:
+                model = loader(model_name, device, dtype)
+            else:
+                model = load_backend(model_name, device, dtype, backend)
+
+            with self._lock:
+                self._entries[key] = [model, time.monotonic()]
+                self._entries.move_to_end(key)
+                self._evict_lru_locked()
+                self._start_janitor_locked()
+
+        return model
+
+    def is_loaded(self, model_name, device=-1, dtype="float32", backend="torch"):
+        """Check whether a model configuration is currently cached"""
+        with self._lock:
+            return self.make_key(model_name, device, dtype, backend) in self._entries
+
+    def loaded_keys(self):
+        """List the keys of all cached models, least recently used first"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def evict(self, model_name, device=-1, dtype="float32", backend="torch"):
+        """Drop a single model configuration from the cache"""
+        with self._lock:
+            return self._entries.pop(self.make_key(model_name, device, dtype, backend), None) is not None
+
+    def evict_idle(self):
+        """Drop every model that has been unused for longer than idle_timeout"""
+        with self._lock:
+            return self._evict_idle_locked()
+
+    def clear(self):
+        """Drop all cached models"""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key):
+        with self._lock:
+            self._evict_idle_locked()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry[1] = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _evict_lru_locked(self):
+        while len(self._entries) > self.max_models:
+            key, _ = self._entries.popitem(last=False)
+            print(f"♻️ Evicted model {key[0]} from registry (LRU)")
+
+    def _evict_idle_locked(self):
+        if not self.idle_timeout:
+            return 0
+        now = time.monotonic()
+        expired = [key for key, (_, last_used) in self._entries.items()
+                   if now - last_used > self.idle_timeout]
+        for key in expired:
+            del self._entries[key]
+            print(f"♻️ Evicted model {key[0]} from registry (idle)")
+        return len(expired)
+
+    def _start_janitor_locked(self):
+        if not self.idle_timeout or (self._janitor and self._janitor.is_alive()):
+            return
+        self._janitor = threading.Thread(target=self._janitor_loop, name="ModelRegistryJanitor", daemon=True)
+        self._janitor.start()
+
+    def _janitor_loop(self):
+        while True:
+            time.sleep(self.janitor_interval)
+            with self._lock:
+                self._evict_idle_locked()
+                if not self._entries:
+                    self._janitor = None
+                    return
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Return the shared process-wide model registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
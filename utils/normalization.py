@@ -0,0 +1,83 @@
+# normalization.py - Single-pass text normalization with precompiled patterns
+#
+# Extracted PDF pages and generated summaries used to be cleaned with one
+# re.sub per rule, each copying the whole text. Here the rules are compiled
+# once and merged, and pages are cleaned one at a time as they stream in.
+# The result is the same text the separate substitutions produced, except
+# that email addresses and URLs are no longer split apart.
+
+import re
+
+# Lines this short or shorter are headers, page numbers and other fragments
+MIN_LINE_LENGTH = 20
+
+# Words PDF extraction glued together get a space: before "Upper" in
+# lowerUpper and "1" in letter1, after "1" in 1letter. Both patterns start at
+# an uppercase letter or digit, so the regex engine skips the lowercase text.
+_SPACE_BEFORE = re.compile(r'[A-Z](?<=[a-z].)|\d(?<=[a-zA-Z].)')
+_SPACE_AFTER = re.compile(r'\d(?=[a-zA-Z])')
+
+# Email addresses and URLs are left whole, so online redaction still recognizes them
+ADDRESS_PATTERN = re.compile(r'[^\s@]+@\S+|(?:https?://|www\.)\S+', re.IGNORECASE)
+
+# Summary text: join spaced capitals ("U S" -> "US"), collapse other whitespace
+_SUMMARY_SPACING = re.compile(r'([A-Z])\s+([A-Z])|\s+')
+
+# Section text: collapse whitespace, split glued sentences ("endNext" -> "end. Next"),
+# space after terminators and after bullets; the alternatives start on disjoint characters
+_SECTION_SPACING = re.compile(r'\s+|([a-z])([A-Z])|([.!?])\s*([A-Z])|•\s*')
+
+
+def _space_glued_words(text):
+    return _SPACE_AFTER.sub(r'\g<0> ', _SPACE_BEFORE.sub(r' \g<0>', text))
+
+
+def normalize_page(text, min_line_length=MIN_LINE_LENGTH):
+    """Clean one page of extracted text into a single line.
+
+    Lines of min_line_length characters or fewer (after cleaning) are
+    dropped, unless they end a sentence, such as the last line of a
+    paragraph.
+    """
+    if '@' in text or '://' in text or 'www.' in text.lower():
+        parts = []
+        end = 0
+        for match in ADDRESS_PATTERN.finditer(text):
+            parts.append(_space_glued_words(text[end:match.start()]))
+            parts.append(match.group())
+            end = match.end()
+        parts.append(_space_glued_words(text[end:]))
+        text = ''.join(parts)
+    else:
+        text = _space_glued_words(text)
+    kept = []
+    for line in text.split('\n'):
+        # Collapses whitespace runs as \s+ does
+        line = ' '.join(line.split())
+        if len(line) > min_line_length or (line and line[-1] in '.!?'):
+            kept.append(line)
+    return ' '.join(kept)
+
+
+def _join_summary(match):
+    if match.group(1):
+        return match.group(1) + match.group(2)
+    return ' '
+
+
+def normalize_summary(text):
+    """Collapse whitespace in generated summary text and rejoin spaced capitals"""
+    return _SUMMARY_SPACING.sub(_join_summary, text.strip())
+
+
+def _space_section(match):
+    if match.group(1):
+        return f"{match.group(1)}. {match.group(2)}"
+    if match.group(3):
+        return f"{match.group(3)} {match.group(4)}"
+    return '• ' if match.group().startswith('•') else ' '
+
+
+def normalize_section(text):
+    """Whitespace and punctuation spacing of one summary section"""
+    return _SECTION_SPACING.sub(_space_section, text.strip())
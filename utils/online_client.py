@@ -0,0 +1,226 @@
+# online_client.py - Pooled HTTP client for the HuggingFace Inference API
+#
+# One requests.Session keeps connections to the API alive across chunks and
+# files. Requests run concurrently up to a limit and a request rate, and
+# "model loading" (503) and rate-limit (429) answers are retried with
+# backoff instead of failing.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cancellation import CancelledError, raise_if_cancelled
+
+DEFAULT_API_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
+
+# Point online mode at another endpoint, e.g. a local mock server
+API_URL_ENV = "AI_SUMMARIZER_API_URL"
+API_TOKEN_ENV = "HUGGINGFACEHUB_API_TOKEN"
+
+RETRY_STATUSES = (429, 503)
+
+# Keeps a whole document's chunks under the hosted API's rate limits
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+
+
+class OnlineAPIError(Exception):
+    """A request to the inference API failed for good"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimiter:
+    """Token bucket: at most ``rate`` requests per second on average, bursts up to ``burst``"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_token=None):
+        """Block until a request may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            if cancel_token is not None:
+                if cancel_token.wait(delay):
+                    raise CancelledError()
+            else:
+                time.sleep(delay)
+
+
+class OnlineSummaryClient:
+    """Thread-safe summarization client with keep-alive, a concurrency limit and retries.
+
+    Retried answers wait for the ``estimated_time`` the API reports while a
+    model loads, or the Retry-After header, or else an exponential backoff
+    starting at ``backoff`` seconds and capped at ``max_backoff``. With
+    ``requests_per_second`` set, sends (retries included) are rate limited.
+    """
+
+    def __init__(self, url=None, token=None, max_concurrency=4, timeout=30, max_retries=5, backoff=1.0,
+                 max_backoff=30.0, requests_per_second=None):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.url = url or os.environ.get(API_URL_ENV) or DEFAULT_API_URL
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retries = 0  # Retried requests, for diagnostics
+
+        self.session = requests.Session()
+        # One pooled connection per concurrent request
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Content-Type'] = 'application/json'
+        token = token or os.environ.get(API_TOKEN_ENV)
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._limiter = RateLimiter(requests_per_second, self.max_concurrency) if requests_per_second else None
+        self._lock = threading.Lock()
+
+    def configure(self, max_concurrency=None, requests_per_second=None):
+        """Change the concurrency limit and request rate; 0 requests per second removes the limit"""
+        if max_concurrency is not None:
+            from requests.adapters import HTTPAdapter
+
+            self.max_concurrency = max(1, max_concurrency)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+            self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        if requests_per_second is not None:
+            self._limiter = RateLimiter(requests_per_second, self.max_concurrency) if requests_per_second else None
+
+    def summarize(self, text, max_length, min_length, cancel_token=None, max_retries=None, timeout=None):
+        """Summarize one text, retrying while the model loads or requests are throttled"""
+        import requests
+
+        max_retries = self.max_retries if max_retries is None else max_retries
+        timeout = timeout or self.timeout
+
+        payload = {
+            "inputs": text,
+            "parameters": {
+                "max_length": max_length,
+                "min_length": min_length,
+                "do_sample": False
+            },
+            "options": {
+                # Loading is handled here with backoff, so requests do not hang on the server
+                "wait_for_model": False,
+                "use_cache": False  # Privacy: don't cache
+            }
+        }
+
+        for attempt in range(max_retries + 1):
+            raise_if_cancelled(cancel_token)
+            if self._limiter is not None:
+                self._limiter.acquire(cancel_token)
+            try:
+                with self._slots:
+                    response = self.session.post(self.url, json=payload, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = OnlineAPIError(f"Request failed: {e}")
+                delay = self._backoff_delay(attempt)
+            else:
+                if response.status_code == 200:
+                    return self._parse(response)
+                if response.status_code not in RETRY_STATUSES:
+                    raise OnlineAPIError(f"HTTP {response.status_code}: {response.text[:200]}",
+                                         response.status_code)
+                error = OnlineAPIError(f"HTTP {response.status_code}: {response.text[:200]}",
+                                       response.status_code)
+                delay = self._retry_delay(response, attempt)
+
+            if attempt == max_retries:
+                break
+            with self._lock:
+                self.retries += 1
+            print(f"⏳ Online API busy ({error}), retrying in {delay:.1f}s...")
+            if cancel_token is not None:
+                if cancel_token.wait(delay):
+                    raise CancelledError()
+            else:
+                time.sleep(delay)
+
+        raise error
+
+    def summarize_many(self, items, cancel_token=None):
+        """Summarize (text, max_length, min_length) items concurrently.
+
+        Returns one entry per item, in order: the summary, or the exception
+        that item failed with, so callers can fall back per item.
+        """
+        def run(item):
+            try:
+                return self.summarize(*item, cancel_token=cancel_token)
+            except CancelledError:
+                raise
+            except Exception as e:
+                return e
+
+        if len(items) <= 1:
+            return [run(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+            return list(pool.map(run, items))
+
+    def close(self):
+        self.session.close()
+
+    def _parse(self, response):
+        try:
+            result = response.json()
+        except ValueError:
+            raise OnlineAPIError(f"Invalid JSON response: {response.text[:200]}", response.status_code)
+        if isinstance(result, list) and result and 'summary_text' in result[0]:
+            return result[0]['summary_text']
+        raise OnlineAPIError(f"Unexpected response: {str(result)[:200]}", response.status_code)
+
+    def _retry_delay(self, response, attempt):
+        """Wait as long as the API asks, if it says"""
+        try:
+            estimated = float(response.json().get('estimated_time'))
+        except (ValueError, TypeError, AttributeError):
+            estimated = None
+        if estimated is None:
+            try:
+                estimated = float(response.headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                estimated = None
+        if estimated is not None:
+            return min(self.max_backoff, max(0.0, estimated))
+        return self._backoff_delay(attempt)
+
+    def _backoff_delay(self, attempt):
+        return min(self.max_backoff, self.backoff * (2 ** attempt))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_online_client():
+    """Return the shared process-wide online client, so connections are reused across files"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OnlineSummaryClient(requests_per_second=DEFAULT_REQUESTS_PER_SECOND)
+        return _client
@@ -0,0 +1,238 @@
+# onnx_backend.py - ONNX Runtime inference backend for T5 models
+#
+# The model is exported once into three graphs: the encoder, a first decoder
+# step that also projects the encoder states into cross-attention keys and
+# values, and a decoder step that takes the key/value cache of the previous
+# steps. Exports are stored next to the Hugging Face cache together with the
+# tokenizer, so later runs need neither PyTorch nor network access.
+
+import hashlib
+import json
+import os
+import re
+
+from .backends import InferenceBackend, apply_quiet
+from .cancellation import raise_if_cancelled
+
+# Bump whenever the exported graphs change, so old exports are not reused
+ONNX_EXPORT_VERSION = 1
+ONNX_OPSET = 17
+
+ENCODER_FILE = "encoder.onnx"
+DECODER_INIT_FILE = "decoder_init.onnx"
+DECODER_FILE = "decoder_with_past.onnx"
+EXPORT_INFO_FILE = "export.json"
+
+
+def onnx_cache_root():
+    """Directory next to the Hugging Face hub cache that holds ONNX exports"""
+    try:
+        from huggingface_hub import constants
+        hub_cache = constants.HF_HUB_CACHE
+    except ImportError:
+        hub_cache = os.path.join(os.path.expanduser('~'), '.cache', 'huggingface', 'hub')
+    return os.path.join(os.path.dirname(hub_cache.rstrip('/\\')), 'onnx')
+
+
+def cache_names(prefix, num_layers):
+    """Graph input/output names of one key/value tensor pair per decoder layer"""
+    names = []
+    for layer in range(num_layers):
+        names.extend([f"{prefix}.{layer}.key", f"{prefix}.{layer}.value"])
+    return names
+
+
+def onnx_export_dir(model_name, config_json, root=None):
+    """Export directory for a model, keyed on its name and configuration"""
+    identity = json.dumps({'model': model_name, 'config': config_json, 'version': ONNX_EXPORT_VERSION},
+                          sort_keys=True)
+    digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+    slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', os.path.basename(model_name.rstrip('/\\'))) or 'model'
+    return os.path.join(root or onnx_cache_root(), f"{slug}-{digest}")
+
+
+def _read_config(model_name):
+    """Raw config.json of a local or cached hub model, read without transformers"""
+    if os.path.isdir(model_name):
+        path = os.path.join(model_name, 'config.json')
+    else:
+        from huggingface_hub import hf_hub_download
+        path = hf_hub_download(model_name, 'config.json')
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+class ExportedTokenizer:
+    """The subset of the transformers tokenizer API the summarizer uses.
+
+    Backed by the export's tokenizer.json through the tokenizers library, so
+    the ONNX backend never imports transformers, which would load PyTorch.
+    """
+
+    def __init__(self, tokenizer, model_max_length, eos_token_id, pad_token_id):
+        self._tokenizer = tokenizer
+        # Truncation is done by the chunker
+        self._tokenizer.no_truncation()
+        self._tokenizer.no_padding()
+        self.model_max_length = model_max_length
+        self.eos_token_id = eos_token_id
+        self.pad_token_id = pad_token_id
+
+    @classmethod
+    def from_dir(cls, model_dir, eos_token_id, pad_token_id):
+        """Load tokenizer.json and tokenizer_config.json saved with an export"""
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, 'tokenizer_config.json'), 'r', encoding='utf-8') as file:
+            model_max_length = json.load(file).get('model_max_length', 512)
+        return cls(Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json')), model_max_length,
+                   eos_token_id, pad_token_id)
+
+    @classmethod
+    def from_str(cls, tokenizer_json, model_max_length, eos_token_id, pad_token_id):
+        """Rebuild a tokenizer from its serialized tokenizer.json"""
+        from tokenizers import Tokenizer
+
+        return cls(Tokenizer.from_str(tokenizer_json), model_max_length, eos_token_id, pad_token_id)
+
+    @property
+    def backend_tokenizer(self):
+        """The underlying tokenizers.Tokenizer, named as on transformers' fast tokenizers"""
+        return self._tokenizer
+
+    def __call__(self, text, add_special_tokens=True, **kwargs):
+        if isinstance(text, str):
+            return {'input_ids': self._tokenizer.encode(text, add_special_tokens=add_special_tokens).ids}
+        encodings = self._tokenizer.encode_batch(list(text), add_special_tokens=add_special_tokens)
+        return {'input_ids': [encoding.ids for encoding in encodings]}
+
+    def decode(self, ids, skip_special_tokens=False, clean_up_tokenization_spaces=False):
+        text = self._tokenizer.decode([int(token) for token in ids], skip_special_tokens=skip_special_tokens)
+        return _clean_up_tokenization(text) if clean_up_tokenization_spaces else text
+
+    def batch_decode(self, sequences, skip_special_tokens=False, clean_up_tokenization_spaces=False):
+        return [self.decode(ids, skip_special_tokens, clean_up_tokenization_spaces) for ids in sequences]
+
+
+def _clean_up_tokenization(text):
+    """Same space clean-up as transformers applies after decoding"""
+    for before, after in ((" .", "."), (" ?", "?"), (" !", "!"), (" ,", ","), (" ' ", "'"), (" n't", "n't"),
+                          (" 'm", "'m"), (" 's", "'s"), (" 've", "'ve"), (" 're", "'re")):
+        text = text.replace(before, after)
+    return text
+
+
+class OnnxBackend(InferenceBackend):
+    """Greedy T5 decoding on ONNX Runtime with a key/value cache and IO binding"""
+    name = "onnx"
+
+    def __init__(self, model_dir, intra_op_threads=None):
+        import onnxruntime as ort
+
+        with open(os.path.join(model_dir, EXPORT_INFO_FILE), 'r', encoding='utf-8') as file:
+            info = json.load(file)
+        super().__init__(ExportedTokenizer.from_dir(model_dir, info['eos_token_id'], info['pad_token_id']))
+        self.model_dir = model_dir
+        self.num_layers = info['num_layers']
+        self.decoder_start_token_id = info['decoder_start_token_id']
+        self.eos_token_id = info['eos_token_id']
+        self.pad_token_id = info['pad_token_id']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        providers = ["CPUExecutionProvider"]
+        self.encoder = ort.InferenceSession(os.path.join(model_dir, ENCODER_FILE), options, providers=providers)
+        self.decoder_init = ort.InferenceSession(os.path.join(model_dir, DECODER_INIT_FILE), options,
+                                                 providers=providers)
+        self.decoder = ort.InferenceSession(os.path.join(model_dir, DECODER_FILE), options, providers=providers)
+
+    @classmethod
+    def load(cls, model_name, dtype="float32"):
+        """Load a model's ONNX export, exporting it first if needed"""
+        from .resources import get_resource_manager
+
+        if dtype != "float32":
+            raise ValueError(f"The ONNX backend runs float32 models only, not {dtype}")
+        apply_quiet()
+
+        # Concurrent runs share each session's intra-op pool, so it gets the whole budget
+        intra_op_threads = get_resource_manager().total_threads or None
+
+        if os.path.isfile(os.path.join(model_name, EXPORT_INFO_FILE)):
+            return cls(model_name, intra_op_threads)
+
+        model_dir = onnx_export_dir(model_name, _read_config(model_name))
+        if not os.path.isfile(os.path.join(model_dir, EXPORT_INFO_FILE)):
+            # Only exporting needs PyTorch
+            from .onnx_export import export_t5_to_onnx
+            export_t5_to_onnx(model_name, model_dir)
+        return cls(model_dir, intra_op_threads)
+
+    def generate(self, batch_ids, max_length, min_length, cancel_token=None):
+        import numpy as np
+
+        batch = len(batch_ids)
+        longest = max(len(ids) for ids in batch_ids)
+        input_ids = np.full((batch, longest), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((batch, longest), dtype=np.int64)
+        for row, ids in enumerate(batch_ids):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+
+        # Encoder states stay in ONNX Runtime memory and are bound, not copied, into the decoder
+        binding = self.encoder.io_binding()
+        binding.bind_cpu_input('input_ids', input_ids)
+        binding.bind_cpu_input('attention_mask', attention_mask)
+        binding.bind_output('encoder_hidden_states')
+        self.encoder.run_with_iobinding(binding)
+        encoder_states = binding.get_outputs()[0]
+
+        self_names = cache_names('past_self', self.num_layers)
+        cross_names = cache_names('cross', self.num_layers)
+        tokens = np.full((batch, 1), self.decoder_start_token_id, dtype=np.int64)
+
+        binding = self.decoder_init.io_binding()
+        binding.bind_cpu_input('input_ids', tokens)
+        binding.bind_ortvalue_input('encoder_hidden_states', encoder_states)
+        binding.bind_cpu_input('encoder_attention_mask', attention_mask)
+        for name in ['logits'] + cache_names('present_self', self.num_layers) + cross_names:
+            binding.bind_output(name)
+        self.decoder_init.run_with_iobinding(binding)
+        outputs = binding.get_outputs()
+        logits = outputs[0].numpy()
+        past = outputs[1:1 + len(self_names)]
+        cross = outputs[1 + len(self_names):]
+
+        generated = []
+        finished = np.zeros(batch, dtype=bool)
+        # max_length and min_length count the decoder start token, as in transformers
+        for step in range(max(1, max_length - 1)):
+            raise_if_cancelled(cancel_token)
+            if step + 1 < min_length:
+                logits[:, self.eos_token_id] = -np.inf
+            next_tokens = logits.argmax(axis=-1)
+            next_tokens[finished] = self.pad_token_id
+            finished |= next_tokens == self.eos_token_id
+            generated.append(next_tokens)
+            if finished.all() or step + 2 >= max_length:
+                break
+
+            tokens = next_tokens.reshape(batch, 1).astype(np.int64)
+            binding = self.decoder.io_binding()
+            binding.bind_cpu_input('input_ids', tokens)
+            binding.bind_cpu_input('encoder_attention_mask', attention_mask)
+            for name, value in zip(self_names, past):
+                binding.bind_ortvalue_input(name, value)
+            for name, value in zip(cross_names, cross):
+                binding.bind_ortvalue_input(name, value)
+            for name in ['logits'] + cache_names('present_self', self.num_layers):
+                binding.bind_output(name)
+            self.decoder.run_with_iobinding(binding)
+            outputs = binding.get_outputs()
+            logits = outputs[0].numpy()
+            past = outputs[1:]
+
+        output_ids = np.stack(generated, axis=1)
+        return self.tokenizer.batch_decode(output_ids, skip_special_tokens=True, clean_up_tokenization_spaces=True)
@@ -0,0 +1,240 @@
+# onnx_export.py - Export T5 checkpoints for the ONNX Runtime backend
+#
+# The graphs re-implement the T5 forward pass on top of the checkpoint's own
+# modules. Positions are derived from tensor shapes rather than Python ints,
+# so the traced graphs stay valid for every sequence and cache length.
+
+import json
+import os
+import shutil
+import tempfile
+
+import torch
+
+from .onnx_backend import (
+    DECODER_FILE, DECODER_INIT_FILE, ENCODER_FILE, EXPORT_INFO_FILE, ONNX_EXPORT_VERSION, ONNX_OPSET,
+    cache_names
+)
+
+
+def export_t5_to_onnx(model_name, output_dir, opset=ONNX_OPSET):
+    """Export a T5 checkpoint into encoder and cached-decoder ONNX graphs"""
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+    print(f"📦 Exporting {model_name} to ONNX (first run only)...")
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, torch_dtype=torch.float32).eval()
+    if model.config.model_type not in ('t5', 'mt5'):
+        raise ValueError(f"ONNX export supports T5 models, not '{model.config.model_type}'")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    num_layers = model.config.num_decoder_layers
+
+    # Build the export next to its destination so it can be renamed into place
+    parent = os.path.dirname(output_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.export-')
+    try:
+        input_ids = torch.ones((2, 8), dtype=torch.long)
+        attention_mask = torch.ones((2, 8), dtype=torch.long)
+        tokens = torch.zeros((2, 1), dtype=torch.long)
+
+        with torch.no_grad():
+            encoder = _T5EncoderGraph(model)
+            encoder_states = encoder(input_ids, attention_mask)
+            torch.onnx.export(
+                encoder, (input_ids, attention_mask), os.path.join(tmp_dir, ENCODER_FILE),
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['encoder_hidden_states'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'source'},
+                    'attention_mask': {0: 'batch', 1: 'source'},
+                    'encoder_hidden_states': {0: 'batch', 1: 'source'},
+                },
+                opset_version=opset, dynamo=False
+            )
+
+            self_names = cache_names('present_self', num_layers)
+            cross_names = cache_names('cross', num_layers)
+            cache_axes = {0: 'batch', 2: 'past'}
+            cross_axes = {0: 'batch', 2: 'source'}
+
+            decoder_init = _T5DecoderGraph(model, with_past=False)
+            init_outputs = decoder_init(tokens, attention_mask, encoder_states)
+            torch.onnx.export(
+                decoder_init, (tokens, attention_mask, encoder_states), os.path.join(tmp_dir, DECODER_INIT_FILE),
+                input_names=['input_ids', 'encoder_attention_mask', 'encoder_hidden_states'],
+                output_names=['logits'] + self_names + cross_names,
+                dynamic_axes=dict(
+                    {
+                        'input_ids': {0: 'batch'},
+                        'encoder_attention_mask': {0: 'batch', 1: 'source'},
+                        'encoder_hidden_states': {0: 'batch', 1: 'source'},
+                        'logits': {0: 'batch'},
+                    },
+                    **{name: cache_axes for name in self_names},
+                    **{name: cross_axes for name in cross_names}
+                ),
+                opset_version=opset, dynamo=False
+            )
+
+            past_names = cache_names('past_self', num_layers)
+            decoder = _T5DecoderGraph(model, with_past=True)
+            past_inputs = tuple(init_outputs[1:])
+            torch.onnx.export(
+                decoder, (tokens, attention_mask) + past_inputs, os.path.join(tmp_dir, DECODER_FILE),
+                input_names=['input_ids', 'encoder_attention_mask'] + past_names + cross_names,
+                output_names=['logits'] + self_names,
+                dynamic_axes=dict(
+                    {
+                        'input_ids': {0: 'batch'},
+                        'encoder_attention_mask': {0: 'batch', 1: 'source'},
+                        'logits': {0: 'batch'},
+                    },
+                    **{name: cache_axes for name in past_names + self_names},
+                    **{name: cross_axes for name in cross_names}
+                ),
+                opset_version=opset, dynamo=False
+            )
+
+        tokenizer.save_pretrained(tmp_dir)
+        info = {
+            'model': model_name,
+            'num_layers': num_layers,
+            'decoder_start_token_id': model.config.decoder_start_token_id,
+            'eos_token_id': model.config.eos_token_id,
+            'pad_token_id': model.config.pad_token_id,
+            'version': ONNX_EXPORT_VERSION,
+        }
+        with open(os.path.join(tmp_dir, EXPORT_INFO_FILE), 'w', encoding='utf-8') as file:
+            json.dump(info, file, indent=2)
+
+        try:
+            os.replace(tmp_dir, output_dir)
+        except OSError:
+            # Another process finished the same export first
+            if not os.path.isfile(os.path.join(output_dir, EXPORT_INFO_FILE)):
+                raise
+        print(f"✅ ONNX export saved to {output_dir}")
+    finally:
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _split_heads(attention, states):
+    batch = states.shape[0]
+    return states.view(batch, -1, attention.n_heads, attention.key_value_proj_dim).transpose(1, 2)
+
+
+def _attend(attention, query_states, keys, values, bias):
+    batch = query_states.shape[0]
+    query = _split_heads(attention, attention.q(query_states))
+    # T5 does not scale attention scores
+    scores = torch.matmul(query, keys.transpose(3, 2)) + bias
+    weights = torch.softmax(scores.float(), dim=-1).type_as(scores)
+    context = torch.matmul(weights, values).transpose(1, 2).reshape(batch, -1, attention.inner_dim)
+    return attention.o(context)
+
+
+def _position_bias(attention, relative_position, bidirectional):
+    buckets = attention._relative_position_bucket(
+        relative_position,
+        bidirectional=bidirectional,
+        num_buckets=attention.relative_attention_num_buckets,
+        max_distance=attention.relative_attention_max_distance
+    )
+    return attention.relative_attention_bias(buckets).permute([2, 0, 1]).unsqueeze(0)
+
+
+def _positions(like):
+    """0..n-1 for a 1-D tensor of length n, computed from its shape"""
+    return torch.cumsum(torch.ones_like(like, dtype=torch.long), 0) - 1
+
+
+def _mask_bias(attention_mask, dtype):
+    return (1.0 - attention_mask[:, None, None, :].to(dtype)) * torch.finfo(dtype).min
+
+
+class _T5EncoderGraph(torch.nn.Module):
+    def __init__(self, model):
+        super().__init__()
+        encoder = model.get_encoder()
+        self.embed_tokens = encoder.embed_tokens
+        self.blocks = encoder.block
+        self.final_layer_norm = encoder.final_layer_norm
+
+    def forward(self, input_ids, attention_mask):
+        hidden = self.embed_tokens(input_ids)
+        positions = _positions(input_ids[0])
+        relative = positions[None, :] - positions[:, None]
+        bias = _position_bias(self.blocks[0].layer[0].SelfAttention, relative, True)
+        bias = bias + _mask_bias(attention_mask, hidden.dtype)
+
+        for block in self.blocks:
+            layer = block.layer[0]
+            normed = layer.layer_norm(hidden)
+            keys = _split_heads(layer.SelfAttention, layer.SelfAttention.k(normed))
+            values = _split_heads(layer.SelfAttention, layer.SelfAttention.v(normed))
+            hidden = hidden + _attend(layer.SelfAttention, normed, keys, values, bias)
+            hidden = block.layer[-1](hidden)
+
+        return self.final_layer_norm(hidden)
+
+
+class _T5DecoderGraph(torch.nn.Module):
+    """One greedy decoding step; with_past=False is the first step"""
+
+    def __init__(self, model, with_past):
+        super().__init__()
+        decoder = model.get_decoder()
+        self.embed_tokens = decoder.embed_tokens
+        self.blocks = decoder.block
+        self.final_layer_norm = decoder.final_layer_norm
+        self.lm_head = model.lm_head
+        self.scale = model.config.d_model ** -0.5 if model.config.tie_word_embeddings else 1.0
+        self.with_past = with_past
+
+    def forward(self, input_ids, encoder_attention_mask, *states):
+        num_layers = len(self.blocks)
+        if self.with_past:
+            past = states[:2 * num_layers]
+            cross = states[2 * num_layers:]
+        else:
+            encoder_states = states[0]
+            cross = []
+            for block in self.blocks:
+                attention = block.layer[1].EncDecAttention
+                cross.append(_split_heads(attention, attention.k(encoder_states)))
+                cross.append(_split_heads(attention, attention.v(encoder_states)))
+
+        hidden = self.embed_tokens(input_ids)
+        cross_bias = _mask_bias(encoder_attention_mask, hidden.dtype)
+        presents = []
+        bias = None
+
+        for index, block in enumerate(self.blocks):
+            layer = block.layer[0]
+            normed = layer.layer_norm(hidden)
+            keys = _split_heads(layer.SelfAttention, layer.SelfAttention.k(normed))
+            values = _split_heads(layer.SelfAttention, layer.SelfAttention.v(normed))
+            if self.with_past:
+                keys = torch.cat([past[2 * index], keys], dim=2)
+                values = torch.cat([past[2 * index + 1], values], dim=2)
+            presents.extend([keys, values])
+
+            if bias is None:
+                # The single new token sits at the last position of the cache
+                positions = _positions(keys[0, 0, :, 0])
+                relative = (positions - positions[-1:])[None, :]
+                bias = _position_bias(self.blocks[0].layer[0].SelfAttention, relative, False)
+            hidden = hidden + _attend(layer.SelfAttention, normed, keys, values, bias)
+
+            layer = block.layer[1]
+            normed = layer.layer_norm(hidden)
+            hidden = hidden + _attend(layer.EncDecAttention, normed, cross[2 * index], cross[2 * index + 1],
+                                      cross_bias)
+            hidden = block.layer[-1](hidden)
+
+        hidden = self.final_layer_norm(hidden) * self.scale
+        logits = self.lm_head(hidden)[:, -1, :]
+        if self.with_past:
+            return (logits, *presents)
+        return (logits, *presents, *cross)
@@ -0,0 +1,165 @@
+# qt_workers.py - Qt worker threads and PDF export for the desktop UI
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtPrintSupport import QPrinter
+from PyQt5.QtGui import QTextDocument
+from PyQt5.QtWidgets import QMessageBox, QFileDialog
+import os
+
+from .cancellation import CancelledError
+from .scheduler import SummaryScheduler
+from .summarizer import LexRankSummarizer
+
+class ModelWarmupWorker(QThread):
+    """Load the offline model into the shared registry and warm it up in the background"""
+    ready = pyqtSignal(str, str, str, bool)  # model_type, dtype, backend, use_server
+    failed = pyqtSignal(str)
+    
+    def __init__(self, model_type="t5-small", dtype="float32", backend="torch", use_server=False):
+        super().__init__()
+        self.model_type = model_type
+        self.dtype = dtype
+        self.backend = backend
+        self.use_server = use_server
+    
+    def run(self):
+        try:
+            # Summaries started meanwhile wait on the registry's load lock
+            # instead of loading a second copy of the model
+            summarizer = LexRankSummarizer(model_type=self.model_type, dtype=self.dtype, backend=self.backend,
+                                           use_server=self.use_server)
+            if not summarizer.warm_up():
+                self.failed.emit("Offline model unavailable - using extractive summaries")
+                return
+            self.ready.emit(self.model_type, self.dtype, self.backend, self.use_server)
+        except Exception as e:
+            self.failed.emit(f"Model warm-up failed: {str(e)}")
+
+class BatchSummaryWorker(QThread):
+    """Worker thread that summarizes several files through the SummaryScheduler"""
+    file_started = pyqtSignal(int)
+    file_finished = pyqtSignal(int, dict)
+    file_error = pyqtSignal(int, str)
+    all_finished = pyqtSignal()
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    progress = pyqtSignal(str)  # For progress updates
+    
+    def __init__(self, file_paths, summary_ratio, model_type="t5-small", is_online=False,
+                 extraction_workers=2, pdf_workers=None, use_cache=True, dtype="float32", backend="torch",
+                 parallel_batches=2, use_server=False, hybrid=False, prefilter=False, pages_per_task=16):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        # Leave half the cores to inference, which runs while pages are parsed
+        pdf_workers = pdf_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.scheduler = SummaryScheduler(
+            summary_ratio, model_type, is_online,
+            extraction_workers=extraction_workers, pdf_workers=pdf_workers, pages_per_task=pages_per_task,
+            use_cache=use_cache,
+            dtype=dtype, backend=backend, parallel_batches=parallel_batches, use_server=use_server,
+            hybrid=hybrid, prefilter=prefilter
+        )
+    
+    def cancel(self):
+        """Ask the scheduler to stop at its next check point; run() then emits cancelled"""
+        self.scheduler.cancel()
+    
+    def run(self):
+        try:
+            self.scheduler.run(
+                self.file_paths,
+                on_progress=self.progress.emit,
+                on_file_started=self.file_started.emit,
+                on_file_finished=self.file_finished.emit,
+                on_file_error=self.file_error.emit
+            )
+            self.all_finished.emit()
+        except CancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            self.error.emit(f"Error processing files: {str(e)}")
+
+class SummaryWorker(BatchSummaryWorker):
+    """Single-file worker kept for older callers; runs through the SummaryScheduler"""
+    finished = pyqtSignal(dict)
+    
+    def __init__(self, file_path, summary_ratio, model_type="t5-small", is_online=False,
+                 extraction_workers=None, pages_per_task=16, use_cache=True, dtype="float32", backend="torch",
+                 parallel_batches=2, use_server=False, hybrid=False, prefilter=False):
+        super().__init__([file_path], summary_ratio, model_type, is_online, pdf_workers=extraction_workers,
+                         use_cache=use_cache, dtype=dtype, backend=backend, parallel_batches=parallel_batches,
+                         use_server=use_server, hybrid=hybrid, prefilter=prefilter, pages_per_task=pages_per_task)
+        self.file_finished.connect(lambda index, result: self.finished.emit(result))
+        self.file_error.connect(lambda index, message: self.error.emit(message))
+
+# PDF Export function - should be added to your main UI class
+def export_to_pdf(self):
+    """Export summary to PDF with proper functionality"""
+    if not hasattr(self, 'all_summaries') or not self.all_summaries:
+        QMessageBox.warning(self, "No Summary", "Please generate a summary first.")
+        return
+
+    # Get save location from user
+    options = QFileDialog.Options()
+    default_name = "AI_Summary.pdf"
+    if hasattr(self, 'selected_files') and self.selected_files:
+        default_name = f"Summary_{self.selected_files[0]['filename'].split('.')}.pdf"
+    
+    file_path, _ = QFileDialog.getSaveFileName(
+        self, "Save Summary as PDF", 
+        default_name, 
+        "PDF Files (*.pdf)", 
+        options=options
+    )
+
+    if file_path:
+        try:
+            # Create printer object
+            printer = QPrinter(QPrinter.HighResolution)
+            printer.setOutputFormat(QPrinter.PdfFormat)
+            printer.setOutputFileName(file_path)
+            printer.setPageSize(QPrinter.A4)
+            
+            # Create document with formatted content
+            doc = QTextDocument()
+            
+            # Get the summary content and format it nicely
+            summary_content = self.summary_text.toPlainText()
+            
+            # Add some basic formatting
+            formatted_content = f"""
+<html>
+<head>
+    <style>
+        body {{ font-family: Georgia, serif; font-size: 12pt; line-height: 1.6; margin: 40px; }}
+        h1 {{ color: #2c3e50; font-size: 18pt; margin-bottom: 20px; }}
+        h2 {{ color: #34495e; font-size: 14pt; margin-top: 25px; margin-bottom: 10px; }}
+        .stats {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }}
+        .stat {{ display: inline-block; margin-right: 30px; font-weight: bold; }}
+    </style>
+</head>
+<body>
+    <h1>AI Document Summary</h1>
+    
+    <div class="stats">
+        <span class="stat">{self.compression_stat.text()}</span>
+        <span class="stat">{self.word_count_stat.text()}</span>
+        <span class="stat">{self.key_topics_stat.text()}</span>
+    </div>
+    
+    <h2>Summary Content</h2>
+    <p>{summary_content.replace(chr(10), '</p><p>')}</p>
+    
+    <hr style="margin-top: 30px;">
+    <p><em>Generated by AI Document Summarizer</em></p>
+</body>
+</html>
+            """
+            
+            doc.setHtml(formatted_content)
+            doc.print_(printer)
+            
+            QMessageBox.information(self, "Success", f"Summary successfully saved as:\n{file_path}")
+            
+        except Exception as e:
+            QMessageBox.critical(self, "PDF Export Error", f"Failed to save PDF:\n{str(e)}")
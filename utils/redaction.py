@@ -0,0 +1,46 @@
+# redaction.py - Mask personal and sensitive data before text leaves the machine
+#
+# Online mode sends document text to a third-party API. Instead of sending
+# only the first 1000 characters, the whole document is sent chunk by chunk
+# with contact details, identifiers and account numbers replaced by
+# placeholders.
+
+import re
+
+# (placeholder, pattern), applied in order; earlier patterns win on overlaps
+REDACTION_PATTERNS = [
+    ("[EMAIL]", re.compile(r'\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b')),
+    ("[URL]", re.compile(r'\b(?:https?://|www\.)[^\s<>"]*[^\s<>".,;:!?)]', re.IGNORECASE)),
+    ("[IBAN]", re.compile(r'\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,4})?\b')),
+    ("[CARD]", re.compile(r'\b\d(?:[ -]?\d){12,18}\b')),
+    ("[SSN]", re.compile(r'\b\d{3}-\d{2}-\d{4}\b')),
+    ("[IP]", re.compile(r'\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b')),
+    ("[PHONE]", re.compile(r'(?<![\w/.,])(?:\+\d{1,3}[ .-]?)?(?:\(\d{1,4}\)[ .-]?)?\d{2,4}(?:[ .-]\d{2,4}){1,4}(?![\w/]|[.,]\d)')),
+]
+
+# Number runs the phone pattern matches that are usually not phone numbers
+_NOT_PHONE = re.compile(r'\d{4}-\d{2,4}(?:-\d{2})?')
+
+
+def redact_text(text):
+    """Return text with sensitive values masked, plus the number masked per placeholder"""
+    counts = {}
+
+    def replace(match, placeholder):
+        if placeholder == "[PHONE]" and not _is_phone(match.group()):
+            return match.group()
+        counts[placeholder] = counts.get(placeholder, 0) + 1
+        return placeholder
+
+    for placeholder, pattern in REDACTION_PATTERNS:
+        text = pattern.sub(lambda match: replace(match, placeholder), text)
+    return text, counts
+
+
+def _is_phone(value):
+    """Tell phone numbers from year ranges, ISO dates and lists of small numbers"""
+    groups = re.findall(r'\d+', value)
+    digits = sum(len(group) for group in groups)
+    if digits < 7 or digits > 15 or max(len(group) for group in groups) < 3:
+        return False
+    return not _NOT_PHONE.fullmatch(value)
@@ -0,0 +1,166 @@
+# resources.py - CPU thread budgeting for offline inference
+#
+# PyTorch and ONNX Runtime each default to one thread per core. With several
+# batches or jobs generating at once, every one of them would spin up that
+# many threads and the cores end up oversubscribed. The resource manager
+# hands each running job an equal share of a thread budget instead, and
+# splits a job's share between its concurrently generated batches. Shares
+# are rebalanced whenever a job starts or ends, so they always add up to
+# the budget rather than to what it was when each job began.
+
+import os
+import threading
+from contextlib import contextmanager
+
+
+def cpu_count():
+    """Number of cores this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+class ThreadPlan:
+    """Thread counts for one job, updated by the resource manager while it runs"""
+
+    def __init__(self, intra_op, inter_op, parallel_batches, requested=None):
+        self.intra_op = intra_op  # Threads per generation stream
+        self.inter_op = inter_op
+        self.parallel_batches = parallel_batches  # Concurrent generation streams
+        self.requested = requested or parallel_batches  # Streams the job would like
+        self._running = 0
+        self._changed = threading.Condition()
+
+    @contextmanager
+    def stream(self):
+        """Run one generation stream and yield its current intra-op thread count.
+
+        Waits while the job already runs as many streams as its share allows,
+        so a job whose share shrank stops starting new streams.
+        """
+        with self._changed:
+            while self._running >= self.parallel_batches:
+                self._changed.wait()
+            self._running += 1
+            intra_op = self.intra_op
+        try:
+            yield intra_op
+        finally:
+            with self._changed:
+                self._running -= 1
+                self._changed.notify_all()
+
+    def _update(self, intra_op, parallel_batches):
+        with self._changed:
+            self.intra_op = intra_op
+            self.parallel_batches = parallel_batches
+            self._changed.notify_all()
+
+    def __repr__(self):
+        return (f"ThreadPlan(intra_op={self.intra_op}, inter_op={self.inter_op}, "
+                f"parallel_batches={self.parallel_batches})")
+
+
+class ResourceManager:
+    """Partition a CPU thread budget across concurrently running jobs.
+
+    ``total_threads`` of 0 means one thread per available core. The budget
+    is divided evenly between the running jobs and re-divided whenever one
+    starts or ends, updating the plans of jobs already running; each job
+    reads its share per batch through ``ThreadPlan.stream()``. Every job
+    gets at least one thread, so only more jobs than threads exceed it.
+    """
+
+    def __init__(self, total_threads=0, inter_op_threads=1):
+        self.total_threads = total_threads
+        self.inter_op_threads = inter_op_threads
+        self._plans = []  # Plans of the running jobs, in start order
+        self._torch_configured = False
+        self._lock = threading.Lock()
+
+    def configure(self, total_threads=None, inter_op_threads=None):
+        """Change the thread budget; running jobs pick up their new share from their next batch"""
+        with self._lock:
+            if total_threads is not None:
+                self.total_threads = max(0, total_threads)
+            if inter_op_threads is not None:
+                self.inter_op_threads = max(1, inter_op_threads)
+            self._rebalance_locked()
+
+    def budget(self):
+        """Total threads to hand out"""
+        return self.total_threads or cpu_count()
+
+    def plan(self, parallel_batches=1, concurrent_jobs=None):
+        """Thread plan for one job among concurrent_jobs (default: the running ones)"""
+        with self._lock:
+            jobs = concurrent_jobs or max(1, len(self._plans))
+            share = max(1, self.budget() // jobs)
+        intra_op, streams = self._split(share, parallel_batches)
+        return ThreadPlan(intra_op, self.inter_op_threads, streams)
+
+    @contextmanager
+    def job(self, parallel_batches=1):
+        """Register a running job and yield its thread plan, kept up to date until the job ends"""
+        plan = ThreadPlan(1, self.inter_op_threads, 1, requested=max(1, parallel_batches))
+        with self._lock:
+            self._plans.append(plan)
+            self._rebalance_locked()
+        try:
+            yield plan
+        finally:
+            with self._lock:
+                self._plans.remove(plan)
+                self._rebalance_locked()
+
+    def active_jobs(self):
+        with self._lock:
+            return len(self._plans)
+
+    @staticmethod
+    def _split(share, parallel_batches):
+        # More streams than threads would only time-slice the same cores
+        streams = max(1, min(parallel_batches, share))
+        return max(1, share // streams), streams
+
+    def _rebalance_locked(self):
+        if not self._plans:
+            return
+        budget = self.budget()
+        base, extra = divmod(budget, len(self._plans))
+        for index, plan in enumerate(self._plans):
+            # Earlier jobs take the remainder, so the shares add up to the budget
+            share = max(1, base + (1 if index < extra else 0))
+            plan.inter_op = self.inter_op_threads
+            plan._update(*self._split(share, plan.requested))
+
+    def configure_torch(self):
+        """Set PyTorch's process-wide thread pools, once, before the first model loads"""
+        import torch
+
+        with self._lock:
+            if self._torch_configured:
+                return
+            self._torch_configured = True
+            inter_op = self.inter_op_threads
+            intra_op = self.budget()
+        torch.set_num_threads(intra_op)
+        try:
+            # Only allowed before any inter-op parallel work has started
+            torch.set_num_interop_threads(inter_op)
+        except RuntimeError:
+            pass
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_resource_manager():
+    """Return the shared process-wide resource manager"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ResourceManager()
+        return _manager
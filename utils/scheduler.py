@@ -0,0 +1,254 @@
+# scheduler.py - Pipelined multi-file summarization
+#
+# Files move through two stages: a bounded pool of extraction threads reads
+# pages ahead, while the inference stage summarizes files in order with one
+# shared model. Extraction of the next files therefore overlaps with
+# inference on the current one. With inference_workers > 1, that many files
+# are summarized at once; they share the model, and the resource manager
+# splits the thread budget between them.
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cancellation import CancellationToken, CancelledError
+from .extraction import iter_file_pages
+from .summary_cache import get_summary_cache, hash_file, summary_cache_key
+
+_DONE = object()
+
+
+class _Cached:
+    """Feed item: the file's summary was found in the cache"""
+    def __init__(self, result):
+        self.result = result
+
+
+class _Failed:
+    """Feed item: extraction raised"""
+    def __init__(self, error):
+        self.error = error
+
+
+class _FileFeed:
+    """Bounded page queue between a file's extractor and the inference stage"""
+
+    def __init__(self, max_pages):
+        self.queue = queue.Queue(maxsize=max_pages)
+        self.abandoned = threading.Event()
+        self.cache_key = None
+
+    def put(self, item):
+        """Block until there is room, unless the consumer gave up on this file"""
+        while not self.abandoned.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self):
+        return self.queue.get()
+
+    def iter_pages(self, first):
+        """Yield pages starting with an already-received first item"""
+        item = first
+        while item is not _DONE:
+            if isinstance(item, _Failed):
+                raise item.error
+            yield item
+            item = self.queue.get()
+
+    def abandon(self):
+        self.abandoned.set()
+
+
+class SummaryScheduler:
+    """Summarize many files with pipelined extraction and shared inference.
+
+    Results are returned, and reported through ``on_file_finished``, with
+    the index of the file in the input list, so callers can keep file order
+    even though extraction runs ahead and out of order. With several
+    ``inference_workers`` the callbacks are also made from worker threads.
+    """
+
+    def __init__(self, summary_ratio, model_type="t5-small", is_online=False, extraction_workers=2,
+                 pdf_workers=1, pages_per_task=16, max_buffered_pages=64, use_cache=True, summarizer=None,
+                 dtype="float32", backend="torch", parallel_batches=2, use_server=False, cancel_token=None,
+                 redact=True, hybrid=False, prefilter=False, inference_workers=1):
+        self.summary_ratio = summary_ratio
+        self.model_type = model_type
+        self.dtype = dtype
+        self.backend = backend
+        self.parallel_batches = parallel_batches
+        self.use_server = use_server
+        self.is_online = is_online
+        self.redact = redact
+        self.hybrid = hybrid and not is_online
+        self.prefilter = prefilter
+        self.extraction_workers = max(1, extraction_workers)
+        self.inference_workers = max(1, inference_workers)
+        self.pdf_workers = pdf_workers
+        self.pages_per_task = pages_per_task
+        self.max_buffered_pages = max_buffered_pages
+        # Hybrid summaries depend on which backend took each chunk, so only its chunk cache is used
+        self.use_cache = use_cache and not is_online and not self.hybrid
+        self.summarizer = summarizer
+        self._summarizer_lock = threading.Lock()
+        self.cancel_token = cancel_token or CancellationToken()
+        if summarizer is not None:
+            summarizer.cancel_token = self.cancel_token
+
+    def cancel(self):
+        """Stop extraction and inference at their next check point; run() then raises CancelledError"""
+        self.cancel_token.cancel()
+
+    def run(self, file_paths, on_progress=None, on_file_started=None, on_file_finished=None,
+            on_file_error=None):
+        """Summarize file_paths; returns results in input order (None for failures)"""
+        total = len(file_paths)
+        results = [None] * total
+        feeds = [_FileFeed(self.max_buffered_pages) for _ in file_paths]
+        # Inference workers take the next file in input order
+        indices = iter(range(total))
+        indices_lock = threading.Lock()
+        errors = []
+
+        def consume():
+            while True:
+                with indices_lock:
+                    index = next(indices, None)
+                if index is None:
+                    return
+                self.cancel_token.raise_if_cancelled()
+                path, feed = file_paths[index], feeds[index]
+                filename = os.path.basename(path)
+                if on_file_started:
+                    on_file_started(index)
+
+                def report(message, filename=filename, index=index):
+                    if on_progress:
+                        on_progress(f"[{index + 1}/{total}] {filename}: {message}")
+
+                try:
+                    results[index] = self._summarize(feed, filename, report)
+                except CancelledError:
+                    raise
+                except Exception as e:
+                    feed.abandon()
+                    if on_file_error:
+                        on_file_error(index, f"Error processing {filename}: {str(e)}")
+                else:
+                    if on_file_finished:
+                        on_file_finished(index, results[index])
+
+        def consume_in_thread():
+            try:
+                consume()
+            except BaseException as e:
+                errors.append(e)
+                self.cancel_token.cancel()
+
+        with ThreadPoolExecutor(max_workers=self.extraction_workers) as pool:
+            # The pool runs tasks in submission order, so file i is always
+            # being extracted before any later file can block the pool
+            for path, feed in zip(file_paths, feeds):
+                pool.submit(self._extract, path, feed)
+
+            # The calling thread is one of the workers, so Ctrl+C still reaches inference
+            workers = [threading.Thread(target=consume_in_thread, name="InferenceWorker", daemon=True)
+                       for _ in range(min(self.inference_workers, total) - 1)]
+            try:
+                for worker in workers:
+                    worker.start()
+                consume()
+            except BaseException as e:
+                # E.g. Ctrl+C: extraction threads stop at their next page instead of reading on
+                self.cancel_token.cancel()
+                errors.append(e)
+            finally:
+                for worker in workers:
+                    worker.join()
+                for feed in feeds:
+                    feed.abandon()
+
+        if errors:
+            # Another worker's cancellation is only the consequence of the first real error
+            raise next((e for e in errors if not isinstance(e, CancelledError)), errors[0])
+        return results
+
+    def _extract(self, path, feed):
+        """Extraction stage: serve cache hits, otherwise stream pages into the feed"""
+        try:
+            if self.use_cache:
+                feed.cache_key = summary_cache_key(hash_file(path), self.summary_ratio,
+                                                   os.path.basename(path), self.model_type, self.dtype,
+                                                   backend=self.backend, prefilter=self.prefilter)
+                cached = get_summary_cache().get(feed.cache_key)
+                if cached:
+                    feed.put(_Cached(cached))
+                    return
+
+            for page in iter_file_pages(path, self.pdf_workers, self.pages_per_task,
+                                        cancel_token=self.cancel_token):
+                if not feed.put(page):
+                    return
+            feed.put(_DONE)
+        except Exception as e:
+            # Also wakes the inference stage when extraction stops on a cancel
+            feed.put(_Failed(e))
+
+    def _summarize(self, feed, filename, report):
+        """Inference stage for one file"""
+        report("📖 Waiting for text...")
+        first = feed.get()
+        if isinstance(first, _Cached):
+            report("⚡ Loaded cached summary")
+            return first.result
+        if isinstance(first, _Failed):
+            raise first.error
+
+        summarizer = self._get_summarizer(report)
+        has_text = []
+
+        def pages():
+            for page in feed.iter_pages(first):
+                if not has_text and page.strip():
+                    has_text.append(True)
+                yield page
+
+        report("📝 Generating summary...")
+        result = summarizer.summarize_stream(pages(), self.summary_ratio, filename, progress_callback=report)
+
+        if not has_text:
+            raise ValueError("The selected file appears to be empty or unreadable.")
+
+        if feed.cache_key and summarizer._is_cacheable():
+            summarizer.cache.put(feed.cache_key, result)
+        return result
+
+    def _get_summarizer(self, report):
+        """Create the shared summarizer on first use, so all-cached runs never load a model"""
+        with self._summarizer_lock:
+            return self._create_summarizer(report)
+
+    def _create_summarizer(self, report):
+        if self.summarizer is None:
+            from .summarizer import HybridSummarizer, LexRankSummarizer, OnlineTransformersSummarizer
+            report("🤖 Initializing AI model...")
+            if self.is_online:
+                self.summarizer = OnlineTransformersSummarizer(cancel_token=self.cancel_token, redact=self.redact,
+                                                               prefilter=self.prefilter)
+            elif self.hybrid:
+                self.summarizer = HybridSummarizer(model_type=self.model_type, dtype=self.dtype,
+                                                   backend=self.backend, parallel_batches=self.parallel_batches,
+                                                   use_server=self.use_server, cancel_token=self.cancel_token,
+                                                   redact=self.redact, prefilter=self.prefilter)
+            else:
+                self.summarizer = LexRankSummarizer(model_type=self.model_type, dtype=self.dtype,
+                                                    backend=self.backend, parallel_batches=self.parallel_batches,
+                                                    use_server=self.use_server, cancel_token=self.cancel_token,
+                                                    prefilter=self.prefilter)
+        return self.summarizer
@@ -1,14 +1,25 @@
 import re
-from collections import Counter
-import numpy as np
-import torch
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import importlib.util
 import warnings
-from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtPrintSupport import QPrinter
-from PyQt5.QtGui import QTextDocument
-from PyQt5.QtWidgets import QMessageBox, QFileDialog
 import os
 import sys
+import time
+
+from .cancellation import CancelledError, raise_if_cancelled
+from .chunker import Chunk, TextChunker, TokenChunker
+from .hybrid import OFFLINE, ONLINE, get_hybrid_router
+from .extractive import (EXTRACTIVE_MODEL, PREFILTER_MIN_SENTENCES, extract_summary, prefilter_keep_ratio,
+                         select_indices)
+from .document import Document
+from .extraction import extract_text_from_file, extract_text_from_pdf, iter_file_pages, iter_pdf_pages
+from .normalization import normalize_page, normalize_section, normalize_summary
+from .model_registry import get_model_registry
+from .online_client import get_online_client
+from .redaction import redact_text
+from .resources import get_resource_manager
+from .summary_cache import backend_key_settings, get_chunk_cache, get_summary_cache, hash_text, summary_cache_key
 
 # Suppress transformer warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="transformers")
@@ -16,43 +27,81 @@ warnings.filterwarnings("ignore", category=UserWarning, module="transformers")
 # Set your READ-only token (replace with your actual token)
 os.environ['HUGGINGFACEHUB_API_TOKEN'] = "  "    '''<----your api key here'''
 
-# Robust transformers import with fallback
-try:
-    from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-    print("✅ Transformers library loaded successfully")
-except Exception as e:
-    print(f"⚠️ Transformers import failed: {e}")
-    TRANSFORMERS_AVAILABLE = False
-    pipeline = None
+# Chunk generation lengths are rounded up to this step so chunks can share batches
+LENGTH_BUCKET = 8
+
+# Estimated tokens per online request; the hosted BART model accepts 1024
+ONLINE_MAX_TOKENS = 900
+
+# Input for the dummy generation that warms up a freshly loaded model
+WARMUP_TEXT = "The model runs one short generation before the first document arrives."
+
+KEY_PHRASE_STOP_WORDS = {
+    'the', 'this', 'that', 'these', 'those', 'and', 'but', 'or', 'for', 'nor', 
+    'on', 'at', 'to', 'from', 'up', 'by', 'with', 'without', 'through', 'over', 
+    'under', 'above', 'below', 'example', 'method', 'system', 'information'
+}
+
+# torch and transformers are only imported when an offline model is first
+# loaded, so the GUI, the CLI and online mode start without paying for them
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+if not TRANSFORMERS_AVAILABLE:
+    print("⚠️ Transformers library not installed")
 
 class AIDocumentSummarizer:
-    def __init__(self, model_type="t5-small", is_online=False):
+    def __init__(self, model_type="t5-small", is_online=False, batch_size=8, max_batch_tokens=4096,
+                 chunk_overlap=0, parallel_batches=2, max_reduce_levels=8, use_cache=True, dtype="float32",
+                 backend="torch", use_server=False, cancel_token=None, redact=True,
+                 online_max_tokens=ONLINE_MAX_TOKENS, hybrid=False, prefilter=False):
         """Initialize with offline/online AI model"""
         self.model_type = model_type
         self.is_online = is_online
-        self.summarizer = None
-        
-        if TRANSFORMERS_AVAILABLE and not is_online:
+        self.hybrid = hybrid and not is_online  # Route chunks between the offline model and the online API
+        self.extractive_only = model_type == EXTRACTIVE_MODEL and not is_online  # LexRank, no model
+        self.device = -1  # CPU usage
+        self.dtype = dtype  # "float32", or "qint8" for dynamic int8 quantization
+        self.backend = backend  # Inference engine, see backends.BACKEND_NAMES
+        self.use_server = use_server  # Generate in the shared inference server process
+        self.cancel_token = cancel_token  # Checked between pages, batches and decode steps
+        self.redact = redact  # Mask personal data before text is sent online
+        self.prefilter = prefilter  # Send only the most salient sentences to the model
+        self.batch_size = batch_size  # Max chunks per forward pass
+        self.max_batch_tokens = max_batch_tokens  # Padded tokens per forward pass
+        self.chunk_overlap = chunk_overlap  # Tokens shared between neighbouring chunks
+        self.parallel_batches = parallel_batches  # Batches generated concurrently, within the thread budget
+        self.max_reduce_levels = max_reduce_levels  # Depth limit of the reduce tree
+        self.cache = get_summary_cache() if use_cache else None
+        self.chunk_cache = get_chunk_cache() if use_cache else None
+        self.summarizer = None  # InferenceBackend of the offline model
+        self.chunker = None
+        
+        if self.extractive_only:
+            self.hybrid = False
+            print("⚡ Extractive mode selected - LexRank sentence ranking, no AI model")
+        elif TRANSFORMERS_AVAILABLE and not is_online:
             self._load_offline_model()
+            if self.hybrid and self.chunker is None:
+                print("⚠️ Offline model unavailable - hybrid mode will use the online API only")
+                self.chunker = TextChunker(online_max_tokens, overlap_tokens=chunk_overlap)
         elif is_online:
+            # No local tokenizer for the hosted model, so chunks are sized by estimated tokens
+            self.chunker = TextChunker(online_max_tokens, overlap_tokens=chunk_overlap)
             print("🌐 Online mode selected - will use HuggingFace API")
         else:
             print("⚠️ Running in extractive-only mode")
     
     def _load_offline_model(self):
-        """Load the offline T5-Small model only"""
+        """Load the offline T5 model from the shared model registry"""
+        if self.use_server and self._connect_server():
+            return
         try:
-            print("Loading T5-Small model for offline summarization...")
+            registry = get_model_registry()
+            if not registry.is_loaded(self.model_type, self.device, self.dtype, self.backend):
+                print("Loading T5-Small model for offline summarization...")
             
-            self.summarizer = pipeline(
-                "summarization",
-                model="t5-small",
-                tokenizer="t5-small",
-                framework="pt",
-                device=-1,  # CPU usage
-                clean_up_tokenization_spaces=True
-            )
+            # Reuses the already-loaded model across files and workers
+            self.summarizer = registry.get(self.model_type, self.device, self.dtype, backend=self.backend)
+            self.chunker = TokenChunker(self.summarizer.tokenizer, overlap_tokens=self.chunk_overlap)
             
             print("✅ T5-Small model loaded successfully!")
             
@@ -60,76 +109,42 @@ class AIDocumentSummarizer:
             print(f"❌ Error loading T5 model: {e}")
             print("Falling back to extractive summarization...")
             self.summarizer = None
+            self.chunker = None
     
-    def _online_summarize(self, text, summary_ratio):
-        """Use HuggingFace online API for summarization"""
+    def _connect_server(self):
+        """Use the model of the shared inference server, starting it if needed"""
         try:
-            import requests
-            
-            # HuggingFace Inference API endpoint
-            API_URL = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
-            
-            headers = {
-                "Authorization": f"Bearer {os.environ.get('HUGGINGFACEHUB_API_TOKEN')}",
-                "Content-Type": "application/json"
-            }
+            from .inference_server import connect_backend
             
-            # Privacy protection: limit text size
-            safe_text = text[:1000]  # Truncate for privacy
-            
-            # Calculate target length
-            input_words = len(safe_text.split())
-            max_length = max(50, min(500, int(input_words * summary_ratio * 2)))
-            min_length = max(20, int(max_length * 0.3))
-            
-            payload = {
-                "inputs": safe_text,
-                "parameters": {
-                    "max_length": max_length,
-                    "min_length": min_length,
-                    "do_sample": False
-                },
-                "options": {
-                    "wait_for_model": True,
-                    "use_cache": False  # Privacy: don't cache
-                }
-            }
-            
-            response = requests.post(API_URL, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result[0]['summary_text']
-            else:
-                print(f"⚠️ Online API failed: {response.status_code}")
-                return self.fallback_extractive_summary(text, summary_ratio)
-                
+            self.summarizer = connect_backend(self.model_type, self.dtype, self.backend)
+            self.chunker = TokenChunker(self.summarizer.tokenizer, overlap_tokens=self.chunk_overlap)
+            print("✅ Connected to the inference server")
+            return True
         except Exception as e:
-            print(f"⚠️ Online summarization failed: {e}")
-            return self.fallback_extractive_summary(text, summary_ratio)
+            print(f"⚠️ Inference server unavailable, loading the model in this process: {e}")
+            self.summarizer = None
+            self.chunker = None
+            return False
+    
+    def warm_up(self):
+        """Run one tiny generation so one-time kernel setup happens before real work"""
+        if self.summarizer is None or self.chunker is None:
+            return False
+        chunk = self.chunker.chunk_from_text(WARMUP_TEXT)
+        self._generate_ids([chunk.input_ids], max_length=16, min_length=1)
+        return True
     
     def clean_extracted_text(self, text):
         """Clean and preprocess text"""
-        # Fix PDF extraction issues
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
-        text = re.sub(r'([a-zA-Z])(\d)', r'\1 \2', text)
-        text = re.sub(r'(\d)([a-zA-Z])', r'\1 \2', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove excessive whitespace and clean formatting
-        lines = text.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            line = line.strip()
-            if len(line) > 20:  # Filter out short fragments
-                cleaned_lines.append(line)
-        
-        return ' '.join(cleaned_lines)
+        # Fix PDF extraction issues and drop short fragment lines in one pass
+        return normalize_page(text)
     
     def chunk_text(self, text, max_chunk_length=800):
         """Split text into manageable chunks for AI processing"""
-        sentences = re.split(r'[.!?]+', text)
-        chunks = []
+        return list(self._iter_char_chunks(Document(text).sentences(), max_chunk_length))
+    
+    def _iter_char_chunks(self, sentences, max_chunk_length=800):
+        """Pack an iterable of sentences into character-bounded chunks"""
         current_chunk = ""
         
         for sentence in sentences:
@@ -140,113 +155,355 @@ class AIDocumentSummarizer:
             # Check if adding this sentence would exceed the limit
             if len(current_chunk) + len(sentence) > max_chunk_length:
                 if current_chunk:
-                    chunks.append(current_chunk.strip())
+                    yield current_chunk.strip()
                     current_chunk = sentence
                 else:
                     # Single sentence is too long, split it
-                    chunks.append(sentence[:max_chunk_length])
+                    yield sentence[:max_chunk_length]
             else:
                 current_chunk += " " + sentence
         
         if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-            
-        return chunks
+            yield current_chunk.strip()
+
+    def _generation_lengths(self, input_words, summary_ratio):
+        """Calculate max/min summary lengths for an input of the given size"""
+        # ✅ IMPROVED: Dynamic token calculation based on actual input length
+        if summary_ratio <= 0.3:  # Low detail (20%)
+            target_ratio = 0.3
+        elif summary_ratio <= 0.6:  # Medium detail (40%) 
+            target_ratio = 0.5
+        else:  # High detail (70%)
+            target_ratio = 0.7
+        
+        # Calculate max tokens based on input length and desired ratio
+        max_new_tokens = max(20, min(int(input_words * target_ratio), input_words - 10))
+        
+        # Ensure we don't exceed input length (fix the warnings)
+        max_length = min(max_new_tokens, int(input_words * 0.8))
+        min_length = max(10, int(max_length * 0.3))
+        
+        return max_length, min_length, target_ratio
 
     def ai_summarize_chunk(self, text_chunk, summary_ratio=0.3):
         """Summarize a single chunk using AI model with optimized token handling"""
-        # Use online API if online mode
-        if self.is_online:
-            return self._online_summarize(text_chunk, summary_ratio)
+        if self.is_online or self.hybrid:
+            return self.summarize_chunks([text_chunk], summary_ratio)[0]
         
         # Use offline model if available
         if not self.summarizer:
             return self.fallback_extractive_summary(text_chunk, summary_ratio)
-            
+        
+        return self._summarize_batch([self._as_chunk(text_chunk)], summary_ratio)[0]
+    
+    def summarize_chunks(self, chunks, summary_ratio=0.3):
+        """Summarize many chunks, batching them through the offline model.
+
+        Chunks summarized before with the same text and generation settings
+        are served from the chunk cache; only new or changed chunks are
+        sent to the model.
+        """
+        if self.is_online or (self.hybrid and not self.summarizer):
+            return self._summarize_online([self._as_chunk(chunk) for chunk in chunks], summary_ratio)
+        if not self.summarizer:
+            return [self.ai_summarize_chunk(getattr(chunk, 'text', chunk), summary_ratio) for chunk in chunks]
+        
+        chunks = [self._as_chunk(chunk) for chunk in chunks]
+        lengths = [self._chunk_lengths(chunk, summary_ratio) for chunk in chunks]
+        summaries, keys, pending = self._lookup_chunk_cache(chunks, summary_ratio, lengths)
+        if self.hybrid:
+            self._summarize_hybrid(chunks, summary_ratio, lengths, summaries, keys, pending)
+            return summaries
+        
+        batches = self._make_batches(pending, chunks, lengths)
+        if not batches:
+            return summaries
+        
+        def run_batch(i, batch, plan):
+            # The share is read per batch, since other jobs starting or ending rebalance it
+            with plan.stream() as intra_op:
+                raise_if_cancelled(self.cancel_token)
+                print(f"AI processing batch {i+1}/{len(batches)} ({len(batch)} chunks)...")
+                self.summarizer.apply_threads(intra_op)
+                results = self._generate_batch([chunks[idx] for idx in batch], summary_ratio, lengths[batch[0]])
+            self._store_batch(batch, results, summaries, keys)
+        
+        # Concurrent streams split this job's share of the cores instead of each using all of them
+        with get_resource_manager().job(min(self.parallel_batches, len(batches))) as plan:
+            if plan.requested > 1:
+                with ThreadPoolExecutor(max_workers=plan.requested) as executor:
+                    futures = [executor.submit(run_batch, i, batch, plan) for i, batch in enumerate(batches)]
+                    for future in futures:
+                        future.result()
+            else:
+                for i, batch in enumerate(batches):
+                    run_batch(i, batch, plan)
+        
+        return summaries
+    
+    def _lookup_chunk_cache(self, chunks, summary_ratio, lengths):
+        """Fill in cached chunk summaries; returns summaries, cache keys and the indices still to do"""
+        summaries = [None] * len(chunks)
+        keys = [None] * len(chunks)
+        
+        pending = []
+        for idx, chunk in enumerate(chunks):
+            if self.chunk_cache is not None:
+                keys[idx] = self._chunk_cache_key(chunk, summary_ratio, lengths[idx])
+                cached = self.chunk_cache.get(keys[idx])
+                if cached:
+                    summaries[idx] = cached['summary']
+                    continue
+            pending.append(idx)
+        
+        if len(pending) < len(chunks):
+            print(f"♻️ Reused {len(chunks) - len(pending)}/{len(chunks)} cached chunk summaries")
+        return summaries, keys, pending
+    
+    def _store_batch(self, batch, results, summaries, keys):
+        """Record the offline model's results for a batch of chunk indices"""
+        for idx, (summary, generated) in zip(batch, results):
+            summaries[idx] = summary
+            # Fallback output is not memoized, so the model gets another try next run
+            if generated and keys[idx]:
+                self.chunk_cache.put(keys[idx], {'summary': summary})
+    
+    def _summarize_hybrid(self, chunks, summary_ratio, lengths, summaries, keys, pending):
+        """Spread pending chunks over the offline model and the online API.
+
+        Each chunk goes to the backend the router expects to finish it
+        first. A chunk whose online request fails is queued for the offline
+        model; chunks already summarized are kept, never redone. Only
+        offline results are written to the chunk cache.
+        """
+        if not pending:
+            return
+        router = get_hybrid_router()
+        client = get_online_client()
+        router.configure(online_slots=client.max_concurrency)
+        queue = deque(pending)
+        local_only = deque()  # Chunks whose online request failed
+        running = {}  # future -> (backend, chunk indices)
+        masked = Counter()
+        
+        def run_local(batch, plan):
+            with plan.stream() as intra_op:
+                self.summarizer.apply_threads(intra_op)
+                started = time.perf_counter()
+                results = self._generate_batch([chunks[idx] for idx in batch], summary_ratio, lengths[batch[0]])
+            return results, time.perf_counter() - started
+        
+        def run_online(item):
+            started = time.perf_counter()
+            try:
+                # No retry loop here: a busy API is routed around instead of waited for
+                return client.summarize(*item, cancel_token=self.cancel_token, max_retries=0,
+                                        timeout=router.online_timeout), time.perf_counter() - started
+            except CancelledError:
+                raise
+            except Exception as e:
+                return e, time.perf_counter() - started
+        
+        with get_resource_manager().job(1) as plan, \
+                ThreadPoolExecutor(max_workers=client.max_concurrency + 1) as executor:
+            try:
+                while queue or local_only or running:
+                    raise_if_cancelled(self.cancel_token)
+                    busy = {backend for backend, _ in running.values()}
+                    while queue or local_only:
+                        online_running = sum(1 for backend, _ in running.values() if backend == ONLINE)
+                        if local_only:
+                            backend = OFFLINE if OFFLINE not in busy else None
+                        else:
+                            backend = router.choose(offline_free=OFFLINE not in busy,
+                                                    online_free=online_running < client.max_concurrency)
+                        if backend is None:
+                            break
+                        if backend == OFFLINE:
+                            source = local_only or queue
+                            batch = self._make_batches(list(source), chunks, lengths)[0]
+                            for idx in batch:
+                                source.remove(idx)
+                            future = executor.submit(run_local, batch, plan)
+                            busy.add(OFFLINE)
+                        else:
+                            idx = queue.popleft()
+                            batch = [idx]
+                            future = executor.submit(run_online, self._online_request(chunks[idx], summary_ratio,
+                                                                                      masked))
+                        router.started(backend, len(batch))
+                        running[future] = (backend, batch)
+                    
+                    done, _ = wait(list(running), timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        backend, batch = running.pop(future)
+                        result, seconds = future.result()
+                        if backend == OFFLINE:
+                            router.finished(OFFLINE, seconds, len(batch))
+                            self._store_batch(batch, result, summaries, keys)
+                        elif isinstance(result, Exception):
+                            print(f"⚠️ Online API failed ({result}), summarizing the chunk locally")
+                            router.failed(ONLINE, seconds)
+                            local_only.extend(batch)
+                        else:
+                            router.finished(ONLINE, seconds)
+                            summaries[batch[0]] = result
+            except BaseException:
+                # Stop in-flight requests and generations at their next check point
+                if self.cancel_token is not None:
+                    self.cancel_token.cancel()
+                raise
+        
+        if masked:
+            print(f"🔒 Masked before sending: {self._format_masked(masked)}")
+        stats = router.stats()
+        print(f"🔀 Hybrid routing: {stats[OFFLINE]['chunks']} chunks offline, "
+              f"{stats[ONLINE]['chunks']} online so far")
+    
+    def _online_request(self, chunk, summary_ratio, masked):
+        """(text, max_length, min_length) to send online for a chunk, with personal data masked"""
+        text = chunk.text
+        if self.redact:
+            text, counts = redact_text(text)
+            masked.update(counts)
+        input_words = len(text.split())
+        max_length = max(50, min(500, int(input_words * summary_ratio * 2)))
+        min_length = max(20, int(max_length * 0.3))
+        return text, max_length, min_length
+    
+    def _summarize_online(self, chunks, summary_ratio):
+        """Send chunks to the online API concurrently, masking personal data first.
+
+        Online summaries are never written to the chunk cache, so no
+        document text from this mode is kept on disk.
+        """
+        masked = Counter()
+        items = [self._online_request(chunk, summary_ratio, masked) for chunk in chunks]
+        if masked:
+            print(f"🔒 Masked before sending: {self._format_masked(masked)}")
+        
+        print(f"🌐 Sending {len(items)} chunk(s) to the online API...")
+        results = get_online_client().summarize_many(items, self.cancel_token)
+        
+        summaries = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                # The extractive fallback runs locally, on the unmasked chunk text
+                print(f"⚠️ Online API failed: {result}")
+                result = self.fallback_extractive_summary(chunk.text, summary_ratio)
+            summaries.append(result)
+        return summaries
+    
+    def _format_masked(self, masked):
+        return ", ".join(f"{count} {name}" for name, count in sorted(masked.items()))
+    
+    def _as_chunk(self, chunk):
+        """Accept either a chunk from the chunker or plain text trimmed to its window"""
+        if isinstance(chunk, Chunk):
+            return chunk
+        return self.chunker.chunk_from_text(chunk)
+    
+    def _chunk_lengths(self, chunk, summary_ratio):
+        """Generation lengths for one chunk, bucketed so similar chunks can share a batch"""
+        max_length, _, _ = self._generation_lengths(len(chunk.text.split()), summary_ratio)
+        max_length = -(-max_length // LENGTH_BUCKET) * LENGTH_BUCKET
+        min_length = max(10, int(max_length * 0.3))
+        return max_length, min_length
+    
+    def _chunk_cache_key(self, chunk, summary_ratio, lengths):
+        """Chunk memo key: chunk text plus everything that shapes its generation"""
+        max_length, min_length = lengths
+        return self.chunk_cache.make_key(
+            hash_text(chunk.text), self.model_type, summary_ratio, mode='chunk',
+            dtype=self.dtype, max_length=max_length, min_length=min_length,
+            **backend_key_settings(self.backend)
+        )
+    
+    def _make_batches(self, indices, chunks, lengths):
+        """Group chunk indices into length-sorted batches within the token budget"""
+        # Chunks in a batch share generation lengths; similar sizes keep padding low
+        order = sorted(indices, key=lambda idx: (lengths[idx], len(chunks[idx])), reverse=True)
+        
+        batches = []
+        current = []
+        for idx in order:
+            # Padded cost of a batch is its size times its longest member
+            longest = len(chunks[current[0]]) if current else len(chunks[idx])
+            if current and (len(current) >= self.batch_size or
+                            lengths[current[0]] != lengths[idx] or
+                            (len(current) + 1) * longest > self.max_batch_tokens):
+                batches.append(current)
+                current = []
+            current.append(idx)
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    def _summarize_batch(self, batch_chunks, summary_ratio, lengths=None):
+        """Run one batch through the model, falling back per chunk on failure"""
+        return [summary for summary, _ in self._generate_batch(batch_chunks, summary_ratio, lengths)]
+    
+    def _generate_batch(self, batch_chunks, summary_ratio, lengths=None):
+        """Summarize a batch, returning (summary, generated_by_model) pairs"""
+        max_length, min_length = lengths or self._chunk_lengths(batch_chunks[0], summary_ratio)
+        
+        print(f"📊 Batch of {len(batch_chunks)} → Target: {max_length} tokens")
+        
         try:
-            # Calculate optimal token lengths based on input
-            input_words = len(text_chunk.split())
-            
-            # ✅ IMPROVED: Dynamic token calculation based on actual input length
-            if summary_ratio <= 0.3:  # Low detail (20%)
-                target_ratio = 0.3
-            elif summary_ratio <= 0.6:  # Medium detail (40%) 
-                target_ratio = 0.5
-            else:  # High detail (70%)
-                target_ratio = 0.7
-            
-            # Calculate max tokens based on input length and desired ratio
-            max_new_tokens = max(20, min(int(input_words * target_ratio), input_words - 10))
-            
-            # Ensure we don't exceed input length (fix the warnings)
-            max_length = min(max_new_tokens, int(input_words * 0.8))
-            min_length = max(10, int(max_length * 0.3))
-            
-            print(f"📊 Input: {input_words} words → Target: {max_length} tokens (ratio: {target_ratio})")
-            
-            # T5 requires "summarize:" prefix
-            input_text = f"summarize: {text_chunk}"
-            
-            # ✅ FIXED: Use max_length and min_length instead of max_new_tokens
-            summary = self.summarizer(
-                input_text,
-                max_length=max_length,
-                min_length=min_length,
-                do_sample=False,
-                truncation=True,
-                clean_up_tokenization_spaces=True
-            )
-            
-            return summary[0]['summary_text']
-            
+            outputs = self._generate_ids([chunk.input_ids for chunk in batch_chunks], max_length, min_length)
+        except CancelledError:
+            raise
         except Exception as e:
-            print(f"❌ AI summarization failed for chunk: {e}")
-            return self.fallback_extractive_summary(text_chunk, summary_ratio)
+            if len(batch_chunks) == 1:
+                print(f"❌ AI summarization failed for chunk: {e}")
+                return [(self.fallback_extractive_summary(batch_chunks[0].text, summary_ratio), False)]
+            
+            # Retry individually so only the chunks that really fail fall back
+            print(f"❌ Batched AI summarization failed, retrying per chunk: {e}")
+            return [self._generate_batch([chunk], summary_ratio, lengths)[0] for chunk in batch_chunks]
+        
+        results = []
+        for chunk, summary in zip(batch_chunks, outputs):
+            if summary.strip():
+                results.append((summary, True))
+            else:
+                results.append((self.fallback_extractive_summary(chunk.text, summary_ratio), False))
+        
+        return results
+    
+    def _generate_ids(self, batch_ids, max_length, min_length):
+        """Generate summaries straight from pre-tokenized, prefixed input IDs"""
+        return self.summarizer.generate(batch_ids, max_length, min_length, cancel_token=self.cancel_token)
     
     def fallback_extractive_summary(self, text, summary_ratio=0.3):
         """Fallback extractive summarization if AI fails"""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
+        sentences = Document(text).sentences(min_length=11)
         
         if len(sentences) <= 2:
             return text
-            
-        # Simple frequency-based extraction
-        words = text.lower().split()
-        word_freq = Counter(words)
-        
-        sentence_scores = []
-        for i, sentence in enumerate(sentences):
-            score = sum(word_freq.get(word.lower(), 0) for word in sentence.split())
-            sentence_scores.append((score, i, sentence))
         
-        # Select top sentences
-        num_sentences = max(1, int(len(sentences) * summary_ratio))
-        top_sentences = sorted(sentence_scores, key=lambda x: x[0], reverse=True)[:num_sentences]
-        
-        # Sort by original order
-        selected = sorted(top_sentences, key=lambda x: x[1])
-        
-        return ' '.join([s[1] for s in selected])
+        # TF-IDF LexRank ranking, see extractive.py
+        return extract_summary(sentences, summary_ratio)
     
     def extract_key_phrases(self, text, top_n=6):
         """Extract key phrases from text"""
         text = self.clean_extracted_text(text)
-        
+        return self._top_key_phrases(self._count_key_phrases(text), top_n)
+    
+    def _count_key_phrases(self, text):
+        """Count candidate key phrases in already-cleaned text"""
         # Extract meaningful phrases
         capitalized_terms = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', text)
         technical_terms = re.findall(r'\b[a-z]{6,}\b', text.lower())
         
-        stop_words = {
-            'the', 'this', 'that', 'these', 'those', 'and', 'but', 'or', 'for', 'nor', 
-            'on', 'at', 'to', 'from', 'up', 'by', 'with', 'without', 'through', 'over', 
-            'under', 'above', 'below', 'example', 'method', 'system', 'information'
-        }
-        
         all_phrases = capitalized_terms + technical_terms
-        phrase_freq = Counter([phrase.lower().strip() for phrase in all_phrases 
-                              if phrase.lower().strip() not in stop_words and len(phrase) > 3])
-        
+        return Counter([phrase.lower().strip() for phrase in all_phrases 
+                        if phrase.lower().strip() not in KEY_PHRASE_STOP_WORDS and len(phrase) > 3])
+    
+    def _top_key_phrases(self, phrase_freq, top_n=6):
+        """Pick the most frequent key phrases from phrase counts"""
         key_phrases = []
         for phrase, freq in phrase_freq.most_common(top_n * 2):
             if freq >= 1 and len(phrase) > 4:
@@ -262,9 +519,8 @@ class AIDocumentSummarizer:
         structured_parts.append("SUMMARY:")
         structured_parts.append("")
         
-        # Clean up the text first
-        text = re.sub(r'\s+', ' ', text.strip())
-        text = re.sub(r'([A-Z])\s+([A-Z])', r'\1\2', text)  # Fix spaced capitals
+        # Clean up the text first, fixing spaced capitals
+        text = normalize_summary(text)
         
         # Try to identify different sections based on content
         sections = self._identify_content_sections(text)
@@ -282,8 +538,7 @@ class AIDocumentSummarizer:
     def _identify_content_sections(self, text):
         """Identify and separate different content sections"""
         # Try to split into logical sections
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        sentences = Document(text).clauses(min_length=21)
         
         # Group sentences into sections (every 3-4 sentences)
         sections = []
@@ -303,13 +558,8 @@ class AIDocumentSummarizer:
 
     def _clean_section_text(self, text):
         """Clean and format individual section text"""
-        # Remove excessive spacing and clean up
-        text = re.sub(r'\s+', ' ', text.strip())
-        
-        # Fix common formatting issues
-        text = re.sub(r'([a-z])([A-Z])', r'\1. \2', text)  # Add periods between sentences
-        text = re.sub(r'([.!?])\s*([A-Z])', r'\1 \2', text)  # Fix spacing after periods
-        text = re.sub(r'•\s*', '• ', text)  # Fix bullet points
+        # Spacing, periods between glued sentences and bullet points
+        text = normalize_section(text)
         
         # Ensure proper capitalization
         if text and not text[0].isupper():
@@ -326,7 +576,14 @@ class AIDocumentSummarizer:
         summary_parts = []
         
         # Clean header
-        model_name = "ONLINE HUGGINGFACE" if self.is_online else "T5-SMALL OFFLINE"
+        if self.is_online:
+            model_name = "ONLINE HUGGINGFACE"
+        elif self.extractive_only:
+            model_name = "LEXRANK EXTRACTIVE"
+        elif self.hybrid:
+            model_name = "HYBRID T5-SMALL + HUGGINGFACE"
+        else:
+            model_name = "T5-SMALL OFFLINE"
         summary_parts.append(f"AI DOCUMENT SUMMARY - {model_name}")
         summary_parts.append("=" * 60)
         summary_parts.append("")
@@ -363,59 +620,119 @@ class AIDocumentSummarizer:
         
         summary_parts.append("")
         summary_parts.append("-" * 50)
-        mode_text = "Online HuggingFace API" if self.is_online else "Offline T5-Small Model"
+        if self.is_online:
+            mode_text = "Online HuggingFace API"
+        elif self.extractive_only:
+            mode_text = "LexRank Sentence Extraction"
+        elif self.hybrid:
+            mode_text = "Offline T5-Small Model and Online HuggingFace API"
+        else:
+            mode_text = "Offline T5-Small Model"
         summary_parts.append(f"Generated using {mode_text}")
         
         return "\n".join(summary_parts)
     
-    def summarize(self, text, summary_ratio=0.4, source_filename=""):
+    def reduce_summaries(self, summaries, summary_ratio=0.4, progress_callback=None):
+        """Recursively summarize chunk summaries until they fit one model window"""
+        if not summaries:
+            return "Unable to generate summary."
+        
+        level = 1
+        while len(summaries) > 1 and self.chunker and level <= self.max_reduce_levels:
+            raise_if_cancelled(self.cancel_token)
+            combined = " ".join(summaries)
+            if self.chunker.count_tokens(combined) <= self.chunker.window:
+                break
+            
+            # Each level re-packs the previous level's summaries into full windows
+            sections = self.chunker.chunk(combined)
+            print(f"🔁 Reduce level {level}: {len(summaries)} summaries → {len(sections)} sections")
+            self._report(progress_callback, f"🔁 Combining summaries (level {level}, {len(sections)} sections)...")
+            
+            reduced = [
+                summary for summary in self.summarize_chunks(sections, summary_ratio)
+                if summary and len(summary.strip()) > 10
+            ]
+            
+            # Stop if the level failed to shrink the text, so the tree always terminates
+            if not reduced or len(" ".join(reduced)) >= len(combined):
+                break
+            
+            summaries = reduced
+            level += 1
+        
+        if len(summaries) == 1:
+            return summaries[0]
+        
+        combined_summaries = " ".join(summaries)
+        if len(combined_summaries.split()) > 500:
+            self._report(progress_callback, "🔁 Writing final summary...")
+            return self.ai_summarize_chunk(combined_summaries, summary_ratio)
+        return combined_summaries
+    
+    def _report(self, progress_callback, message):
+        """Send a progress message to the caller, if it asked for updates"""
+        if progress_callback:
+            progress_callback(message)
+    
+    def summarize(self, text, summary_ratio=0.4, source_filename="", progress_callback=None):
         """Main summarization method"""
-        original_text = text
-        cleaned_text = self.clean_extracted_text(text)
+        key = None
+        if self._is_cacheable():
+            key = summary_cache_key(hash_text(text), summary_ratio, source_filename,
+                                    self.model_type, self.dtype, self.chunk_overlap, self.backend,
+                                    self.prefilter)
+            cached = self.cache.get(key)
+            if cached:
+                print("⚡ Using cached summary")
+                return cached
+        
+        result = self.summarize_stream([text], summary_ratio, source_filename, progress_callback)
+        
+        if key:
+            self.cache.put(key, result)
+        return result
+    
+    def _is_cacheable(self):
+        """Only offline model output is cached; online and fallback results are not"""
+        return self.cache is not None and not self.is_online and not self.hybrid and self.summarizer is not None
+    
+    def summarize_stream(self, pages, summary_ratio=0.4, source_filename="", progress_callback=None):
+        """Summarize text arriving page by page, e.g. from iter_file_pages.
+
+        Chunks are sent to the model as soon as a batch is ready, while later
+        pages are still being read. Pages are segmented once by a Document
+        that only counts sentences and words for the statistics, so the
+        cleaned text is never held as a whole. The pre-filter and extractive
+        modes rank the whole document, so they keep it in the Document's
+        compact store instead.
+        """
+        document = Document(keep_text=self.extractive_only or self.prefilter)
+        phrases = Counter()
+        sentences = self._iter_stream_sentences(pages, document, phrases)
+        
+        if self.extractive_only:
+            final_summary = self._extract_stream(sentences, document, summary_ratio, progress_callback)
+        else:
+            if self.prefilter:
+                sentences = self._prefilter_sentences(sentences, document, summary_ratio, progress_callback)
+            final_summary = self._map_reduce_stream(sentences, document, summary_ratio, progress_callback)
         
-        if len(cleaned_text.strip()) < 100:
+        if document.length < 100:
             return {
                 'summary': "Document too short for meaningful AI summarization.",
                 'original_sentences': 1,
                 'summary_sentences': 1,
-                'original_words': len(text.split()),
+                'original_words': document.word_count,
                 'summary_words': 20,
                 'compression_ratio': 0,
                 'key_topics': [],
-                'model_used': 'offline' if not self.is_online else 'online',
+                'model_used': self._model_used(),
                 'source_file': source_filename
             }
         
         # Extract key phrases
-        key_phrases = self.extract_key_phrases(text)
-        
-        # Process based on online/offline mode
-        mode_text = "ONLINE HUGGINGFACE" if self.is_online else "OFFLINE T5-SMALL"
-        
-        if self.is_online:
-            print(f"🌐 Processing with {mode_text}...")
-            final_summary = self._online_summarize(cleaned_text, summary_ratio)
-        else:
-            # Chunk text for offline processing
-            chunks = self.chunk_text(cleaned_text, max_chunk_length=800)
-            print(f"🏠 Processing {len(chunks)} chunks with {mode_text}...")
-            
-            chunk_summaries = []
-            for i, chunk in enumerate(chunks):
-                print(f"AI processing chunk {i+1}/{len(chunks)}...")
-                chunk_summary = self.ai_summarize_chunk(chunk, summary_ratio)
-                if chunk_summary and len(chunk_summary.strip()) > 10:
-                    chunk_summaries.append(chunk_summary)
-            
-            # Combine chunk summaries
-            if len(chunk_summaries) > 1:
-                combined_summaries = " ".join(chunk_summaries)
-                if len(combined_summaries.split()) > 500:
-                    final_summary = self.ai_summarize_chunk(combined_summaries, summary_ratio)
-                else:
-                    final_summary = combined_summaries
-            else:
-                final_summary = chunk_summaries[0] if chunk_summaries else "Unable to generate summary."
+        key_phrases = self._top_key_phrases(phrases)
         
         # Create structured output
         structured_summary = self.create_structured_summary(
@@ -423,10 +740,11 @@ class AIDocumentSummarizer:
         )
         
         # Calculate statistics
-        original_sentences = len(re.split(r'[.!?]+', text))
-        summary_sentences = len(re.split(r'[.!?]+', final_summary)) if final_summary else 0
-        original_words = len(text.split())
-        summary_words = len(final_summary.split()) if final_summary else 0
+        summary = Document(final_summary or "")
+        original_sentences = len(document)
+        summary_sentences = len(summary)
+        original_words = document.word_count
+        summary_words = summary.word_count
         
         compression_ratio = ((original_words - summary_words) / original_words) * 100 if original_words > 0 else 0
         compression_ratio = max(0, min(100, compression_ratio))
@@ -439,166 +757,134 @@ class AIDocumentSummarizer:
             'summary_words': summary_words,
             'compression_ratio': compression_ratio,
             'key_topics': key_phrases,
-            'model_used': 'online' if self.is_online else 'offline',
+            'model_used': self._model_used(),
             'source_file': source_filename
         }
+    
+    def _map_reduce_stream(self, sentences, document, summary_ratio, progress_callback):
+        """Summarize chunks of the sentence stream with the model(s) and reduce the chunk summaries"""
+        # Both modes map chunks to summaries and reduce them; they differ in
+        # how chunks are sized (model tokenizer vs estimated API token budget)
+        if self.chunker:
+            chunks = self.chunker.iter_chunks(sentences)
+        else:
+            chunks = self._iter_char_chunks(sentences, max_chunk_length=800)
+        if self.is_online:
+            print("🌐 Streaming chunks to ONLINE HUGGINGFACE...")
+        elif self.hybrid:
+            print("🔀 Streaming chunks to OFFLINE T5-SMALL and ONLINE HUGGINGFACE...")
+        else:
+            print("🏠 Streaming chunks to OFFLINE T5-SMALL...")
+        
+        chunk_summaries = []
+        pending = []
+        group_size = self.batch_size * max(1, self.parallel_batches)
+        total_chunks = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            if len(pending) >= group_size:
+                total_chunks += len(pending)
+                self._report(progress_callback, f"📝 Summarizing sections (up to {total_chunks})...")
+                chunk_summaries.extend(self.summarize_chunks(pending, summary_ratio))
+                pending = []
+        
+        if pending and document.length >= 100:
+            total_chunks += len(pending)
+            self._report(progress_callback, f"📝 Summarizing {total_chunks} sections...")
+            chunk_summaries.extend(self.summarize_chunks(pending, summary_ratio))
+        
+        chunk_summaries = [
+            chunk_summary for chunk_summary in chunk_summaries
+            if chunk_summary and len(chunk_summary.strip()) > 10
+        ]
+        
+        if document.length < 100:
+            return None
+        # Combine chunk summaries
+        return self.reduce_summaries(chunk_summaries, summary_ratio, progress_callback)
+    
+    def _prefilter_sentences(self, sentences, document, summary_ratio, progress_callback):
+        """Keep the most salient share of the document's sentences, in order.
+
+        Ranking needs the whole document, so pages are read to the end
+        before the first chunk reaches the model. Kept sentences are decoded
+        from the document by index as the chunker asks for them.
+        """
+        for _ in sentences:
+            pass  # Reads every page into the document
+        candidates = document.select()
+        if len(candidates) < PREFILTER_MIN_SENTENCES:
+            return iter(candidates)
+        self._report(progress_callback, "🎯 Selecting key sentences...")
+        kept = select_indices(candidates, prefilter_keep_ratio(summary_ratio))
+        print(f"🎯 Pre-filter kept {len(kept)}/{len(candidates)} sentences for the model")
+        return (candidates[position] for position in kept)
+    
+    def _extract_stream(self, sentences, document, summary_ratio, progress_callback):
+        """Pick the most central sentences of the whole document with LexRank"""
+        print("⚡ Ranking sentences with LEXRANK EXTRACTIVE...")
+        self._report(progress_callback, "⚡ Ranking sentences...")
+        for _ in sentences:
+            pass  # Reads every page into the document
+        sentences = document.select(min_length=10)
+        if document.length < 100:
+            return None
+        # A fixed cap keeps summaries of long documents readable
+        return extract_summary(sentences, summary_ratio, max_sentences=max(5, int(60 * summary_ratio)))
+    
+    def _model_used(self):
+        if self.is_online:
+            return 'online'
+        if self.extractive_only:
+            return 'extractive'
+        return 'hybrid' if self.hybrid else 'offline'
+    
+    def _iter_stream_sentences(self, pages, document, phrases):
+        """Clean pages one at a time, add them to document and yield its complete sentences.
+
+        A sentence cut by a page break is finished with the start of the next
+        page. Key phrase counts are collected into phrases.
+        """
+        for page in pages:
+            raise_if_cancelled(self.cancel_token)
+            cleaned = self.clean_extracted_text(page)
+            if not cleaned:
+                continue
+            # Phrases can span sentences, so they are counted per page
+            phrases.update(self._count_key_phrases(cleaned))
+            yield from document.append(cleaned)
+        
+        yield from document.finish()
 
 # Enhanced Online Summarizer Class
 class OnlineTransformersSummarizer(AIDocumentSummarizer):
     """Online HuggingFace Transformers Summarizer with Privacy Protection"""
-    def __init__(self):
-        super().__init__(model_type="online-transformers", is_online=True)
+    def __init__(self, cancel_token=None, redact=True, prefilter=False):
+        super().__init__(model_type="online-transformers", is_online=True, cancel_token=cancel_token,
+                         redact=redact, prefilter=prefilter)
+
+class HybridSummarizer(AIDocumentSummarizer):
+    """Offline T5 and the online API together, each chunk routed to the faster one"""
+    def __init__(self, model_type="t5-small", dtype="float32", backend="torch", parallel_batches=2,
+                 use_server=False, cancel_token=None, redact=True, prefilter=False):
+        super().__init__(model_type=model_type, is_online=False, dtype=dtype, backend=backend,
+                         parallel_batches=parallel_batches, use_server=use_server, cancel_token=cancel_token,
+                         redact=redact, hybrid=True, prefilter=prefilter)
 
 # Keep compatibility
 class LexRankSummarizer(AIDocumentSummarizer):
     """Wrapper for backward compatibility - Offline T5 only"""
-    def __init__(self, model_type="t5-small"):
-        super().__init__(model_type=model_type, is_online=False)
-
-# File extraction functions
-def extract_text_from_file(file_path):
-    """Extract text from different file formats"""
-    file_extension = os.path.splitext(file_path)[1].lower()
-    
-    try:
-        if file_extension == '.pdf':
-            return extract_text_from_pdf(file_path)
-        elif file_extension == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        else:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-    except Exception as e:
-        raise Exception(f"Error reading file: {str(e)}")
-
-def extract_text_from_pdf(file_path):
-    """Enhanced PDF text extraction"""
-    try:
-        import PyPDF2
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text
-    except ImportError:
-        raise Exception("PyPDF2 is required for PDF processing.")
-    except Exception as e:
-        raise Exception(f"Error processing PDF: {str(e)}")
-
-# Enhanced SummaryWorker for multiple files
-class SummaryWorker(QThread):
-    """Enhanced worker thread with online/offline support"""
-    finished = pyqtSignal(dict)
-    error = pyqtSignal(str)
-    progress = pyqtSignal(str)  # For progress updates
-    
-    def __init__(self, file_path, summary_ratio, model_type="t5-small", is_online=False):
-        super().__init__()
-        self.file_path = file_path
-        self.summary_ratio = summary_ratio
-        self.model_type = model_type
-        self.is_online = is_online
-    
-    def run(self):
-        try:
-            # Extract text from file
-            filename = os.path.basename(self.file_path)
-            self.progress.emit(f"📖 Extracting text from {filename}...")
-            
-            text = extract_text_from_file(self.file_path)
-            
-            if not text.strip():
-                self.error.emit("The selected file appears to be empty or unreadable.")
-                return
-            
-            # Create appropriate summarizer
-            self.progress.emit(f"🤖 Initializing AI model...")
-            
-            if self.is_online:
-                summarizer = OnlineTransformersSummarizer()
-            else:
-                summarizer = LexRankSummarizer(model_type=self.model_type)
-            
-            self.progress.emit(f"📝 Generating summary...")
-            result = summarizer.summarize(text, self.summary_ratio, filename)
-            
-            self.finished.emit(result)
-            
-        except Exception as e:
-            self.error.emit(f"Error processing file: {str(e)}")
-
-# PDF Export function - should be added to your main UI class
-def export_to_pdf(self):
-    """Export summary to PDF with proper functionality"""
-    if not hasattr(self, 'all_summaries') or not self.all_summaries:
-        QMessageBox.warning(self, "No Summary", "Please generate a summary first.")
-        return
+    def __init__(self, model_type="t5-small", dtype="float32", backend="torch", parallel_batches=2,
+                 use_server=False, cancel_token=None, prefilter=False):
+        super().__init__(model_type=model_type, is_online=False, dtype=dtype, backend=backend,
+                         parallel_batches=parallel_batches, use_server=use_server, cancel_token=cancel_token,
+                         prefilter=prefilter)
 
-    # Get save location from user
-    options = QFileDialog.Options()
-    default_name = "AI_Summary.pdf"
-    if hasattr(self, 'selected_files') and self.selected_files:
-        default_name = f"Summary_{self.selected_files[0]['filename'].split('.')}.pdf"
-    
-    file_path, _ = QFileDialog.getSaveFileName(
-        self, "Save Summary as PDF", 
-        default_name, 
-        "PDF Files (*.pdf)", 
-        options=options
-    )
+# The Qt workers moved to qt_workers so this module can be used without PyQt5
+_QT_NAMES = ('SummaryWorker', 'BatchSummaryWorker', 'export_to_pdf')
 
-    if file_path:
-        try:
-            # Create printer object
-            printer = QPrinter(QPrinter.HighResolution)
-            printer.setOutputFormat(QPrinter.PdfFormat)
-            printer.setOutputFileName(file_path)
-            printer.setPageSize(QPrinter.A4)
-            
-            # Create document with formatted content
-            doc = QTextDocument()
-            
-            # Get the summary content and format it nicely
-            summary_content = self.summary_text.toPlainText()
-            
-            # Add some basic formatting
-            formatted_content = f"""
-<html>
-<head>
-    <style>
-        body {{ font-family: Georgia, serif; font-size: 12pt; line-height: 1.6; margin: 40px; }}
-        h1 {{ color: #2c3e50; font-size: 18pt; margin-bottom: 20px; }}
-        h2 {{ color: #34495e; font-size: 14pt; margin-top: 25px; margin-bottom: 10px; }}
-        .stats {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-        .stat {{ display: inline-block; margin-right: 30px; font-weight: bold; }}
-    </style>
-</head>
-<body>
-    <h1>AI Document Summary</h1>
-    
-    <div class="stats">
-        <span class="stat">{self.compression_stat.text()}</span>
-        <span class="stat">{self.word_count_stat.text()}</span>
-        <span class="stat">{self.key_topics_stat.text()}</span>
-    </div>
-    
-    <h2>Summary Content</h2>
-    <p>{summary_content.replace(chr(10), '</p><p>')}</p>
-    
-    <hr style="margin-top: 30px;">
-    <p><em>Generated by AI Document Summarizer</em></p>
-</body>
-</html>
-            """
-            
-            doc.setHtml(formatted_content)
-            doc.print_(printer)
-            
-            QMessageBox.information(self, "Success", f"Summary successfully saved as:\n{file_path}")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "PDF Export Error", f"Failed to save PDF:\n{str(e)}")
+def __getattr__(name):
+    if name in _QT_NAMES:
+        from . import qt_workers
+        return getattr(qt_workers, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,186 @@
+# summary_cache.py - Content-addressed on-disk cache for summaries
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from .chunker import CHUNKER_VERSION
+
+
+def default_cache_dir():
+    """Per-user cache directory, overridable with AI_SUMMARIZER_CACHE_DIR"""
+    override = os.environ.get('AI_SUMMARIZER_CACHE_DIR')
+    if override:
+        return override
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ai_document_summarizer')
+
+
+def hash_file(file_path, block_size=1024 * 1024):
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text):
+    """SHA-256 of a text's UTF-8 bytes"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def summary_cache_key(content_hash, summary_ratio, source_filename="", model_type="t5-small",
+                      dtype="float32", chunk_overlap=0, backend="torch", prefilter=False):
+    """Cache key for an offline summary of the given content and settings"""
+    # The pre-filter only adds a setting when enabled, so existing keys stay valid
+    extra = {'prefilter': True} if prefilter else {}
+    return SummaryCache.make_key(
+        content_hash, model_type, summary_ratio, mode='offline',
+        source=source_filename, dtype=dtype, overlap=chunk_overlap, **backend_key_settings(backend), **extra
+    )
+
+
+def backend_key_settings(backend):
+    """Key settings for an inference backend; torch adds none so existing keys stay valid"""
+    return {} if backend == "torch" else {'backend': backend}
+
+
+class SummaryCache:
+    """Size-bounded LRU cache of JSON results stored one file per key.
+
+    Writes go to a temporary file that is atomically renamed into place, so
+    concurrent readers never see a partial entry. Reads refresh the entry's
+    modification time, which is what LRU eviction orders by.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 * 1024 * 1024, namespace='summaries'):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), namespace)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # Approximate bytes on disk, measured on first write
+
+    @staticmethod
+    def make_key(content_hash, model, summary_ratio, mode='offline', **settings):
+        """Combine the content hash with every setting that affects the result"""
+        parts = {
+            'content': content_hash,
+            'model': model,
+            'ratio': round(float(summary_ratio), 4),
+            'mode': mode,
+            'chunker': CHUNKER_VERSION,
+        }
+        parts.update(settings)
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                value = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        """Store a JSON-serializable value under key and enforce the size bound"""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                    json.dump(value, file)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ Could not write summary cache entry: {e}")
+            return False
+
+        # Rescan the directory only when the running estimate crosses the bound
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(path)
+        if self._size is None or self._size > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if not name.endswith('.json'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._size = total
+
+    def clear(self):
+        """Remove every entry in this cache"""
+        with self._lock:
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+            self._size = 0
+
+    def _path(self, key):
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache():
+    """Return the shared on-disk summary cache"""
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache()
+        return _summary_cache
+
+
+_chunk_cache = None
+
+
+def get_chunk_cache():
+    """Return the shared on-disk cache of per-chunk summaries"""
+    global _chunk_cache
+    with _summary_cache_lock:
+        if _chunk_cache is None:
+            _chunk_cache = SummaryCache(max_bytes=64 * 1024 * 1024, namespace='chunks')
+        return _chunk_cache